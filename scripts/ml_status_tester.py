@@ -17,7 +17,7 @@ from io import StringIO
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterator
 
-from pur_mold_twin.ml import inference
+from pur_mold_twin.ml import registry
 from pur_mold_twin.ml.inference import attach_ml_predictions
 from pur_mold_twin.ml.policy import (
     MLDependencyError,
@@ -104,12 +104,12 @@ def _case_missing_extras(_: argparse.Namespace) -> Dict[str, Any]:
         tmp_path = Path(tmp)
         models_dir = tmp_path / "models"
         models_dir.mkdir(parents=True, exist_ok=True)
-        original_joblib = inference.joblib
-        inference.joblib = None  # simulate environment without extras
+        original_joblib = registry.joblib
+        registry.joblib = None  # simulate environment without extras
         try:
             output = _attach_with_metadata(SAMPLE_FEATURES, tmp_path)
         finally:
-            inference.joblib = original_joblib
+            registry.joblib = original_joblib
         return {"case": "missing-extras", "result": output}
 
 
@@ -42,6 +42,15 @@ if FastAPI is not None:  # pragma: no cover - only tested when fastapi is availa
         except Exception as exc:
             raise HTTPException(status_code=500, detail=str(exc))
 
+    @app.post("/surrogate/predict")
+    async def surrogate_predict_endpoint(payload: Dict[str, Any]):
+        try:
+            return service.predict(payload)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=str(exc))
+
     @app.get("/health")
     async def health():
         return {"status": "ok"}
@@ -0,0 +1,42 @@
+"""
+Analysis tools on top of the simulator (global sensitivity, Monte Carlo uncertainty of KPIs,
+polynomial chaos surrogate).
+"""
+
+from .sensitivity import (  # noqa: F401
+    SENSITIVITY_KPIS,
+    KPIEvaluator,
+    MorrisResult,
+    ParameterRange,
+    SensitivityAnalyzer,
+    SobolResult,
+)
+from .surrogate import (  # noqa: F401
+    SURROGATE_KPIS,
+    KPISurrogate,
+    SurrogatePrediction,
+    train_surrogate,
+)
+from .uncertainty import (  # noqa: F401
+    Distribution,
+    UncertaintyAnalyzer,
+    UncertaintyResult,
+    paired_difference,
+)
+
+__all__ = [
+    "SENSITIVITY_KPIS",
+    "KPIEvaluator",
+    "MorrisResult",
+    "ParameterRange",
+    "SensitivityAnalyzer",
+    "SobolResult",
+    "SURROGATE_KPIS",
+    "KPISurrogate",
+    "SurrogatePrediction",
+    "train_surrogate",
+    "Distribution",
+    "UncertaintyAnalyzer",
+    "UncertaintyResult",
+    "paired_difference",
+]
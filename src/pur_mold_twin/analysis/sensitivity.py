@@ -0,0 +1,494 @@
+"""
+Global sensitivity of simulator KPIs (Sobol indices, Morris screening).
+
+Parameters are fields of `ProcessConditions`, `MoldProperties`,
+`SimulationConfig` or of the material components, named `"process.<field>"`,
+`"mold.<field>"`, `"config.<field>"` or `"material.<polyol|isocyanate>.<field>"`
+and varied uniformly between `low` and `high`. The KPIs default to
+`SENSITIVITY_KPIS`; any key of `SIM_SUMMARY_KEYS` can be used.
+
+- `sobol` draws a Saltelli design from a scrambled Sobol' sequence
+  (`n_base * (d + 2)` runs) and returns first-order (Saltelli 2010) and
+  total (Jansen) indices with bootstrap confidence intervals,
+- `morris` runs `trajectories * (d + 1)` one-at-a-time steps on a
+  `levels`-point grid and returns mu, mu* and sigma of the elementary
+  effects (per unit of the parameter range).
+
+Design points go through `KPIEvaluator`, which runs them on the vectorized
+kernel of `core.batch` (10^4 runs take seconds, not minutes) and keeps KPI
+summaries keyed by an input hash: repeated points, repeated analyses and,
+with a `SimulationCache`, later sessions reuse earlier runs.
+
+A run without a demold window has no `t_demold_*`; for the indices such
+runs count as demolding at the end of the simulated horizon.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from pydantic import BaseModel, model_validator
+from scipy.stats import qmc
+
+from ..core import simulation
+from ..core.batch import batch_kpis
+from ..core.types import MoldProperties, ProcessConditions, QualityTargets, SimulationConfig, VentProperties
+from ..data.sim_cache import SIM_SUMMARY_KEYS, SUMMARY_VERSION, SimulationCache
+from ..material_db.models import IsoComponent, MaterialSystem, PolyolComponent
+
+SENSITIVITY_KPIS = ("t_demold_opt_s", "p_max_Pa", "rho_moulded", "defect_risk")
+_TARGETS = {"process": ProcessConditions, "mold": MoldProperties, "config": SimulationConfig}
+_MATERIAL_COMPONENTS = {"polyol": PolyolComponent, "isocyanate": IsoComponent}
+# The batch kernel needs one time grid; output options do not change KPIs.
+_FIXED_CONFIG_FIELDS = {
+    "total_time_s",
+    "time_step_s",
+    "backend",
+    "dimension",
+    "record",
+    "output_every",
+    "output_points",
+}
+_DEMOLD_KPIS = ("t_demold_min_s", "t_demold_max_s", "t_demold_opt_s")
+
+
+def split_parameter(name: str) -> tuple[str, str]:
+    """`"process.T_mold_init_C"` -> `("process", "T_mold_init_C")`; ValueError for unknown names."""
+
+    target, _, field_name = name.partition(".")
+    if target == "material":
+        component, _, attribute = field_name.partition(".")
+        model = _MATERIAL_COMPONENTS.get(component)
+        if model is None or attribute not in {item.name for item in dataclasses.fields(model)}:
+            raise ValueError(
+                f"Unknown material parameter '{name}' (expected material.polyol.* or material.isocyanate.*)."
+            )
+        return target, field_name
+    model = _TARGETS.get(target)
+    if model is None or field_name not in model.model_fields:
+        raise ValueError(f"Unknown parameter '{name}' (expected process.*, mold.*, config.* or material.* field).")
+    if target == "config" and field_name in _FIXED_CONFIG_FIELDS:
+        raise ValueError(f"Parameter '{name}' cannot vary within one batch.")
+    return target, field_name
+
+
+def parameter_values(
+    names: Sequence[str],
+    material: MaterialSystem,
+    process: ProcessConditions,
+    mold: MoldProperties,
+    config: SimulationConfig,
+) -> np.ndarray:
+    """Current values of the named parameters in the given inputs."""
+
+    sources = {"process": process, "mold": mold, "config": config}
+    values = []
+    for name in names:
+        target, field_name = split_parameter(name)
+        if target == "material":
+            component, _, attribute = field_name.partition(".")
+            values.append(getattr(getattr(material, component), attribute))
+        else:
+            values.append(getattr(sources[target], field_name))
+    return np.array(values, dtype=float)
+
+
+class ParameterRange(BaseModel):
+    """One uncertain input (see `split_parameter` for names) varied over `[low, high]`."""
+
+    name: str
+    low: float
+    high: float
+
+    @model_validator(mode="after")
+    def _validate_range(self) -> "ParameterRange":
+        split_parameter(self.name)
+        if not self.high > self.low:
+            raise ValueError(f"Parameter '{self.name}': high must be > low.")
+        return self
+
+
+def _digest(payload: Any) -> str:
+    text = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class KPIEvaluator:
+    """
+    KPI summaries for design points (rows of parameter values), evaluated in
+    batches and cached by input hash.
+
+    Without `cache` the summaries live in memory for the lifetime of the
+    evaluator; a `SimulationCache` also persists them (one part file per
+    `evaluate` call that simulated something).
+    """
+
+    def __init__(
+        self,
+        material: MaterialSystem,
+        process: ProcessConditions,
+        mold: MoldProperties,
+        parameters: Sequence[str],
+        quality: Optional[QualityTargets] = None,
+        config: Optional[SimulationConfig] = None,
+        cache: Optional[SimulationCache] = None,
+        chunk_size: int = 1024,
+    ) -> None:
+        if not parameters:
+            raise ValueError("At least one parameter is required.")
+        if len(set(parameters)) != len(parameters):
+            raise ValueError("Parameter names must be unique.")
+        self.parameters = list(parameters)
+        self._targets = [split_parameter(name) for name in self.parameters]
+        self.base: Dict[str, Any] = {
+            "material": material,
+            "process": process,
+            "mold": mold,
+            "config": (config or SimulationConfig()).model_copy(update={"record": "kpi_only"}),
+        }
+        self.quality = quality or QualityTargets()
+        self.cache = cache
+        self.chunk_size = chunk_size
+        self.simulated = 0
+        self.reused = 0
+        self._memory: Dict[str, Dict[str, Optional[float]]] = {}
+        self._context_hash = _digest(
+            {
+                "version": SUMMARY_VERSION,
+                "material": dataclasses.asdict(material),
+                "process": process.model_dump(),
+                "mold": mold.model_dump(),
+                "quality": self.quality.model_dump(),
+                "config": self.base["config"].model_dump(exclude={"record", "output_every", "output_points"}),
+                "parameters": self.parameters,
+            }
+        )
+
+    @property
+    def horizon_s(self) -> float:
+        return self.base["config"].total_time_s
+
+    def nominal(self) -> np.ndarray:
+        """Base-scenario values of the parameters."""
+
+        return parameter_values(self.parameters, **self.base)
+
+    def validate(self, name: str, value: float) -> None:
+        """Run the input model validators for one parameter value (ValueError if invalid)."""
+
+        target, field_name = split_parameter(name)
+        if target == "material":
+            component, _, attribute = field_name.partition(".")
+            dataclasses.replace(getattr(self.base["material"], component), **{attribute: float(value)})
+            return
+        base = self.base[target]
+        type(base).model_validate({**base.model_dump(), field_name: float(value)})
+
+    def input_hash(self, values: Sequence[float]) -> str:
+        return _digest({"context": self._context_hash, "values": [float(value) for value in values]})
+
+    def context(self, values: Sequence[float]) -> simulation.SimulationContext:
+        """Simulation context of one design point (validators are skipped: check bounds with `validate`)."""
+
+        updates: Dict[str, Dict[str, float]] = {"process": {}, "mold": {}, "config": {}, "polyol": {}, "isocyanate": {}}
+        for (target, field_name), value in zip(self._targets, values):
+            if target == "material":
+                component, _, attribute = field_name.partition(".")
+                updates[component][attribute] = float(value)
+            else:
+                updates[target][field_name] = float(value)
+        inputs = {
+            target: self.base[target].model_copy(update=updates[target]) if updates[target] else self.base[target]
+            for target in ("process", "mold", "config")
+        }
+        material = self.base["material"]
+        if updates["polyol"] or updates["isocyanate"]:
+            material = dataclasses.replace(
+                material,
+                polyol=dataclasses.replace(material.polyol, **updates["polyol"]),
+                isocyanate=dataclasses.replace(material.isocyanate, **updates["isocyanate"]),
+            )
+        mold = inputs["mold"]
+        return simulation.prepare_context(
+            material, inputs["process"], mold, self.quality, inputs["config"], mold.vent or VentProperties()
+        )
+
+    def evaluate(self, values: np.ndarray, kpis: Sequence[str] = SENSITIVITY_KPIS) -> Dict[str, np.ndarray]:
+        """KPI arrays (NaN for missing values) for `values` of shape `(n_points, n_parameters)`."""
+
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        if values.shape[1] != len(self.parameters):
+            raise ValueError(f"Expected {len(self.parameters)} parameter columns, got {values.shape[1]}.")
+        unknown = [name for name in kpis if name not in SIM_SUMMARY_KEYS]
+        if unknown:
+            raise ValueError(f"Unknown KPIs: {', '.join(unknown)}")
+
+        keys = [self.input_hash(row) for row in values]
+        missing: Dict[str, np.ndarray] = {}
+        for key, row in zip(keys, values):
+            if key not in missing and self._lookup(key) is None:
+                missing[key] = row
+        if missing:
+            contexts = [self.context(row) for row in missing.values()]
+            computed = batch_kpis(contexts, chunk_size=self.chunk_size)
+            for j, key in enumerate(missing):
+                summary = {name: _clean(computed[name][j]) for name in SIM_SUMMARY_KEYS}
+                self._memory[key] = summary
+                if self.cache is not None:
+                    self.cache.put(key, summary)
+            if self.cache is not None:
+                self.cache.flush()
+        self.simulated += len(missing)
+        self.reused += len(keys) - len(missing)
+
+        summaries = [self._lookup(key) for key in keys]
+        return {
+            name: np.array([np.nan if summary[name] is None else summary[name] for summary in summaries], dtype=float)
+            for name in kpis
+        }
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Optional[float]]]:
+        summary = self._memory.get(key)
+        if summary is None and self.cache is not None:
+            summary = self.cache.get(key)
+        return summary
+
+
+def _clean(value: Any) -> Optional[float]:
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+@dataclass
+class SobolResult:
+    """First-order (`S1`) and total (`ST`) indices per KPI, aligned with `parameters`."""
+
+    parameters: List[str]
+    S1: Dict[str, np.ndarray]
+    ST: Dict[str, np.ndarray]
+    S1_conf: Dict[str, np.ndarray]
+    ST_conf: Dict[str, np.ndarray]
+    evaluations: int
+    variance: Dict[str, float] = field(default_factory=dict)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """One row per (KPI, parameter) for tables / DataFrames."""
+
+        return [
+            {
+                "kpi": kpi,
+                "parameter": name,
+                "S1": float(self.S1[kpi][i]),
+                "S1_conf": float(self.S1_conf[kpi][i]),
+                "ST": float(self.ST[kpi][i]),
+                "ST_conf": float(self.ST_conf[kpi][i]),
+            }
+            for kpi in self.S1
+            for i, name in enumerate(self.parameters)
+        ]
+
+
+@dataclass
+class MorrisResult:
+    """Elementary-effect statistics per KPI (per unit of the parameter range), aligned with `parameters`."""
+
+    parameters: List[str]
+    mu: Dict[str, np.ndarray]
+    mu_star: Dict[str, np.ndarray]
+    sigma: Dict[str, np.ndarray]
+    evaluations: int
+
+    def records(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "kpi": kpi,
+                "parameter": name,
+                "mu": float(self.mu[kpi][i]),
+                "mu_star": float(self.mu_star[kpi][i]),
+                "sigma": float(self.sigma[kpi][i]),
+            }
+            for kpi in self.mu
+            for i, name in enumerate(self.parameters)
+        ]
+
+    def ranking(self, kpi: str) -> List[str]:
+        """Parameters by decreasing mu* for `kpi`."""
+
+        return [self.parameters[i] for i in np.argsort(-self.mu_star[kpi], kind="stable")]
+
+
+def scale_to_bounds(unit: np.ndarray, parameters: Sequence[ParameterRange]) -> np.ndarray:
+    """Map points of the unit hypercube onto the parameter ranges."""
+
+    low = np.array([parameter.low for parameter in parameters])
+    high = np.array([parameter.high for parameter in parameters])
+    return low + np.asarray(unit) * (high - low)
+
+
+def saltelli_sample(n_parameters: int, n_base: int, seed: Optional[int] = 0) -> np.ndarray:
+    """
+    Saltelli design on the unit hypercube, shape `(n_base * (n_parameters + 2), n_parameters)`.
+
+    Rows are the blocks A, B, AB_1 ... AB_d (AB_i: A with column i from B).
+    `n_base` is rounded up to a power of two (balance of the Sobol' sequence).
+    """
+
+    if n_base < 2:
+        raise ValueError("n_base must be >= 2")
+    exponent = int(math.ceil(math.log2(n_base)))
+    base = qmc.Sobol(2 * n_parameters, scramble=True, seed=seed).random_base2(exponent)
+    A, B = base[:, :n_parameters], base[:, n_parameters:]
+    blocks = [A, B]
+    for i in range(n_parameters):
+        AB = A.copy()
+        AB[:, i] = B[:, i]
+        blocks.append(AB)
+    return np.vstack(blocks)
+
+
+def sobol_indices(
+    outputs: np.ndarray, n_parameters: int, bootstrap: int = 100, seed: Optional[int] = 0
+) -> Dict[str, np.ndarray]:
+    """S1 / ST (and bootstrap 95% half-widths) from model outputs on a `saltelli_sample` design."""
+
+    outputs = np.asarray(outputs, dtype=float)
+    n_base = outputs.size // (n_parameters + 2)
+    if n_base * (n_parameters + 2) != outputs.size:
+        raise ValueError("outputs do not match a Saltelli design for this many parameters.")
+    f = outputs.reshape(n_parameters + 2, n_base)
+    f = f - f[:2].mean()  # centring keeps the S1 estimator stable for KPIs with a large mean (p_max_Pa)
+    fA, fB, fAB = f[0], f[1], f[2:]
+
+    def estimate(rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        a, b, ab = fA[..., rows], fB[..., rows], fAB[:, rows]
+        variance = np.var(np.concatenate([a, b], axis=-1), axis=-1)
+        safe = np.where(variance > 0, variance, 1.0)
+        first = np.mean(b * (ab - a), axis=-1) / safe
+        total = 0.5 * np.mean((a - ab) ** 2, axis=-1) / safe
+        return np.where(variance > 0, first, 0.0), np.where(variance > 0, total, 0.0)
+
+    S1, ST = estimate(np.arange(n_base))
+    S1_conf = np.zeros(n_parameters)
+    ST_conf = np.zeros(n_parameters)
+    if bootstrap > 0:
+        rng = np.random.default_rng(seed)
+        draws = [estimate(rng.integers(0, n_base, n_base)) for _ in range(bootstrap)]
+        S1_conf = 1.96 * np.std([draw[0] for draw in draws], axis=0)
+        ST_conf = 1.96 * np.std([draw[1] for draw in draws], axis=0)
+    return {"S1": S1, "ST": ST, "S1_conf": S1_conf, "ST_conf": ST_conf, "variance": np.var(f[:2])}
+
+
+def morris_sample(
+    n_parameters: int, trajectories: int, levels: int = 4, seed: Optional[int] = 0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Morris one-at-a-time trajectories on the unit hypercube.
+
+    Returns `(points, moved, step)`: points of shape
+    `(trajectories * (n_parameters + 1), n_parameters)`, and per trajectory
+    step the index of the moved parameter and its signed change (both of
+    shape `(trajectories, n_parameters)`).
+    """
+
+    if levels < 2 or levels % 2:
+        raise ValueError("levels must be an even number >= 2")
+    rng = np.random.default_rng(seed)
+    delta = levels / (2.0 * (levels - 1))
+    grid = np.arange(levels) / (levels - 1)
+    points = np.empty((trajectories, n_parameters + 1, n_parameters))
+    moved = np.empty((trajectories, n_parameters), dtype=int)
+    step = np.empty((trajectories, n_parameters))
+    for r in range(trajectories):
+        x = rng.choice(grid, n_parameters)
+        points[r, 0] = x
+        for k, i in enumerate(rng.permutation(n_parameters)):
+            change = delta if x[i] + delta <= 1.0 + 1e-12 else -delta
+            x = x.copy()
+            x[i] += change
+            points[r, k + 1] = x
+            moved[r, k] = i
+            step[r, k] = change
+    return points.reshape(-1, n_parameters), moved, step
+
+
+def morris_effects(outputs: np.ndarray, moved: np.ndarray, step: np.ndarray) -> Dict[str, np.ndarray]:
+    """mu, mu* and sigma of the elementary effects from outputs on a `morris_sample` design."""
+
+    trajectories, n_parameters = moved.shape
+    f = np.asarray(outputs, dtype=float).reshape(trajectories, n_parameters + 1)
+    effects = np.empty((trajectories, n_parameters))
+    rows = np.arange(trajectories)[:, None]
+    effects[rows, moved] = np.diff(f, axis=1) / step
+    return {
+        "mu": effects.mean(axis=0),
+        "mu_star": np.abs(effects).mean(axis=0),
+        "sigma": effects.std(axis=0, ddof=1) if trajectories > 1 else np.zeros(n_parameters),
+    }
+
+
+class SensitivityAnalyzer:
+    """Sobol and Morris analyses of simulator KPIs around a base scenario."""
+
+    def __init__(
+        self,
+        material: MaterialSystem,
+        process: ProcessConditions,
+        mold: MoldProperties,
+        parameters: Sequence[ParameterRange],
+        quality: Optional[QualityTargets] = None,
+        config: Optional[SimulationConfig] = None,
+        kpis: Sequence[str] = SENSITIVITY_KPIS,
+        cache: Optional[SimulationCache] = None,
+        chunk_size: int = 1024,
+    ) -> None:
+        self.parameters = list(parameters)
+        names = [parameter.name for parameter in self.parameters]
+        self.evaluator = KPIEvaluator(material, process, mold, names, quality, config, cache, chunk_size)
+        for parameter in self.parameters:  # validators run once on the bounds, not per design point
+            self.evaluator.validate(parameter.name, parameter.low)
+            self.evaluator.validate(parameter.name, parameter.high)
+        self.kpis = list(kpis)
+
+    def _outputs(self, unit: np.ndarray) -> Dict[str, np.ndarray]:
+        outputs = self.evaluator.evaluate(scale_to_bounds(unit, self.parameters), self.kpis)
+        for name in _DEMOLD_KPIS:
+            if name in outputs:
+                outputs[name] = np.where(np.isnan(outputs[name]), self.evaluator.horizon_s, outputs[name])
+        return outputs
+
+    def sobol(self, n_base: int = 512, seed: Optional[int] = 0, bootstrap: int = 100) -> SobolResult:
+        """Sobol indices from `n_base * (d + 2)` runs (`n_base` rounded up to a power of two)."""
+
+        d = len(self.parameters)
+        unit = saltelli_sample(d, n_base, seed)
+        outputs = self._outputs(unit)
+        indices = {kpi: sobol_indices(values, d, bootstrap, seed) for kpi, values in outputs.items()}
+        return SobolResult(
+            parameters=[parameter.name for parameter in self.parameters],
+            S1={kpi: item["S1"] for kpi, item in indices.items()},
+            ST={kpi: item["ST"] for kpi, item in indices.items()},
+            S1_conf={kpi: item["S1_conf"] for kpi, item in indices.items()},
+            ST_conf={kpi: item["ST_conf"] for kpi, item in indices.items()},
+            evaluations=len(unit),
+            variance={kpi: float(item["variance"]) for kpi, item in indices.items()},
+        )
+
+    def morris(self, trajectories: int = 20, levels: int = 4, seed: Optional[int] = 0) -> MorrisResult:
+        """Morris screening from `trajectories * (d + 1)` runs."""
+
+        unit, moved, step = morris_sample(len(self.parameters), trajectories, levels, seed)
+        outputs = self._outputs(unit)
+        effects = {kpi: morris_effects(values, moved, step) for kpi, values in outputs.items()}
+        return MorrisResult(
+            parameters=[parameter.name for parameter in self.parameters],
+            mu={kpi: item["mu"] for kpi, item in effects.items()},
+            mu_star={kpi: item["mu_star"] for kpi, item in effects.items()},
+            sigma={kpi: item["sigma"] for kpi, item in effects.items()},
+            evaluations=len(unit),
+        )
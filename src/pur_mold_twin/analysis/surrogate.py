@@ -0,0 +1,354 @@
+"""
+Polynomial chaos surrogate of the simulator KPIs.
+
+`train_surrogate` samples a box of inputs (`ParameterRange`s over process,
+mold, config or material fields; all other inputs stay at the base
+scenario) with a scrambled Sobol' sequence, runs the points in batches
+through `KPIEvaluator` (vectorized kernel, results cached by input hash)
+and fits, per KPI, a Legendre polynomial expansion by least squares. The
+total degree of each KPI is picked on a hold-out split, whose RMSE and
+maximum error become the surrogate's error estimates; the final
+coefficients are refitted on all samples.
+
+A `KPISurrogate` is only valid inside its envelope: the parameter box
+(`in_envelope`) and the fixed inputs it was trained for (`matches`, a hash
+of material, mold, quality targets, config and the non-varied process
+fields). A prediction costs ~10-20 us instead of milliseconds for a run.
+Callers use it to screen: predictions within `margin_sigmas` RMSEs of a
+constraint (`boundary_flags`) or outside the envelope go to the full
+simulation.
+
+As in the sensitivity analysis, runs without a demold window count as
+demolding at the end of the horizon when fitting the `t_demold_*` KPIs.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from dataclasses import dataclass
+from itertools import combinations_with_replacement
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy.stats import qmc
+
+from ..core.types import MoldProperties, ProcessConditions, QualityTargets, SimulationConfig
+from ..data.sim_cache import SimulationCache
+from ..material_db.models import MaterialSystem
+from .sensitivity import KPIEvaluator, ParameterRange, _digest, parameter_values, scale_to_bounds, split_parameter
+
+SURROGATE_KPIS = ("t_demold_min_s", "t_demold_opt_s", "t_demold_max_s", "p_max_Pa", "rho_moulded", "defect_risk")
+_DEMOLD_KPIS = ("t_demold_min_s", "t_demold_opt_s", "t_demold_max_s")
+_OUTPUT_OPTIONS = {"record", "output_every", "output_points"}
+# Slack on the box edges in scaled [-1, 1] units (floating point round-trips of the bounds).
+_ENVELOPE_TOL = 1e-9
+
+
+def fixed_inputs_hash(
+    names: Sequence[str],
+    material: MaterialSystem,
+    process: ProcessConditions,
+    mold: MoldProperties,
+    quality: QualityTargets,
+    config: SimulationConfig,
+) -> str:
+    """Hash of every simulation input except the named (varied) parameters."""
+
+    varied: Dict[str, set] = {"process": set(), "mold": set(), "config": set(), "polyol": set(), "isocyanate": set()}
+    for name in names:
+        target, field_name = split_parameter(name)
+        if target == "material":
+            component, _, attribute = field_name.partition(".")
+            varied[component].add(attribute)
+        else:
+            varied[target].add(field_name)
+    material_payload = dataclasses.asdict(material)
+    for component in ("polyol", "isocyanate"):
+        for attribute in varied[component]:
+            material_payload[component].pop(attribute, None)
+    return _digest(
+        {
+            "material": material_payload,
+            "process": process.model_dump(exclude=varied["process"]),
+            "mold": mold.model_dump(exclude=varied["mold"]),
+            "quality": quality.model_dump(),
+            "config": config.model_dump(exclude=_OUTPUT_OPTIONS | varied["config"]),
+        }
+    )
+
+
+def _multi_indices(n_parameters: int, degree: int) -> np.ndarray:
+    """Exponent vectors of all monomials of total degree <= `degree`, by increasing degree."""
+
+    rows = []
+    for total in range(degree + 1):
+        for dims in combinations_with_replacement(range(n_parameters), total):
+            row = [0] * n_parameters
+            for dim in dims:
+                row[dim] += 1
+            rows.append(row)
+    return np.array(rows, dtype=int).reshape(-1, n_parameters)
+
+
+def _legendre_table(x: np.ndarray, degree: int) -> np.ndarray:
+    """Legendre polynomials P_0..P_degree of `x` (values in [-1, 1]), stacked on a new last axis."""
+
+    table = [np.ones_like(x), x]
+    for n in range(1, degree):
+        table.append(((2 * n + 1) * x * table[n] - n * table[n - 1]) / (n + 1))
+    return np.stack(table[: degree + 1], axis=-1)
+
+
+@dataclass
+class SurrogatePrediction:
+    """Predicted KPIs, their hold-out RMSE and whether the point lies inside the training box."""
+
+    kpis: Dict[str, float]
+    error: Dict[str, float]
+    in_envelope: bool
+
+
+class KPISurrogate:
+    """Legendre polynomial chaos expansion of KPIs over a parameter box."""
+
+    def __init__(
+        self,
+        parameters: Sequence[ParameterRange],
+        kpis: Sequence[str],
+        exponents: np.ndarray,
+        coefficients: np.ndarray,
+        degree: Dict[str, int],
+        rmse: Dict[str, float],
+        max_error: Dict[str, float],
+        context_hash: str,
+        horizon_s: float,
+        samples: int,
+        margin_sigmas: float = 3.0,
+    ) -> None:
+        self.parameters = list(parameters)
+        self.names = [parameter.name for parameter in self.parameters]
+        self.kpis = list(kpis)
+        self.exponents = np.asarray(exponents, dtype=int)
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        self.degree = dict(degree)
+        self.rmse = dict(rmse)
+        self.max_error = dict(max_error)
+        self.context_hash = context_hash
+        self.horizon_s = horizon_s
+        self.samples = samples
+        self.margin_sigmas = margin_sigmas
+        self.low = np.array([parameter.low for parameter in self.parameters])
+        self.high = np.array([parameter.high for parameter in self.parameters])
+        self._max_degree = int(self.exponents.max()) if self.exponents.size else 0
+        self._dims = np.arange(len(self.parameters))
+        # Single-point prediction: x = values * scale + offset in [-1, 1], basis via one flat gather.
+        self._scale = 2.0 / (self.high - self.low)
+        self._offset = -1.0 - self.low * self._scale
+        self._flat_index = self.exponents * len(self.parameters) + self._dims
+        self._scale_list = self._scale.tolist()
+        self._offset_list = self._offset.tolist()
+
+    # -- envelope -----------------------------------------------------------------
+
+    def in_envelope(self, values: Sequence[float]) -> bool:
+        x = np.asarray(values, dtype=float) * self._scale + self._offset
+        return bool(((x >= -1.0 - _ENVELOPE_TOL) & (x <= 1.0 + _ENVELOPE_TOL)).all())
+
+    def matches(
+        self,
+        material: MaterialSystem,
+        process: ProcessConditions,
+        mold: MoldProperties,
+        quality: QualityTargets,
+        config: SimulationConfig,
+        varied: Sequence[str] = (),
+    ) -> bool:
+        """True if the fixed inputs equal the training ones and every `varied` name is a surrogate parameter."""
+
+        if any(name not in self.names for name in varied):
+            return False
+        return fixed_inputs_hash(self.names, material, process, mold, quality, config) == self.context_hash
+
+    def values_for(
+        self,
+        material: MaterialSystem,
+        process: ProcessConditions,
+        mold: MoldProperties,
+        config: SimulationConfig,
+    ) -> np.ndarray:
+        """Surrogate input vector for concrete inputs."""
+
+        return parameter_values(self.names, material, process, mold, config)
+
+    # -- prediction ---------------------------------------------------------------
+
+    def predict_batch(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        """KPI arrays for `values` of shape `(n_points, n_parameters)` (no envelope check)."""
+
+        x = np.atleast_2d(np.asarray(values, dtype=float)) * self._scale + self._offset
+        table = _legendre_table(x, self._max_degree)
+        basis = table[:, self._dims, self.exponents].prod(axis=-1)
+        out = basis @ self.coefficients
+        return {kpi: out[:, k] for k, kpi in enumerate(self.kpis)}
+
+    def predict(self, values: Sequence[float]) -> SurrogatePrediction:
+        """KPIs of one point (Legendre table in plain floats: NumPy call overhead dominates at this size)."""
+
+        x = [float(value) * scale + offset for value, scale, offset in zip(values, self._scale_list, self._offset_list)]
+        table = [1.0] * len(x) + x
+        previous, current = table[: len(x)], x
+        for n in range(1, self._max_degree):
+            current, previous = [
+                ((2 * n + 1) * xi * now - n * before) / (n + 1) for xi, now, before in zip(x, current, previous)
+            ], current
+            table.extend(current)
+        out = np.array(table)[self._flat_index].prod(axis=1) @ self.coefficients
+        inside = all(-1.0 - _ENVELOPE_TOL <= xi <= 1.0 + _ENVELOPE_TOL for xi in x)
+        return SurrogatePrediction(kpis=dict(zip(self.kpis, out.tolist())), error=self.rmse, in_envelope=inside)
+
+    def margin(self, kpi: str) -> float:
+        """Distance to a limit below which a prediction is not trusted."""
+
+        return self.margin_sigmas * self.rmse.get(kpi, 0.0)
+
+    def boundary_flags(self, kpis: Dict[str, float], quality: QualityTargets) -> List[str]:
+        """KPIs predicted within `margin` of a quality/pressure limit (those need the full simulation)."""
+
+        p_limit = quality.p_max_allowable_bar * 100_000.0
+        limits = {
+            "p_max_Pa": (0.9 * p_limit, p_limit),
+            "defect_risk": (quality.defect_risk_max,),
+            "rho_moulded": (quality.rho_moulded_min, quality.rho_moulded_max),
+            "t_demold_opt_s": (self.horizon_s,),
+        }
+        return [
+            kpi
+            for kpi, bounds in limits.items()
+            if kpi in kpis and any(abs(kpis[kpi] - bound) <= self.margin(kpi) for bound in bounds)
+        ]
+
+    # -- persistence --------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "parameters": [parameter.model_dump() for parameter in self.parameters],
+            "kpis": self.kpis,
+            "exponents": self.exponents.tolist(),
+            "coefficients": self.coefficients.tolist(),
+            "degree": self.degree,
+            "rmse": self.rmse,
+            "max_error": self.max_error,
+            "context_hash": self.context_hash,
+            "horizon_s": self.horizon_s,
+            "samples": self.samples,
+            "margin_sigmas": self.margin_sigmas,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KPISurrogate":
+        return cls(
+            parameters=[ParameterRange(**item) for item in data["parameters"]],
+            kpis=data["kpis"],
+            exponents=np.array(data["exponents"], dtype=int),
+            coefficients=np.array(data["coefficients"], dtype=float),
+            degree=data["degree"],
+            rmse=data["rmse"],
+            max_error=data["max_error"],
+            context_hash=data["context_hash"],
+            horizon_s=data["horizon_s"],
+            samples=data["samples"],
+            margin_sigmas=data.get("margin_sigmas", 3.0),
+        )
+
+    def save(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "KPISurrogate":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def train_surrogate(
+    material: MaterialSystem,
+    process: ProcessConditions,
+    mold: MoldProperties,
+    parameters: Sequence[ParameterRange],
+    quality: Optional[QualityTargets] = None,
+    config: Optional[SimulationConfig] = None,
+    samples: int = 1024,
+    max_degree: int = 4,
+    validation_fraction: float = 0.2,
+    seed: Optional[int] = 0,
+    margin_sigmas: float = 3.0,
+    cache: Optional[SimulationCache] = None,
+    chunk_size: int = 1024,
+) -> KPISurrogate:
+    """Fit a `KPISurrogate` on `samples` batched runs over the parameter box."""
+
+    if max_degree < 1:
+        raise ValueError("max_degree must be >= 1")
+    if not 0.0 < validation_fraction < 1.0:
+        raise ValueError("validation_fraction must be in (0, 1)")
+    quality = quality or QualityTargets()
+    config = config or SimulationConfig()
+    names = [parameter.name for parameter in parameters]
+    evaluator = KPIEvaluator(material, process, mold, names, quality, config, cache, chunk_size)
+    for parameter in parameters:  # validators run once on the bounds, not per sample
+        evaluator.validate(parameter.name, parameter.low)
+        evaluator.validate(parameter.name, parameter.high)
+
+    exponent = int(np.ceil(np.log2(max(samples, 2))))
+    unit = qmc.Sobol(len(parameters), scramble=True, seed=seed).random_base2(exponent)[:samples]
+    values = scale_to_bounds(unit, parameters)
+    outputs = evaluator.evaluate(values, SURROGATE_KPIS)
+    for name in _DEMOLD_KPIS:
+        outputs[name] = np.where(np.isnan(outputs[name]), evaluator.horizon_s, outputs[name])
+
+    exponents = _multi_indices(len(parameters), max_degree)
+    total_degree = exponents.sum(axis=1)
+    basis = _legendre_table(2.0 * unit - 1.0, max_degree)[:, np.arange(len(parameters)), exponents].prod(axis=-1)
+
+    order = np.random.default_rng(seed).permutation(samples)
+    n_validation = max(1, int(round(validation_fraction * samples)))
+    validation, training = order[:n_validation], order[n_validation:]
+
+    coefficients = np.zeros((len(exponents), len(SURROGATE_KPIS)))
+    degree: Dict[str, int] = {}
+    rmse: Dict[str, float] = {}
+    max_error: Dict[str, float] = {}
+    for k, kpi in enumerate(SURROGATE_KPIS):
+        y = outputs[kpi]
+        best = None
+        for candidate in range(1, max_degree + 1):
+            columns = total_degree <= candidate
+            if columns.sum() >= len(training):
+                break
+            coef = np.linalg.lstsq(basis[training][:, columns], y[training], rcond=None)[0]
+            residual = basis[validation][:, columns] @ coef - y[validation]
+            score = float(np.sqrt(np.mean(residual**2)))
+            if best is None or score < best[1]:
+                best = (candidate, score, float(np.max(np.abs(residual))))
+        if best is None:
+            raise ValueError(f"Too few samples ({samples}) for a degree-1 expansion of {len(parameters)} parameters.")
+        degree[kpi], rmse[kpi], max_error[kpi] = best
+        columns = total_degree <= degree[kpi]
+        coefficients[columns, k] = np.linalg.lstsq(basis[:, columns], y, rcond=None)[0]
+
+    return KPISurrogate(
+        parameters=parameters,
+        kpis=SURROGATE_KPIS,
+        exponents=exponents,
+        coefficients=coefficients,
+        degree=degree,
+        rmse=rmse,
+        max_error=max_error,
+        context_hash=fixed_inputs_hash(names, material, process, mold, quality, evaluator.base["config"]),
+        horizon_s=evaluator.horizon_s,
+        samples=samples,
+        margin_sigmas=margin_sigmas,
+    )
@@ -3,13 +3,13 @@ Cost functions for calibration and validation.
 
 Functions operate on lightweight dict-like simulation outputs (matching
 `SimulationResult.to_dict()`) and reference measurements loaded by
-`calibration.loader`.
+`calibration.loader` (columnar DataFrames or legacy lists of row dicts).
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Optional, Sequence, Tuple
+from typing import Any, Iterable, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -31,11 +31,27 @@ def _interpolate(time_s: Sequence[float], values: Sequence[float], target_time:
     return values[-1]
 
 
+def _has_rows(ref: Any) -> bool:
+    if ref is None:
+        return False
+    try:
+        return len(ref) > 0
+    except TypeError:  # plain iterables (generators) are consumed lazily
+        return True
+
+
 def rmse_core_temperature(sim_time_s: Sequence[float], sim_T_core_K: Sequence[float], ref: Iterable[dict]) -> float:
     """RMSE [K] between simulated T_core profile and reference points (time_s, T_core_C)."""
 
-    if not ref:
+    if not _has_rows(ref):
         return 0.0
+    if hasattr(ref, "columns"):  # columnar reference (DataFrame) -> vectorized interpolation
+        if len(sim_time_s) == 0:
+            return 0.0
+        t_ref = ref["time_s"].to_numpy(dtype=float)
+        T_ref_K = ref["T_core_C"].to_numpy(dtype=float) + 273.15
+        T_sim = np.interp(t_ref, np.asarray(sim_time_s, dtype=float), np.asarray(sim_T_core_K, dtype=float))
+        return float(np.sqrt(np.mean((T_sim - T_ref_K) ** 2)))
     errors = []
     for row in ref:
         t = float(row["time_s"])
@@ -75,7 +91,7 @@ def aggregate_cost(sim: dict, targets: CalibrationTargets, weights: Optional[dic
     breakdown = {}
     total = 0.0
 
-    if targets.T_core_profile:
+    if _has_rows(targets.T_core_profile):
         rmse = rmse_core_temperature(sim["time_s"], sim["T_core_K"], targets.T_core_profile)
         breakdown["rmse_T_core_K"] = rmse
         total += weights.get("rmse_T_core_K", 1.0) * rmse
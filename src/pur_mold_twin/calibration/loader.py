@@ -4,6 +4,10 @@ Utilities for loading calibration datasets (meta + measurement files).
 Datasets follow the structure defined in docs/CALIBRATION.md:
 <root>/measurements/meta.yaml, core_temp.csv, mold_temp.csv, pressure.csv,
 density_mech.yaml. Only meta.yaml is mandatory; other files are optional.
+
+Timeseries are kept columnar (pandas DataFrame with float64 columns). CSV is
+parsed with the pyarrow engine when available; Parquet/Arrow files are read
+through memory maps so long high-rate logs do not get copied row by row.
 """
 
 from __future__ import annotations
@@ -11,13 +15,21 @@ from __future__ import annotations
 import csv
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
 
 try:  # pandas opcjonalne (wspiera odczyt Parquet)
     import pandas as pd  # type: ignore
 except ModuleNotFoundError:  # pragma: no cover
     pd = None  # type: ignore
 
+try:  # pyarrow opcjonalne (szybki parser CSV + memory-mapped Arrow)
+    from pyarrow import feather as pa_feather  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    pa_feather = None  # type: ignore
+
+# DataFrame when pandas is installed, legacy list of row dicts otherwise.
+Timeseries = Union["pd.DataFrame", List[dict]]
+
 from ..material_db.loader import _ensure_yaml_available  # reuse ruamel gate
 
 
@@ -27,9 +39,9 @@ class CalibrationDataset:
 
     root: Path
     metadata: dict
-    core_temperature: Optional[List[dict]] = None
-    mold_temperature: Optional[List[dict]] = None
-    pressure: Optional[List[dict]] = None
+    core_temperature: Optional[Timeseries] = None
+    mold_temperature: Optional[Timeseries] = None
+    pressure: Optional[Timeseries] = None
     density_mechanical: Optional[dict] = None
 
     def has_core_temperature(self) -> bool:
@@ -78,23 +90,43 @@ def _load_yaml(path: Path) -> dict:
     return data
 
 
-def _load_timeseries(directory: Path, stem: str) -> Optional[List[dict]]:
+def _load_timeseries(directory: Path, stem: str) -> Optional[Timeseries]:
     csv_path = directory / f"{stem}.csv"
     parquet_path = directory / f"{stem}.parquet"
+    arrow_path = directory / f"{stem}.arrow"
     if csv_path.exists():
-        with csv_path.open("r", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
-            return [_convert_row(row) for row in reader]
+        if pd is None:  # pragma: no cover
+            with csv_path.open("r", encoding="utf-8") as handle:
+                reader = csv.DictReader(handle)
+                return [_convert_row(row) for row in reader]
+        engine = "pyarrow" if pa_feather is not None else "c"
+        return _as_float64(pd.read_csv(csv_path, engine=engine))
     if parquet_path.exists():
         if pd is None:  # pragma: no cover
             raise RuntimeError(
                 f"Unable to read {parquet_path}: install pandas with pyarrow or provide CSV."
             )
-        frame = pd.read_parquet(parquet_path)
-        return frame.to_dict("records")
+        return _as_float64(pd.read_parquet(parquet_path, memory_map=True))
+    if arrow_path.exists():
+        if pd is None or pa_feather is None:  # pragma: no cover
+            raise RuntimeError(
+                f"Unable to read {arrow_path}: install pandas with pyarrow or provide CSV."
+            )
+        table = pa_feather.read_table(arrow_path, memory_map=True)
+        return _as_float64(table.to_pandas())
     return None
 
 
+def _as_float64(frame: "pd.DataFrame") -> "pd.DataFrame":
+    """Cast numeric columns to float64 (matches the legacy float() row parsing)."""
+
+    for column in frame.columns:
+        if pd.api.types.is_numeric_dtype(frame[column]) and not pd.api.types.is_bool_dtype(frame[column]):
+            if frame[column].dtype != "float64":
+                frame[column] = frame[column].astype("float64")
+    return frame
+
+
 def _convert_row(row: dict) -> dict:
     out: dict[str, Any] = {}
     for key, value in row.items():
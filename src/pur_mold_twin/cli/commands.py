@@ -8,7 +8,6 @@ in tests and higher-level wrappers (see `main.py` for registration).
 from __future__ import annotations
 
 import csv
-import json
 from dataclasses import asdict
 from enum import Enum
 from pathlib import Path
@@ -19,13 +18,15 @@ from pydantic import ValidationError
 
 from ..configs import load_process_scenario, load_quality_preset
 from ..core import MVP0DSimulator
+from ..core.serialization import dumps_json, result_to_dict
 from ..material_db.loader import load_material_catalog
 from ..material_db.models import MaterialSystem
 from ..optimizer import OptimizationConfig, ProcessOptimizer
 from ..reporting import generate_report, plot_profiles
 from ..data.sql_source import SQLProcessLogSource, load_sql_source_from_yaml
-from ..data.etl import build_log_bundles_from_source
-from ..logging.features import compute_basic_features
+from ..data.etl import build_log_bundles_from_source, export_log_bundles
+from ..data.shot_store import ShotStoreSource, is_shot_store
+from ..logging.features import compute_feature_row
 from ..ml.inference import attach_ml_predictions
 from ..ml.drift import classify_drift, compute_drift
 from ..utils import get_logger
@@ -40,6 +41,7 @@ def register_commands(app: typer.Typer) -> None:
     app.command("run-sim")(run_sim)
     app.command("optimize")(optimize)
     app.command("build-features")(build_features_cli)
+    app.command("build-dataset")(build_dataset_cli)
     app.command("import-logs")(import_logs)
     app.command("check-drift")(check_drift)
 
@@ -49,6 +51,12 @@ class OutputFormat(str, Enum):
     TABLE = "table"
 
 
+class ImportFormat(str, Enum):
+    DIRS = "dirs"
+    JSONL = "jsonl"
+    STORE = "store"
+
+
 class RunMode(str, Enum):
     EXPERT = "expert"
     OPERATOR = "operator"
@@ -99,6 +107,13 @@ def run_sim(
         "--mode",
         help="Output mode: 'expert' (full JSON/table) or 'operator' (focused KPI view).",
     ),
+    kpi_only: bool = typer.Option(False, "--kpi-only", help="JSON with KPI scalars only (no time series)."),
+    fields: Optional[str] = typer.Option(
+        None, "--fields", help="Comma-separated SimulationResult fields to include in the JSON."
+    ),
+    precision: Optional[int] = typer.Option(
+        None, "--precision", min=1, help="Round floats in the JSON to N significant digits."
+    ),
 ) -> None:
     """Run a single 0D simulation."""
 
@@ -118,12 +133,22 @@ def run_sim(
     simulator = MVP0DSimulator(sim_config)
     result = simulator.run(material_system, scenario_data.process, scenario_data.mold, quality_targets)
 
-    payload = result.to_dict()
+    full_payload = result_to_dict(result)
+    try:
+        payload = result_to_dict(
+            result,
+            fields=None if fields is None else [name.strip() for name in fields.split(",") if name.strip()],
+            kpi_only=kpi_only,
+            precision=precision,
+        )
+    except ValueError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(1)
 
     if with_ml:
         try:
-            features_df = compute_basic_features(
-                payload,
+            features_row = compute_feature_row(
+                full_payload,
                 measured=None,
                 qc=None,
                 process={
@@ -135,7 +160,6 @@ def run_sim(
                     "mixing_eff": scenario_data.process.mixing_eff,
                 },
             )
-            features_row = dict(features_df.iloc[0])
             payload = attach_ml_predictions(payload, features_row)
         except Exception as exc:  # pragma: no cover
             LOGGER.warning("ML predictions could not be attached: %s", exc)
@@ -250,8 +274,8 @@ def optimize(
     if save_json:
         data = {
             "summary": summary,
-            "baseline": baseline_result.to_dict(),
-            "best_simulation": result.best_simulation.to_dict(),
+            "baseline": result_to_dict(baseline_result),
+            "best_simulation": result_to_dict(result.best_simulation),
             "best_candidate": asdict(result.best_candidate),
             "history": [
                 {
@@ -298,6 +322,116 @@ def build_features_cli(
     typer.echo(f"Saved features to {saved_path} (rows={len(features)}); columns={list(features.columns)}")
 
 
+def build_dataset_cli(
+    sim: Optional[Path] = typer.Option(
+        None,
+        "--sim",
+        "-s",
+        help="Simulation JSON/.npz log shared by all shots, a directory with <shot_id>.json/.npz per shot, or a .simseg segment.",
+    ),
+    simulate_scenario: Optional[Path] = typer.Option(
+        None,
+        "--simulate",
+        help="Scenario YAML (system/mold/quality/simulation): simulate every shot from its process log instead of --sim.",
+    ),
+    systems: Path = typer.Option(
+        Path("configs/systems/jr_purtec_catalog.yaml"), "--systems", "-c", help="Material DB catalog for --simulate."
+    ),
+    sim_cache: Optional[Path] = typer.Option(
+        None, "--sim-cache", help="Simulation summary cache directory (default: <output dir>/sim_cache)."
+    ),
+    sim_workers: int = typer.Option(1, "--sim-workers", min=1, help="Processes running simulations for --simulate."),
+    logs: Optional[Path] = typer.Option(
+        None, "--logs", "-l", help="Root directory with shot log folders (meta.yaml per shot) or a shot store."
+    ),
+    source_config: Optional[Path] = typer.Option(
+        None, "--source", help="YAML config for SQL datasource (alternative to --logs)."
+    ),
+    output: Path = typer.Option("data/ml/features.parquet", "--output", "-o", help="Output Parquet (or .csv)."),
+    workers: int = typer.Option(4, "--workers", "-w", min=1, help="Worker threads for feature extraction."),
+    chunk_size: int = typer.Option(500, "--chunk-size", min=1, help="Shots per chunk / Parquet row group."),
+    system_id: Optional[str] = typer.Option(
+        None, "--system-id", help="Optional system_id filter for --source or a shot store."
+    ),
+    rate_hz: Optional[float] = typer.Option(
+        None, "--rate-hz", min=0.0, help="Common sensor grid rate (default: fastest sensor)."
+    ),
+    tolerance_s: Optional[float] = typer.Option(
+        None, "--tolerance-s", min=0.0, help="Max distance to a raw sample before a grid point is NaN."
+    ),
+) -> None:
+    """Stream a feature dataset over a whole shot archive (bounded memory)."""
+
+    if (logs is None) == (source_config is None):
+        typer.echo("Provide exactly one of --logs or --source.", err=True)
+        raise typer.Exit(1)
+    if (sim is None) == (simulate_scenario is None):
+        typer.echo("Provide exactly one of --sim or --simulate.", err=True)
+        raise typer.Exit(1)
+
+    from ..data.alignment import AlignmentConfig
+    from ..data.dataset import build_dataset_streaming
+    from ..data.interfaces import ProcessLogQuery  # local import to avoid cycles
+
+    alignment = None
+    if rate_hz is not None or tolerance_s is not None:
+        try:
+            alignment = AlignmentConfig(rate_hz=rate_hz, tolerance_s=tolerance_s)
+        except ValueError as exc:
+            typer.echo(f"Invalid alignment options: {exc}", err=True)
+            raise typer.Exit(1)
+
+    query = None
+    if source_config is not None:
+        if not source_config.exists():
+            typer.echo(f"Source config '{source_config}' does not exist.", err=True)
+            raise typer.Exit(1)
+        origin = load_sql_source_from_yaml(source_config)
+        query = ProcessLogQuery(system_id=system_id)
+    else:
+        if not logs.is_dir():
+            typer.echo(f"Log directory '{logs}' does not exist.", err=True)
+            raise typer.Exit(1)
+        origin = logs
+        if is_shot_store(logs):
+            origin = ShotStoreSource(logs)
+            query = ProcessLogQuery(system_id=system_id)
+
+    simulator = None
+    if simulate_scenario is not None:
+        from ..data.sim_cache import ShotSimulator, SimulationCache
+
+        scenario_data = _load_process_scenario(simulate_scenario)
+        simulator = ShotSimulator(
+            _load_system(scenario_data.system_id, systems),
+            scenario_data.mold,
+            quality=scenario_data.quality,
+            config=scenario_data.simulation,
+            cache=SimulationCache(sim_cache or output.parent / "sim_cache"),
+            workers=sim_workers,
+        )
+
+    try:
+        rows, saved_path = build_dataset_streaming(
+            origin,
+            sim,
+            output,
+            query=query,
+            workers=workers,
+            chunk_size=chunk_size,
+            alignment=alignment,
+            simulator=simulator,
+        )
+    finally:
+        if not isinstance(origin, Path):
+            origin.close()
+        if simulator is not None:
+            simulator.close()
+    typer.echo(f"Saved features to {saved_path} (rows={rows})")
+    if simulator is not None:
+        typer.echo(f"Simulations: {simulator.simulated} run, {simulator.reused} reused from cache")
+
+
 def _load_process_scenario(path: Path):
     try:
         return load_process_scenario(path)
@@ -350,7 +484,7 @@ def _prepare_report_paths(report: Path) -> tuple[Path, Path]:
 
 
 def _emit_json(payload: dict, output: Optional[Path], *, echo: bool) -> None:
-    text = json.dumps(payload, indent=2, ensure_ascii=False)
+    text = dumps_json(payload, indent=2)
     if echo:
         typer.echo(text)
     if output:
@@ -518,6 +652,19 @@ def import_logs(
         "--system-id",
         help="Optional system_id filter passed to the log source.",
     ),
+    workers: int = typer.Option(4, "--workers", "-w", min=1, help="Writer threads."),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Skip shots already present in the output (complete shot directory or JSONL record).",
+    ),
+    output_format: ImportFormat = typer.Option(
+        ImportFormat.DIRS,
+        "--format",
+        case_sensitive=False,
+        help="'dirs' (meta/process/qc YAML + sensor CSVs per shot), 'jsonl' (single shots.jsonl) "
+        "or 'store' (partitioned Parquet shot store).",
+    ),
 ) -> None:
     """
     Import process logs from an external datasource (SQL) and normalize them into
@@ -536,50 +683,39 @@ def import_logs(
         raise typer.Exit(1)
 
     from ..data.interfaces import ProcessLogQuery  # local import to avoid cycles
-    from ruamel.yaml import YAML
 
     query = ProcessLogQuery(system_id=system_id)
-    bundles = list(build_log_bundles_from_source(source, query))
-    if not bundles:
+    try:
+        summary = export_log_bundles(
+            build_log_bundles_from_source(source, query),
+            output_dir,
+            workers=workers,
+            resume=resume,
+            output_format=output_format.value,
+        )
+    finally:
+        source.close()
+
+    if summary.written == 0 and summary.skipped == 0:
         typer.echo("No logs returned from source.")
         return
 
-    yaml = YAML()
-    output_dir.mkdir(parents=True, exist_ok=True)
-    written = 0
-    for bundle in bundles:
-        shot_id = str(bundle.metadata.get("shot_id") or f"shot_{written+1}")
-        shot_dir = output_dir / shot_id
-        shot_dir.mkdir(parents=True, exist_ok=True)
-
-        meta = {
-            "shot_id": shot_id,
-            "system_id": bundle.metadata.get("system_id"),
-        }
-        with (shot_dir / "meta.yaml").open("w", encoding="utf-8") as handle:
-            yaml.dump(meta, handle)
-
-        with (shot_dir / "process.yaml").open("w", encoding="utf-8") as handle:
-            yaml.dump(bundle.process, handle)
-
-        with (shot_dir / "qc.yaml").open("w", encoding="utf-8") as handle:
-            yaml.dump(bundle.qc, handle)
-
-        written += 1
-
-    typer.echo(f"Imported {written} shots into {output_dir}")
+    message = f"Imported {summary.written} shots into {summary.output}"
+    if summary.skipped:
+        message += f" (skipped {summary.skipped} existing)"
+    typer.echo(message)
 
 
 def check_drift(
-    baseline: Path = typer.Option(
-        ...,
+    baseline: Optional[Path] = typer.Option(
+        None,
         "--baseline",
         help="Baseline features parquet/CSV (reference period).",
     ),
-    current: Path = typer.Option(
-        ...,
+    current: Optional[Path] = typer.Option(
+        None,
         "--current",
-        help="Current features parquet/CSV (recent period).",
+        help="Current features parquet/CSV (recent period; with --state: only the new shots).",
     ),
     warn_threshold: float = typer.Option(
         0.1,
@@ -591,14 +727,44 @@ def check_drift(
         "--alert-threshold",
         help="Absolute mean delta above which drift is ALERT.",
     ),
+    state: Optional[Path] = typer.Option(
+        None,
+        "--state",
+        help="Drift monitor state (JSON sketches). Created from --baseline if missing, updated with --current.",
+    ),
+    window_hours: Optional[float] = typer.Option(
+        None,
+        "--window-hours",
+        min=0.0,
+        help="With --state: compare the baseline against the last N hours only (default: all retained buckets).",
+    ),
 ) -> None:
     """
     Check data drift between two feature datasets and exit with status:
     0=OK, 1=WARNING, 2=ALERT.
     """
 
+    from ..ml.drift_monitor import DriftMonitor
+
     try:
-        report = compute_drift(baseline, current)
+        if state is None:
+            if baseline is None or current is None:
+                typer.echo("Provide --baseline and --current (or --state).", err=True)
+                raise typer.Exit(1)
+            report = compute_drift(baseline, current)
+        else:
+            if state.exists():
+                monitor = DriftMonitor.load(state)
+            elif baseline is not None:
+                monitor = DriftMonitor.from_features_file(baseline)
+            else:
+                typer.echo(f"State '{state}' does not exist; provide --baseline to initialise it.", err=True)
+                raise typer.Exit(1)
+            if current is not None:
+                monitor.update_from_file(current)
+            monitor.save(state)
+            window_s = None if window_hours is None else window_hours * 3600.0
+            report = monitor.report(window_s)
     except FileNotFoundError as exc:
         typer.echo(str(exc), err=True)
         raise typer.Exit(1)
@@ -609,7 +775,10 @@ def check_drift(
     for m in report.metrics:
         if m.abs_delta is None:
             continue
-        typer.echo(f"{m.column}: baseline={m.baseline_mean:.4f}, current={m.current_mean:.4f}, delta={m.abs_delta:.4f}")
+        line = f"{m.column}: baseline={m.baseline_mean:.4f}, current={m.current_mean:.4f}, delta={m.abs_delta:.4f}"
+        if m.psi is not None:
+            line += f", psi={m.psi:.4f}, ks={m.ks:.4f}, n={m.current_count}"
+        typer.echo(line)
 
     if status == "ALERT":
         raise typer.Exit(2)
@@ -0,0 +1,422 @@
+"""
+Vectorized 0D simulation of many independent runs.
+
+The `manual` backend step (`step_kinetics`, `step_heat_transfer`,
+`step_gas_state`) written element-wise over NumPy arrays of shape
+`(n_runs,)`. Every run carries its own `SimulationContext`, including its
+own `SimulationConfig` (kinetics, gas and hardness parameters may differ
+per run); only the time grid (`total_time_s`, `time_step_s`) is shared.
+
+- `iter_batch_states` yields the state arrays after every step (used by
+  `PlantSimulator`, which collects full series per mold),
+- `batch_kpis` reduces the states on the fly to the scalar KPIs of
+  `finalize_result` (demold window, p_max, moulded density, hardness,
+  quality status and defect risk) without storing series, in chunks of
+  `chunk_size` runs. This is the engine behind large designs (sensitivity
+  analysis, Monte Carlo): the per-step Python overhead is paid once per
+  chunk instead of once per run.
+
+Configs without a vectorized kernel (non-`manual` backends, the 1D
+experimental model) fall back to one scalar run per context.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import ode_backends, simulation, simulation_1d
+from .gases import compute_pressures, headspace_volume, pressure_status
+from .kinetics import GAS_CONSTANT as KINETICS_GAS_CONSTANT
+from .thermal import initial_core_temperature, initial_density
+from .types import SimulationConfig
+from .utils import GAS_CONSTANT, STANDARD_PRESSURE_PA, celsius_to_kelvin, clamp, linspace
+
+
+# State variables yielded per step (time_s is shared, hardness is derived from alpha and rho).
+STATE_SERIES = (
+    "alpha",
+    "T_core_K",
+    "T_mold_K",
+    "rho_kg_per_m3",
+    "fill_ratio",
+    "n_CO2_mol",
+    "p_air_Pa",
+    "p_CO2_Pa",
+    "p_pentane_Pa",
+    "p_total_Pa",
+    "vent_eff",
+)
+
+# Scalar KPIs returned by `batch_kpis` (missing demold window / vent closure -> NaN).
+BATCH_KPI_FIELDS = (
+    "T_core_max_K",
+    "T_core_t_at_max_s",
+    "p_max_Pa",
+    "p_t_at_max_s",
+    "rho_moulded",
+    "t_demold_min_s",
+    "t_demold_max_s",
+    "t_demold_opt_s",
+    "vent_closure_time_s",
+    "H_demold_shore",
+    "H_24h_shore",
+    "defect_risk",
+    "pressure_status",
+    "quality_status",
+)
+_STATUS_FIELDS = ("pressure_status", "quality_status")
+# Series the scalar fallback needs for the T_core / p_total maxima.
+_FALLBACK_CHANNELS = ["time_s", "T_core_K", "p_total_Pa"]
+
+
+def is_vectorized(config: SimulationConfig) -> bool:
+    """True when `config` runs on the vectorized kernel (0D, `manual` backend)."""
+
+    return config.backend == "manual" and config.dimension == "0d"
+
+
+def shared_time_grid(contexts: Sequence[simulation.SimulationContext]) -> List[float]:
+    """The common time grid of `contexts` (ValueError if their horizons or steps differ)."""
+
+    if not contexts:
+        raise ValueError("At least one simulation context is required.")
+    cfg = contexts[0].config
+    for ctx in contexts:
+        if ctx.config.total_time_s != cfg.total_time_s or ctx.config.time_step_s != cfg.time_step_s:
+            raise ValueError("Batched runs must share total_time_s and time_step_s.")
+    return linspace(0.0, cfg.total_time_s, cfg.steps())
+
+
+class _Params:
+    """Per-run context and config values as arrays (shape `(n_runs,)`)."""
+
+    def __init__(self, contexts: Sequence[simulation.SimulationContext]) -> None:
+        def column(getter) -> np.ndarray:
+            return np.array([getter(ctx) for ctx in contexts], dtype=float)
+
+        self.mixing = column(lambda c: c.mixing_factor)
+        self.tau = column(lambda c: max(c.tau_s, 1e-3))
+        self.exponent = column(lambda c: c.exponent)
+        self.mass_total = column(lambda c: c.mass_total)
+        self.gas_release_eff = column(lambda c: c.gas_release_eff)
+        self.co2_total = column(lambda c: c.moles_co2_total)
+        self.liquid_volume = column(lambda c: c.effective_liquid_volume)
+        self.cavity = column(lambda c: c.cavity_volume)
+        self.n_air = column(lambda c: c.n_air_initial)
+        self.T_ambient = column(lambda c: c.T_ambient_K)
+        self.h_core_area = column(lambda c: c.mold.h_core_to_mold_W_per_m2K * c.mold.mold_surface_area_m2)
+        self.h_ambient_area = column(lambda c: c.mold.h_mold_to_ambient_W_per_m2K * c.mold.mold_surface_area_m2)
+        self.mold_capacity = column(lambda c: max(c.mold.mold_mass_kg * c.mold.cp_mold_J_per_kgK, 1e-6))
+        self.vent_closure = column(lambda c: max(c.vent.alpha_closure, 1e-3))
+        self.vent_clog = column(lambda c: c.vent.clog_rate)
+        self.vent_min = column(lambda c: c.vent.min_efficiency)
+        self.vent_conductance = column(lambda c: c.vent.total_conductance)
+
+        self.arrhenius_scale = column(lambda c: -c.config.activation_energy_J_per_mol / KINETICS_GAS_CONSTANT)
+        self.inv_reference = column(lambda c: 1.0 / max(c.config.reference_temperature_K, 1e-6))
+        self.reaction_enthalpy = column(lambda c: c.config.reaction_enthalpy_J_per_kg)
+        self.foam_capacity = np.maximum(self.mass_total * column(lambda c: c.config.foam_cp_J_per_kgK), 1e-6)
+        self.min_headspace = np.maximum(column(lambda c: c.config.min_headspace_fraction) * self.cavity, 1e-6)
+        self.pentane_onset = column(lambda c: c.config.pentane_evap_onset_K)
+        self.pentane_rate = column(lambda c: c.config.pentane_evap_base_rate)
+        self.pentane_slope = column(lambda c: c.config.pentane_evap_temp_slope)
+        self.vent_relief = column(lambda c: c.config.vent_relief_scale)
+        self.ambient_pressure = column(lambda c: c.config.ambient_pressure_Pa)
+
+
+def _pressures(params: _Params, n_co2, n_pentane, temperature, headspace):
+    scale = GAS_CONSTANT * np.maximum(temperature, 250.0) / np.maximum(headspace, 1e-9)
+    p_air = params.n_air * scale
+    p_co2 = n_co2 * scale
+    p_pentane = n_pentane * scale
+    return p_air, p_co2, p_pentane, p_air + p_co2 + p_pentane
+
+
+def _initial_state(contexts: Sequence[simulation.SimulationContext]) -> Dict[str, np.ndarray]:
+    """State at t=0, per run with the scalar helpers (as in `assemble_result`)."""
+
+    n_runs = len(contexts)
+    state = {name: np.zeros(n_runs) for name in STATE_SERIES}
+    state["T_core_K"] = np.array([initial_core_temperature(ctx.process) for ctx in contexts])
+    state["T_mold_K"] = np.array([celsius_to_kelvin(ctx.process.T_mold_init_C) for ctx in contexts])
+    state["vent_eff"][:] = 1.0
+    for j, ctx in enumerate(contexts):
+        cfg = ctx.config
+        headspace0 = headspace_volume(cfg, ctx.cavity_volume, min(ctx.effective_liquid_volume, ctx.cavity_volume))
+        p_air0, p_co20, p_pent0, p_total0 = compute_pressures(
+            n_air=ctx.n_air_initial,
+            n_co2=0.0,
+            n_pentane=0.0,
+            temperature_K=state["T_core_K"][j],
+            headspace_volume=headspace0,
+        )
+        state["rho_kg_per_m3"][j] = initial_density(
+            ctx.material,
+            ctx.process,
+            extra_mass=ctx.water_balance.water_from_rh_kg,
+            extra_volume=ctx.extra_water_volume,
+        )
+        state["fill_ratio"][j] = clamp(ctx.effective_liquid_volume / max(ctx.cavity_volume, 1e-12), 0.0, 1.5)
+        state["p_air_Pa"][j] = p_air0 if p_air0 > 0 else cfg.ambient_pressure_Pa
+        state["p_CO2_Pa"][j] = p_co20
+        state["p_pentane_Pa"][j] = p_pent0
+        state["p_total_Pa"][j] = p_total0 if p_total0 > 0 else cfg.ambient_pressure_Pa
+    return state
+
+
+def iter_batch_states(
+    contexts: Sequence[simulation.SimulationContext], time: Optional[Sequence[float]] = None
+) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+    """
+    Yield `(step_index, state)` for every point of the time grid, starting with t=0.
+
+    `state` maps each `STATE_SERIES` name to a fresh array of shape
+    `(len(contexts),)`; consumers may keep references to them.
+    """
+
+    time = shared_time_grid(contexts) if time is None else time
+    params = _Params(contexts)
+    state = _initial_state(contexts)
+    yield 0, state
+
+    n_runs = len(contexts)
+    T_core = state["T_core_K"]
+    T_mold = state["T_mold_K"]
+    phi = np.zeros(n_runs)
+    alpha = np.zeros(n_runs)
+    n_co2 = np.zeros(n_runs)
+    n_pent_liq = np.array([ctx.n_pentane_total for ctx in contexts])
+    n_pent_gas = np.zeros(n_runs)
+    rate_base = 0.4 + 0.6 * params.mixing
+
+    for idx in range(1, len(time)):
+        dt = time[idx] - time[idx - 1]
+
+        # Kinetics (step_kinetics)
+        rate = np.exp(params.arrhenius_scale * (1.0 / np.maximum(T_core, 250.0) - params.inv_reference)) * rate_base
+        phi = np.maximum(phi + dt * rate / params.tau, 0.0)
+        alpha_new = 1.0 - np.exp(-(phi ** params.exponent))
+        dalpha_dt = np.maximum(0.0, (alpha_new - alpha) / max(dt, 1e-9))
+        alpha = alpha_new
+
+        # Heat transfer (step_heat_transfer)
+        heat_to_mold = params.h_core_area * (T_core - T_mold)
+        heat_release = params.reaction_enthalpy * params.mass_total * dalpha_dt
+        dT_core = (heat_release - heat_to_mold) / params.foam_capacity
+        dT_mold = (heat_to_mold - params.h_ambient_area * (T_mold - params.T_ambient)) / params.mold_capacity
+        T_core = T_core + dT_core * dt
+        T_mold = T_mold + dT_mold * dt
+
+        # Gas balance (step_gas_state)
+        target_co2 = np.minimum(params.co2_total, params.co2_total * alpha**1.1 * params.gas_release_eff)
+        n_co2 = n_co2 + np.maximum(0.0, target_co2 - n_co2)
+        over_onset = T_core - params.pentane_onset
+        evap_rate = np.where(
+            over_onset > 0.0,
+            params.pentane_rate * (1.0 - np.power(2.718281828459045, -params.pentane_slope * over_onset)),
+            0.0,
+        )
+        delta_pentane = np.minimum(n_pent_liq, evap_rate * n_pent_liq * dt)
+        n_pent_liq = n_pent_liq - delta_pentane
+        n_pent_gas = n_pent_gas + delta_pentane
+
+        total_volume = params.liquid_volume + (n_co2 + n_pent_gas) * GAS_CONSTANT * T_core / STANDARD_PRESSURE_PA
+        fill_candidate = np.clip(total_volume / np.maximum(params.cavity, 1e-12), 0.0, 1.5)
+        headspace = np.maximum(params.cavity - np.minimum(total_volume, params.cavity), params.min_headspace)
+        alpha_term = np.maximum(0.0, 1.0 - (alpha / params.vent_closure) ** params.vent_clog)
+        fill_penalty = 1.0 / (1.0 + np.maximum(0.0, fill_candidate - 1.0) * params.vent_relief)
+        vent_eff = np.clip(np.maximum(params.vent_min, alpha_term * fill_penalty), params.vent_min, 1.0)
+        pressures = _pressures(params, n_co2, n_pent_gas, T_core, headspace)
+
+        vent_flow = params.vent_conductance * vent_eff * np.maximum(pressures[3] - params.ambient_pressure, 0.0)
+        n_pressure_gases = n_co2 + n_pent_gas
+        venting = (vent_flow > 0.0) & (n_pressure_gases > 1e-9)
+        if venting.any():
+            safe_total = np.where(venting, n_pressure_gases, 1.0)
+            removed = vent_flow * dt * pressures[3] / np.maximum(GAS_CONSTANT * T_core, 1e-9)
+            removed = np.where(venting, np.minimum(removed, n_pressure_gases), 0.0)
+            n_co2 = n_co2 - removed * (n_co2 / safe_total)
+            n_pent_gas = n_pent_gas - removed * (n_pent_gas / safe_total)
+            vented = _pressures(params, n_co2, n_pent_gas, T_core, headspace)
+            pressures = tuple(np.where(venting, after, before) for after, before in zip(vented, pressures))
+
+        total_volume = params.liquid_volume + (n_co2 + n_pent_gas) * GAS_CONSTANT * T_core / STANDARD_PRESSURE_PA
+        yield idx, {
+            "alpha": alpha,
+            "T_core_K": T_core,
+            "T_mold_K": T_mold,
+            "rho_kg_per_m3": params.mass_total / np.maximum(np.minimum(total_volume, params.cavity), 1e-9),
+            "fill_ratio": np.clip(total_volume / np.maximum(params.cavity, 1e-12), 0.0, 1.5),
+            "n_CO2_mol": n_co2,
+            "p_air_Pa": pressures[0],
+            "p_CO2_Pa": pressures[1],
+            "p_pentane_Pa": pressures[2],
+            "p_total_Pa": pressures[3],
+            "vent_eff": vent_eff,
+        }
+
+
+def batch_kpis(contexts: Sequence[simulation.SimulationContext], chunk_size: int = 1024) -> Dict[str, np.ndarray]:
+    """
+    `BATCH_KPI_FIELDS` for every context, as arrays in context order.
+
+    Numeric fields are float arrays (NaN where `finalize_result` gives
+    None); `pressure_status` / `quality_status` are object arrays of str.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    if not contexts:
+        return {name: np.empty(0, dtype=object if name in _STATUS_FIELDS else float) for name in BATCH_KPI_FIELDS}
+    time = shared_time_grid(contexts)
+    chunks = []
+    for start in range(0, len(contexts), chunk_size):
+        chunk = contexts[start : start + chunk_size]
+        if all(is_vectorized(ctx.config) for ctx in chunk):
+            chunks.append(_chunk_kpis(chunk, time))
+        else:
+            chunks.append(_scalar_kpis(chunk))
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in BATCH_KPI_FIELDS}
+
+
+def _column(contexts: Sequence[simulation.SimulationContext], getter) -> np.ndarray:
+    return np.array([getter(ctx) for ctx in contexts], dtype=float)
+
+
+def _chunk_kpis(contexts: Sequence[simulation.SimulationContext], time: List[float]) -> Dict[str, np.ndarray]:
+    n_runs = len(contexts)
+    time_arr = np.asarray(time)
+    density_ref = np.maximum(_column(contexts, lambda c: c.config.hardness_density_ref), 1.0)
+    hardness_base = _column(contexts, lambda c: c.config.hardness_base_shore)
+    alpha_gain = _column(contexts, lambda c: c.config.hardness_alpha_gain)
+    density_gain = _column(contexts, lambda c: c.config.hardness_density_gain)
+    alpha_min = _column(contexts, lambda c: c.quality.alpha_demold_min)
+    rho_min = _column(contexts, lambda c: c.quality.rho_moulded_min)
+    rho_max = _column(contexts, lambda c: c.quality.rho_moulded_max)
+    core_temp_max = _column(contexts, lambda c: c.quality.core_temp_max_C)
+    hardness_min = _column(contexts, lambda c: c.quality.H_demold_min_shore)
+
+    hardness = np.empty((len(time), n_runs))
+    first = np.full(n_runs, -1)
+    last = np.full(n_runs, -1)
+    closure = np.full(n_runs, -1)
+    T_max = np.full(n_runs, -np.inf)
+    T_max_idx = np.zeros(n_runs, dtype=int)
+    p_max = np.full(n_runs, -np.inf)
+    p_max_idx = np.zeros(n_runs, dtype=int)
+    rho = np.zeros(n_runs)
+    for idx, state in iter_batch_states(contexts, time):
+        alpha, rho, T_core, p_total = state["alpha"], state["rho_kg_per_m3"], state["T_core_K"], state["p_total_Pa"]
+        density_term = np.maximum(rho - density_ref, 0.0) / density_ref
+        hardness[idx] = hardness_base + alpha_gain * alpha + density_gain * density_term
+        demoldable = (
+            (alpha >= alpha_min)
+            & (rho_min <= rho)
+            & (rho <= rho_max)
+            & ((T_core - 273.15) <= core_temp_max)
+            & (hardness[idx] >= hardness_min)
+        )
+        first = np.where((first < 0) & demoldable, idx, first)
+        last = np.where(demoldable, idx, last)
+        if idx > 0:
+            closure = np.where((closure < 0) & (state["vent_eff"] <= 0.1), idx, closure)
+        higher = T_core > T_max
+        T_max = np.where(higher, T_core, T_max)
+        T_max_idx = np.where(higher, idx, T_max_idx)
+        higher = p_total > p_max
+        p_max = np.where(higher, p_total, p_max)
+        p_max_idx = np.where(higher, idx, p_max_idx)
+
+    has_window = first >= 0
+    t_min = np.where(has_window, time_arr[first], np.nan)
+    t_max = np.where(has_window, time_arr[last], np.nan)
+    t_opt = t_min + 0.3 * (t_max - t_min)
+
+    # H at demold time, as `interp_series` (clamped linear interpolation on the shared grid).
+    demold_time = np.where(has_window, t_opt, time_arr[-1])
+    upper = np.clip(np.searchsorted(time_arr, demold_time, side="left"), 1, len(time) - 1)
+    lower = upper - 1
+    columns = np.arange(n_runs)
+    span = time_arr[upper] - time_arr[lower]
+    fraction = (demold_time - time_arr[lower]) / np.where(span == 0.0, 1e-9, span)
+    h_lower, h_upper = hardness[lower, columns], hardness[upper, columns]
+    H_demold = np.where(
+        demold_time <= time_arr[0],
+        hardness[0],
+        np.where(demold_time >= time_arr[-1], hardness[-1], h_lower + fraction * (h_upper - h_lower)),
+    )
+    H_24h = (
+        hardness_base
+        + alpha_gain
+        + density_gain * (np.maximum(rho - density_ref, 0.0) / density_ref)
+        + _column(contexts, lambda c: c.config.hardness_24h_bonus)
+    )
+    closure_time = np.where(closure >= 0, time_arr[closure], np.nan)
+
+    p_status = np.empty(n_runs, dtype=object)
+    q_status = np.empty(n_runs, dtype=object)
+    risk = np.empty(n_runs)
+    for j, ctx in enumerate(contexts):
+        p_status[j] = pressure_status(float(p_max[j]), ctx.quality.p_max_allowable_bar)
+        q_status[j], risk[j], _ = simulation.evaluate_quality(
+            ctx.process,
+            ctx.quality,
+            float(t_min[j]) if has_window[j] else None,
+            float(H_demold[j]),
+            float(H_24h[j]),
+            p_status[j],
+            ctx.water_balance.water_risk_score,
+            ctx.mixing_factor,
+            float(closure_time[j]) if closure[j] >= 0 else None,
+            float(p_max[j]),
+        )
+
+    return {
+        "T_core_max_K": T_max,
+        "T_core_t_at_max_s": time_arr[T_max_idx],
+        "p_max_Pa": p_max,
+        "p_t_at_max_s": time_arr[p_max_idx],
+        "rho_moulded": rho.copy(),
+        "t_demold_min_s": t_min,
+        "t_demold_max_s": t_max,
+        "t_demold_opt_s": t_opt,
+        "vent_closure_time_s": closure_time,
+        "H_demold_shore": H_demold,
+        "H_24h_shore": H_24h,
+        "defect_risk": risk,
+        "pressure_status": p_status,
+        "quality_status": q_status,
+    }
+
+
+def _scalar_kpis(contexts: Sequence[simulation.SimulationContext]) -> Dict[str, np.ndarray]:
+    """Fallback for configs without a vectorized kernel: one full run per context."""
+
+    rows = []
+    output = {"record": _FALLBACK_CHANNELS, "output_every": 1, "output_points": None}
+    for ctx in contexts:
+        ctx = replace(ctx, config=ctx.config.model_copy(update=output))
+        if ctx.config.dimension == "1d_experimental":
+            trajectory = simulation_1d.run_1d_simulation(ctx)
+        else:
+            trajectory = ode_backends.integrate_system(ctx, backend=ode_backends.get_backend_name(ctx.config))
+        result = simulation.assemble_result(ctx, trajectory)
+        T_idx = int(np.argmax(result.T_core_K))
+        p_idx = int(np.argmax(result.p_total_Pa))
+        row = {
+            "T_core_max_K": result.T_core_K[T_idx],
+            "T_core_t_at_max_s": result.time_s[T_idx],
+            "p_t_at_max_s": result.time_s[p_idx],
+        }
+        for name in BATCH_KPI_FIELDS:
+            if name not in row:
+                value = getattr(result, name)
+                row[name] = np.nan if value is None else value
+        rows.append(row)
+    return {
+        name: np.array([row[name] for row in rows], dtype=object if name in _STATUS_FIELDS else float)
+        for name in BATCH_KPI_FIELDS
+    }
@@ -0,0 +1,202 @@
+"""
+Multi-shot mold thermal cycling.
+
+`MoldCycleSimulator` chains consecutive shots on one mold: each shot starts
+from the mold temperature left by the previous one, runs until its demold
+time, and is followed by an open-mold phase in which the empty mold cools
+towards ambient (closed-form exponential, no integration). The simulation
+context (`prepare_context`: water balance, kinetics calibration, gas moles)
+is computed once and reused; only the initial mold temperature changes
+between shots.
+
+The shot-to-shot map converges to a thermal steady state. Once the start
+temperature of consecutive shots differs by less than `steady_tol_K`, the
+remaining shots are copies of the last simulated one, so a full shift of
+hundreds of shots costs only the handful of shots needed to settle.
+
+Both the 0D and the 1D experimental model carry a single lumped mold node;
+the foam (and its 1D layers) is freshly poured every shot, so `T_mold_K`
+is the only state carried between shots.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from ..material_db.models import MaterialSystem
+from . import ode_backends, simulation, simulation_1d
+from .hardness import sample_profile
+from .types import MoldProperties, ProcessConditions, QualityTargets, SimulationConfig, VentProperties
+from .utils import celsius_to_kelvin
+
+
+class CycleConfig(BaseModel):
+    """Production cycle definition for `MoldCycleSimulator`."""
+
+    shots: Optional[int] = Field(None, ge=1, description="Number of shots to chain")
+    shift_duration_s: Optional[float] = Field(None, gt=0, description="Chain shots until this much time has elapsed")
+    open_time_s: float = Field(60.0, ge=0, description="Mold open time between demold and the next pour")
+    demold: Literal["opt", "min", "max"] = Field("opt", description="Which demold window point ends a shot")
+    demold_time_s: Optional[float] = Field(None, gt=0, description="Fixed demold time (overrides `demold`)")
+    open_h_W_per_m2K: Optional[float] = Field(
+        None, ge=0, description="Mold-to-ambient coefficient while open (default: mold.h_mold_to_ambient_W_per_m2K)"
+    )
+    steady_tol_K: float = Field(0.01, ge=0, description="Start-temperature change treated as steady state (0: off)")
+
+    @model_validator(mode="after")
+    def _validate_length(self) -> "CycleConfig":
+        if self.shots is None and self.shift_duration_s is None:
+            raise ValueError("Either shots or shift_duration_s must be set.")
+        return self
+
+
+@dataclass
+class CycleShot:
+    """KPIs of one shot in the chain."""
+
+    index: int
+    start_time_s: float
+    T_mold_start_K: float
+    T_mold_demold_K: float
+    T_mold_end_K: float
+    t_demold_s: float
+    cycle_time_s: float
+    p_max_Pa: float
+    rho_moulded: float
+    H_demold_shore: float
+    quality_status: str
+    defect_risk: float
+    simulated: bool = True
+
+
+@dataclass
+class CycleResult:
+    """Per-shot records plus steady-state cycle KPIs."""
+
+    shots: List[CycleShot]
+    steady_state_shot: Optional[int]
+    simulated_shots: int
+    elapsed_s: float
+    steady_kpis: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def steady(self) -> bool:
+        return self.steady_state_shot is not None
+
+
+class MoldCycleSimulator:
+    """Chains shots on one mold, carrying the mold temperature between them."""
+
+    def __init__(self, config: Optional[SimulationConfig] = None) -> None:
+        # Only the mold temperature series is needed per shot; KPIs stay full resolution.
+        self.config = (config or SimulationConfig()).model_copy(
+            update={"record": ["time_s", "T_mold_K"], "output_every": 1, "output_points": None}
+        )
+
+    def run(
+        self,
+        material: MaterialSystem,
+        process: ProcessConditions,
+        mold: MoldProperties,
+        quality: Optional[QualityTargets] = None,
+        cycle: Optional[CycleConfig] = None,
+    ) -> CycleResult:
+        cycle = cycle or CycleConfig(shots=10)
+        ctx = simulation.prepare_context(
+            material, process, mold, quality or QualityTargets(), self.config, mold.vent or VentProperties()
+        )
+        h_open = mold.h_mold_to_ambient_W_per_m2K if cycle.open_h_W_per_m2K is None else cycle.open_h_W_per_m2K
+        open_decay = math.exp(
+            -cycle.open_time_s * h_open * mold.mold_surface_area_m2 / max(mold.mold_mass_kg * mold.cp_mold_J_per_kgK, 1e-6)
+        )
+
+        shots: List[CycleShot] = []
+        steady_idx: Optional[int] = None
+        elapsed = 0.0
+        T_mold = celsius_to_kelvin(process.T_mold_init_C)
+        while self._continue(cycle, len(shots), elapsed):
+            if steady_idx is None:
+                shot = self._simulate_shot(ctx, cycle, len(shots), elapsed, T_mold, open_decay)
+                if (
+                    cycle.steady_tol_K > 0
+                    and shots
+                    and abs(shot.T_mold_start_K - shots[-1].T_mold_start_K) <= cycle.steady_tol_K
+                ):
+                    steady_idx = shot.index
+            else:
+                shot = replace(shots[-1], index=len(shots), start_time_s=elapsed, simulated=False)
+            shots.append(shot)
+            elapsed += shot.cycle_time_s
+            T_mold = shot.T_mold_end_K
+
+        return CycleResult(
+            shots=shots,
+            steady_state_shot=steady_idx,
+            simulated_shots=sum(shot.simulated for shot in shots),
+            elapsed_s=elapsed,
+            steady_kpis=self._steady_kpis(shots[-1]),
+        )
+
+    @staticmethod
+    def _continue(cycle: CycleConfig, count: int, elapsed: float) -> bool:
+        if cycle.shots is not None and count >= cycle.shots:
+            return False
+        if cycle.shift_duration_s is not None and elapsed >= cycle.shift_duration_s:
+            return False
+        return True
+
+    def _simulate_shot(
+        self,
+        ctx: simulation.SimulationContext,
+        cycle: CycleConfig,
+        index: int,
+        start_time_s: float,
+        T_mold_start_K: float,
+        open_decay: float,
+    ) -> CycleShot:
+        shot_ctx = replace(ctx, process=ctx.process.model_copy(update={"T_mold_init_C": T_mold_start_K - 273.15}))
+        if self.config.dimension == "1d_experimental":
+            trajectory = simulation_1d.run_1d_simulation(shot_ctx)
+        else:
+            trajectory = ode_backends.integrate_system(shot_ctx, backend=ode_backends.get_backend_name(self.config))
+        result = simulation.assemble_result(shot_ctx, trajectory)
+
+        window = {"min": result.t_demold_min_s, "opt": result.t_demold_opt_s, "max": result.t_demold_max_s}
+        t_demold = cycle.demold_time_s or window[cycle.demold]
+        if t_demold is None:  # no feasible window: the part stays in the mold for the whole horizon
+            t_demold = result.time_s[-1]
+        T_mold_demold = sample_profile(result.time_s, result.T_mold_K, t_demold)
+        T_ambient = ctx.T_ambient_K
+        return CycleShot(
+            index=index,
+            start_time_s=start_time_s,
+            T_mold_start_K=T_mold_start_K,
+            T_mold_demold_K=T_mold_demold,
+            T_mold_end_K=T_ambient + (T_mold_demold - T_ambient) * open_decay,
+            t_demold_s=t_demold,
+            cycle_time_s=t_demold + cycle.open_time_s,
+            p_max_Pa=result.p_max_Pa,
+            rho_moulded=result.rho_moulded,
+            H_demold_shore=result.H_demold_shore,
+            quality_status=result.quality_status,
+            defect_risk=result.defect_risk,
+        )
+
+    @staticmethod
+    def _steady_kpis(shot: CycleShot) -> Dict[str, Any]:
+        return {
+            "T_mold_start_C": shot.T_mold_start_K - 273.15,
+            "T_mold_demold_C": shot.T_mold_demold_K - 273.15,
+            "t_demold_s": shot.t_demold_s,
+            "cycle_time_s": shot.cycle_time_s,
+            "shots_per_hour": 3600.0 / shot.cycle_time_s,
+            "p_max_bar": shot.p_max_Pa / 100_000.0,
+            "rho_moulded": shot.rho_moulded,
+            "H_demold_shore": shot.H_demold_shore,
+            "quality_status": shot.quality_status,
+            "defect_risk": shot.defect_risk,
+        }
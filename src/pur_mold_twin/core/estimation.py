@@ -0,0 +1,335 @@
+"""
+Online state estimation: assimilate live shot sensors into the 0D model.
+
+`ShotStateEstimator` keeps an ensemble of 0D model states (phi, T_core,
+T_mold, gas moles, plus a kinetic rate multiplier and the predicted
+p_total/rho) and advances every member with the same step functions as the
+`manual` backend (`step_kinetics`, `step_heat_transfer`, `step_gas_state`).
+Each incoming sample (`T_core_C`, `p_total_bar` - the channels of
+`data.etl.load_log_bundle`) corrects the ensemble with a stochastic Ensemble
+Kalman Filter update. The cost per sample depends only on the ensemble size
+and the time since the previous sample, not on the shot history.
+
+The predicted demold window comes from a forecast of the mean state to the
+end of the horizon, using the same per-step criterion as
+`hardness.demold_window`. The forecast stops once the part is cured, cooling
+and demoldable (the state then only drifts with slow venting). A full
+forecast can take over a thousand model steps, so it is time-sliced: each
+update advances the running forecast by at most
+`EstimatorSettings.forecast_steps_per_update` steps and publishes the window
+when the forecast completes, then the next one starts from the latest
+filtered mean. Per-update cost stays bounded on any horizon; the published
+window lags the filter by a few updates. The first forecast runs in full at
+construction, before the shot's first sample.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Iterator, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field
+
+from ..material_db.models import MaterialSystem
+from .gases import compute_pressures, headspace_volume
+from .hardness import hardness_value, is_demoldable
+from .kinetics import alpha_from_phi
+from .simulation import (
+    GasState,
+    SimulationContext,
+    prepare_context,
+    step_gas_state,
+    step_heat_transfer,
+    step_kinetics,
+)
+from .thermal import initial_core_temperature, initial_density
+from .types import MoldProperties, ProcessConditions, QualityTargets, SimulationConfig, VentProperties
+from .utils import celsius_to_kelvin
+
+
+# Ensemble state columns.
+PHI, T_CORE, T_MOLD, N_CO2, N_PENT_LIQ, N_PENT_GAS, RATE, P_TOTAL, RHO = range(9)
+_STATE_SIZE = 9
+_NON_NEGATIVE = [PHI, N_CO2, N_PENT_LIQ, N_PENT_GAS]
+_OBSERVED = {"T_core_C": T_CORE, "p_total_bar": P_TOTAL}
+
+
+class EstimatorSettings(BaseModel):
+    """Filter tuning for `ShotStateEstimator`."""
+
+    ensemble_size: int = Field(32, ge=4)
+    random_seed: Optional[int] = 0
+    T_core_obs_std_K: float = Field(1.0, gt=0)
+    p_total_obs_std_bar: float = Field(0.05, gt=0)
+    initial_T_std_K: float = Field(2.0, ge=0)
+    rate_scale_std: float = Field(0.2, ge=0, description="Log-normal spread of the kinetic rate multiplier")
+    T_process_noise_K_per_sqrt_s: float = Field(0.05, ge=0)
+    rate_process_noise_per_sqrt_s: float = Field(0.002, ge=0)
+    inflation: float = Field(1.02, ge=1.0, description="Multiplicative inflation of ensemble anomalies")
+    settled_alpha: float = Field(0.999, gt=0, le=1, description="Forecast stops once cured, cooling and demoldable")
+    forecast_steps_per_update: int = Field(40, ge=1, description="Model steps of the demold forecast run per update")
+
+
+@dataclass
+class EstimatorUpdate:
+    """Filtered state after one sample, with the refreshed demold window forecast."""
+
+    time_s: float
+    alpha: float
+    T_core_K: float
+    T_core_std_K: float
+    T_mold_K: float
+    p_total_Pa: float
+    rho_kg_per_m3: float
+    rate_scale: float
+    t_demold_min_s: Optional[float]
+    t_demold_max_s: Optional[float]
+    t_demold_opt_s: Optional[float]
+
+
+class ShotStateEstimator:
+    """Ensemble Kalman filter over the MVP 0D model for one running shot."""
+
+    def __init__(
+        self,
+        material: MaterialSystem,
+        process: ProcessConditions,
+        mold: MoldProperties,
+        quality: Optional[QualityTargets] = None,
+        config: Optional[SimulationConfig] = None,
+        settings: Optional[EstimatorSettings] = None,
+    ) -> None:
+        self.settings = settings or EstimatorSettings()
+        self.ctx: SimulationContext = prepare_context(
+            material,
+            process,
+            mold,
+            quality or QualityTargets(),
+            config or SimulationConfig(),
+            vent_cfg=mold.vent or VentProperties(),
+        )
+        self._rng = np.random.default_rng(self.settings.random_seed)
+        self.time_s = 0.0
+        self.ensemble = self._initial_ensemble()
+        # Demold criterion already met by the filtered mean (first/last time seen).
+        self._seen_demold: Optional[tuple[float, float]] = None
+        # Running forecast (state, time, first, last) and the last completed one's (first, last).
+        self._forecast: Optional[list] = None
+        self._forecast_window_s: tuple[Optional[float], Optional[float]] = (None, None)
+        self._start_forecast(self.ensemble.mean(axis=0))
+        self._advance_forecast(math.inf)
+
+    def _initial_ensemble(self) -> np.ndarray:
+        ctx, settings = self.ctx, self.settings
+        n = settings.ensemble_size
+        T_core0 = initial_core_temperature(ctx.process)
+        headspace0 = headspace_volume(
+            ctx.config, ctx.cavity_volume, min(ctx.effective_liquid_volume, ctx.cavity_volume)
+        )
+        p_total0 = compute_pressures(
+            n_air=ctx.n_air_initial, n_co2=0.0, n_pentane=0.0, temperature_K=T_core0, headspace_volume=headspace0
+        )[3]
+        ensemble = np.zeros((n, _STATE_SIZE))
+        ensemble[:, T_CORE] = T_core0 + self._rng.normal(0.0, settings.initial_T_std_K, n)
+        ensemble[:, T_MOLD] = celsius_to_kelvin(ctx.process.T_mold_init_C) + self._rng.normal(
+            0.0, settings.initial_T_std_K, n
+        )
+        ensemble[:, N_PENT_LIQ] = ctx.n_pentane_total
+        ensemble[:, RATE] = np.exp(self._rng.normal(0.0, settings.rate_scale_std, n))
+        ensemble[:, P_TOTAL] = p_total0 if p_total0 > 0 else ctx.config.ambient_pressure_Pa
+        ensemble[:, RHO] = initial_density(
+            ctx.material,
+            ctx.process,
+            extra_mass=ctx.water_balance.water_from_rh_kg,
+            extra_volume=ctx.extra_water_volume,
+        )
+        return ensemble
+
+    def _step(self, state: List[float], dt: float) -> None:
+        """Advance one state row (plain floats) in place by `dt`; the rate multiplier scales the kinetic clock."""
+
+        ctx = self.ctx
+        rate = state[RATE]
+        alpha_prev = alpha_from_phi(state[PHI], ctx.exponent)
+        kinetics = step_kinetics(ctx, alpha_prev, state[PHI], state[T_CORE], dt * rate)
+        heat = step_heat_transfer(
+            ctx=ctx,
+            T_core_current=state[T_CORE],
+            T_mold_current=state[T_MOLD],
+            heat_release_W=ctx.config.reaction_enthalpy_J_per_kg * ctx.mass_total * kinetics.dalpha_dt * rate,
+            dt=dt,
+        )
+        gas = step_gas_state(
+            ctx=ctx,
+            vent_cfg=ctx.vent,
+            state=GasState(
+                n_air=ctx.n_air_initial,
+                n_co2=state[N_CO2],
+                n_pentane_liquid=state[N_PENT_LIQ],
+                n_pentane_gas=state[N_PENT_GAS],
+            ),
+            alpha_value=kinetics.alpha,
+            T_core_value=heat.T_core_K,
+            dt=dt,
+        )
+        state[PHI] = kinetics.phi
+        state[T_CORE] = heat.T_core_K
+        state[T_MOLD] = heat.T_mold_K
+        state[N_CO2] = gas.state.n_co2
+        state[N_PENT_LIQ] = gas.state.n_pentane_liquid
+        state[N_PENT_GAS] = gas.state.n_pentane_gas
+        state[P_TOTAL] = gas.p_total_Pa
+        state[RHO] = gas.density
+
+    def _propagate(self, time_s: float) -> None:
+        elapsed = time_s - self.time_s
+        if elapsed <= 1e-9:
+            return
+        max_dt = self.ctx.config.time_step_s
+        rows = self.ensemble.tolist()  # scalar stepping on Python floats is much faster than on NumPy scalars
+        for state in rows:
+            current = self.time_s
+            while time_s - current > 1e-9:
+                dt = min(max_dt, time_s - current)
+                self._step(state, dt)
+                current += dt
+        self.ensemble = np.asarray(rows)
+        self.time_s = time_s
+
+        # Process noise for the whole interval (random walks on T_core and the rate multiplier).
+        n = len(rows)
+        settings = self.settings
+        scale = math.sqrt(elapsed)
+        self.ensemble[:, T_CORE] += self._rng.normal(0.0, settings.T_process_noise_K_per_sqrt_s * scale, n)
+        self.ensemble[:, RATE] *= np.exp(self._rng.normal(0.0, settings.rate_process_noise_per_sqrt_s * scale, n))
+
+    def _assimilate(self, observations: dict[int, float], stds: dict[int, float]) -> None:
+        columns = list(observations)
+        ensemble = self.ensemble
+        n = len(ensemble)
+        mean = ensemble.mean(axis=0)
+        anomalies = (ensemble - mean) * self.settings.inflation
+        ensemble[:] = mean + anomalies
+
+        obs_anomalies = anomalies[:, columns]
+        obs_std = np.array([stds[column] for column in columns])
+        cov_yy = obs_anomalies.T @ obs_anomalies / (n - 1) + np.diag(obs_std**2)
+        cov_xy = anomalies.T @ obs_anomalies / (n - 1)
+        gain = np.linalg.solve(cov_yy, cov_xy.T).T
+        perturbed = np.array([observations[column] for column in columns]) + self._rng.normal(
+            0.0, 1.0, (n, len(columns))
+        ) * obs_std
+        ensemble += (perturbed - ensemble[:, columns]) @ gain.T
+
+        ensemble[:, _NON_NEGATIVE] = np.maximum(ensemble[:, _NON_NEGATIVE], 0.0)
+        ensemble[:, RATE] = np.clip(ensemble[:, RATE], 0.1, 10.0)
+
+    def update(
+        self, time_s: float, T_core_C: Optional[float] = None, p_total_bar: Optional[float] = None
+    ) -> EstimatorUpdate:
+        """Advance the ensemble to `time_s`, assimilate the available samples and refresh the forecast."""
+
+        if time_s < self.time_s - 1e-9:
+            raise ValueError(f"Samples must arrive in time order ({time_s} < {self.time_s}).")
+        self._propagate(time_s)
+
+        observations: dict[int, float] = {}
+        stds: dict[int, float] = {}
+        if T_core_C is not None and math.isfinite(T_core_C):
+            observations[T_CORE] = celsius_to_kelvin(T_core_C)
+            stds[T_CORE] = self.settings.T_core_obs_std_K
+        if p_total_bar is not None and math.isfinite(p_total_bar):
+            observations[P_TOTAL] = p_total_bar * 100_000.0
+            stds[P_TOTAL] = self.settings.p_total_obs_std_bar * 100_000.0
+        if observations:
+            self._assimilate(observations, stds)
+        return self._summary()
+
+    def update_row(self, row: Mapping) -> EstimatorUpdate:
+        """`update` from one row of `LogBundle.measured` (`time_s`, `T_core_C`, `p_total_bar`)."""
+
+        return self.update(
+            float(row["time_s"]),
+            **{name: float(row[name]) for name in _OBSERVED if name in row and not pd.isna(row[name])},
+        )
+
+    def replay(self, measured: pd.DataFrame) -> Iterator[EstimatorUpdate]:
+        """Feed a recorded sensor frame sample by sample (e.g. to test the filter offline)."""
+
+        for row in measured.sort_values("time_s").to_dict("records"):
+            yield self.update_row(row)
+
+    def _summary(self) -> EstimatorUpdate:
+        mean = self.ensemble.mean(axis=0)
+        alpha = alpha_from_phi(mean[PHI], self.ctx.exponent)
+        cfg, quality = self.ctx.config, self.ctx.quality
+        if is_demoldable(alpha, mean[RHO], mean[T_CORE], hardness_value(alpha, mean[RHO], cfg), quality):
+            first = self._seen_demold[0] if self._seen_demold else self.time_s
+            self._seen_demold = (first, self.time_s)
+        if self._forecast is None:
+            self._start_forecast(mean)
+        self._advance_forecast(self.settings.forecast_steps_per_update)
+        t_min, t_max, t_opt = self._demold_window()
+        return EstimatorUpdate(
+            time_s=self.time_s,
+            alpha=alpha,
+            T_core_K=float(mean[T_CORE]),
+            T_core_std_K=float(self.ensemble[:, T_CORE].std(ddof=1)),
+            T_mold_K=float(mean[T_MOLD]),
+            p_total_Pa=float(mean[P_TOTAL]),
+            rho_kg_per_m3=float(mean[RHO]),
+            rate_scale=float(mean[RATE]),
+            t_demold_min_s=t_min,
+            t_demold_max_s=t_max,
+            t_demold_opt_s=t_opt,
+        )
+
+    def _start_forecast(self, mean: np.ndarray) -> None:
+        self._forecast = [mean.tolist(), self.time_s, None, None]
+
+    def _advance_forecast(self, max_steps: float) -> None:
+        """Run up to `max_steps` steps of the current forecast; publish its window when it completes."""
+
+        cfg, quality = self.ctx.config, self.ctx.quality
+        state, time, first, last = self._forecast
+        steps = 0
+        done = False
+        while steps < max_steps:
+            if cfg.total_time_s - time <= 1e-9:
+                done = True
+                break
+            T_core_prev = state[T_CORE]
+            dt = min(cfg.time_step_s, cfg.total_time_s - time)
+            self._step(state, dt)
+            time += dt
+            steps += 1
+            alpha = alpha_from_phi(state[PHI], self.ctx.exponent)
+            demoldable = is_demoldable(alpha, state[RHO], state[T_CORE], hardness_value(alpha, state[RHO], cfg), quality)
+            if demoldable:
+                first = time if first is None else first
+                last = time
+            if demoldable and alpha >= self.settings.settled_alpha and state[T_CORE] < T_core_prev:
+                # Cured, cooling and demoldable: from here the state only drifts with slow venting.
+                last = cfg.total_time_s
+                done = True
+                break
+        if done:
+            self._forecast = None
+            self._forecast_window_s = (first, last)
+        else:
+            self._forecast = [state, time, first, last]
+
+    def _demold_window(self) -> tuple[Optional[float], Optional[float], Optional[float]]:
+        """Demold window from the criterion history plus the last completed forecast."""
+
+        seen_first, seen_last = self._seen_demold or (None, None)
+        forecast_first, forecast_last = self._forecast_window_s
+        first = seen_first if seen_first is not None else forecast_first
+        lasts = [value for value in (seen_last, forecast_last) if value is not None]
+        if first is None or not lasts:
+            return None, None, None
+        last = max(lasts)
+        return first, last, first + 0.3 * (last - first)
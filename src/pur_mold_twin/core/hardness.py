@@ -5,7 +5,18 @@ from typing import List, Optional, Sequence
 from .utils import clamp, interp_series
 
 
+def hardness_value(alpha_value: float, rho_value: float, config) -> float:
+    density_ref = max(config.hardness_density_ref, 1.0)
+    density_term = max(rho_value - density_ref, 0.0) / density_ref
+    return (
+        config.hardness_base_shore
+        + config.hardness_alpha_gain * alpha_value
+        + config.hardness_density_gain * density_term
+    )
+
+
 def compute_hardness_profile(alpha: Sequence[float], rho: Sequence[float], config) -> List[float]:
+    # Inlined `hardness_value` (this runs once per time step of every simulation).
     density_ref = max(config.hardness_density_ref, 1.0)
     values: List[float] = []
     for alpha_value, rho_value in zip(alpha, rho):
@@ -29,6 +40,17 @@ def predict_h24(rho_moulded: float, config) -> float:
     )
 
 
+def is_demoldable(alpha_value: float, rho_value: float, T_core_K: float, hardness: float, quality) -> bool:
+    """Single-step demold criterion used by `demold_window`."""
+
+    return (
+        alpha_value >= quality.alpha_demold_min
+        and quality.rho_moulded_min <= rho_value <= quality.rho_moulded_max
+        and (T_core_K - 273.15) <= quality.core_temp_max_C
+        and hardness >= quality.H_demold_min_shore
+    )
+
+
 def demold_window(
     time: Sequence[float],
     alpha: Sequence[float],
@@ -37,15 +59,11 @@ def demold_window(
     hardness_profile: Sequence[float],
     quality,
 ) -> tuple[Optional[float], Optional[float], Optional[float]]:
-    indices = []
-    for idx in range(len(time)):
-        if (
-            alpha[idx] >= quality.alpha_demold_min
-            and quality.rho_moulded_min <= rho[idx] <= quality.rho_moulded_max
-            and (T_core[idx] - 273.15) <= quality.core_temp_max_C
-            and hardness_profile[idx] >= quality.H_demold_min_shore
-        ):
-            indices.append(idx)
+    indices = [
+        idx
+        for idx in range(len(time))
+        if is_demoldable(alpha[idx], rho[idx], T_core[idx], hardness_profile[idx], quality)
+    ]
     if not indices:
         return None, None, None
 
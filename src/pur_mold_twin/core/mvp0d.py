@@ -7,7 +7,7 @@ Re-exports Pydantic modele z ``core.types`` i deleguje obliczenia do modułu
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
 from ..material_db.models import MaterialSystem
 from . import ode_backends, simulation, simulation_1d
@@ -48,17 +48,63 @@ class MVP0DSimulator:
         process: ProcessConditions,
         mold: MoldProperties,
         quality: Optional[QualityTargets] = None,
+        config: Optional[SimulationConfig] = None,
     ) -> SimulationResult:
-        if process.total_mass <= 0:
-            raise ValueError("Total shot mass must be > 0 kg.")
-        if mold.cavity_volume_m3 <= 0:
-            raise ValueError("Mold cavity volume must be > 0 m^3.")
+        """Run one simulation; `config` overrides `self.config` for this run only."""
 
+        self._check_inputs(process, mold)
         quality = quality or QualityTargets()
-        backend = ode_backends.get_backend_name(self.config)
+        config = config or self.config
+        backend = ode_backends.get_backend_name(config)
         vent_cfg = mold.vent or VentProperties()
-        if self.config.dimension == "1d_experimental":
-            ctx = simulation.prepare_context(material, process, mold, quality, self.config, vent_cfg)
+        if config.dimension == "1d_experimental":
+            ctx = simulation.prepare_context(material, process, mold, quality, config, vent_cfg)
             trajectory = simulation_1d.run_1d_simulation(ctx)
             return simulation.assemble_result(ctx, trajectory)
-        return simulation.simulate(material, process, mold, quality, self.config, backend, vent_cfg)
+        return simulation.simulate(material, process, mold, quality, config, backend, vent_cfg)
+
+    def iter_steps(
+        self,
+        material: MaterialSystem,
+        process: ProcessConditions,
+        mold: MoldProperties,
+        quality: Optional[QualityTargets] = None,
+        every: int = 1,
+    ) -> Iterator[simulation.StepRecord]:
+        """
+        Stream the simulation as `StepRecord`s while it advances (0D, `manual` scheme).
+
+        Memory use is constant; breaking out of the loop stops the integration.
+        """
+
+        self._check_inputs(process, mold)
+        if self.config.dimension != "0d":
+            raise ValueError("iter_steps supports only the 0d model.")
+        ctx = simulation.prepare_context(
+            material, process, mold, quality or QualityTargets(), self.config, mold.vent or VentProperties()
+        )
+        return simulation.iter_simulation_steps(ctx, every=every)
+
+    def run_streaming(
+        self,
+        material: MaterialSystem,
+        process: ProcessConditions,
+        mold: MoldProperties,
+        callback: Callable[[simulation.StepRecord], Optional[bool]],
+        quality: Optional[QualityTargets] = None,
+        every: int = 1,
+    ) -> Optional[simulation.StepRecord]:
+        """Call `callback(record)` per streamed step; a truthy return aborts the run. Returns the last record."""
+
+        last = None
+        for last in self.iter_steps(material, process, mold, quality, every=every):
+            if callback(last):
+                break
+        return last
+
+    @staticmethod
+    def _check_inputs(process: ProcessConditions, mold: MoldProperties) -> None:
+        if process.total_mass <= 0:
+            raise ValueError("Total shot mass must be > 0 kg.")
+        if mold.cavity_volume_m3 <= 0:
+            raise ValueError("Mold cavity volume must be > 0 m^3.")
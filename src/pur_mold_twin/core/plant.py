@@ -0,0 +1,163 @@
+"""
+Plant-level simulation of many molds in one vectorized pass.
+
+`PlantSimulator` takes a list of `PlantUnit`s (mold + process, optionally
+their own material system and quality targets), groups them by material
+system and advances each group with the vectorized kernel of `core.batch`
+(one NumPy state array of shape `(n_molds,)` per variable), so the per-step
+Python overhead is paid once per group instead of once per mold. Per-mold
+KPIs then go through `simulation.finalize_result`, exactly as in
+`MVP0DSimulator.run`.
+
+Non-`manual` backends and the 1D experimental model have no vectorized
+kernel; those configs fall back to one `MVP0DSimulator.run` per mold.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from statistics import mean
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..material_db.models import MaterialSystem
+from . import batch, simulation
+from .mvp0d import MVP0DSimulator
+from .types import MoldProperties, ProcessConditions, QualityTargets, SimulationConfig, SimulationResult, VentProperties
+
+
+@dataclass
+class PlantUnit:
+    """One mold in the plant."""
+
+    name: str
+    mold: MoldProperties
+    process: ProcessConditions
+    material: Optional[MaterialSystem] = None
+    quality: Optional[QualityTargets] = None
+
+
+@dataclass
+class PlantResult:
+    """Per-mold simulation results (by unit name) and plant-wide statistics."""
+
+    results: Dict[str, SimulationResult]
+    summary: Dict[str, Any] = field(default_factory=dict)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """One KPI row per mold (for tables / DataFrames)."""
+
+        return [
+            {
+                "name": name,
+                "quality_status": result.quality_status,
+                "pressure_status": result.pressure_status,
+                "t_demold_opt_s": result.t_demold_opt_s,
+                "p_max_bar": result.p_max_Pa / 100_000.0,
+                "rho_moulded": result.rho_moulded,
+                "H_demold_shore": result.H_demold_shore,
+                "defect_risk": result.defect_risk,
+            }
+            for name, result in self.results.items()
+        ]
+
+
+def _integrate_group(contexts: List[simulation.SimulationContext]) -> List[SimulationResult]:
+    time = batch.shared_time_grid(contexts)
+    out = {name: np.empty((len(time), len(contexts))) for name in batch.STATE_SERIES}
+    for idx, state in batch.iter_batch_states(contexts, time):
+        for name, values in state.items():
+            out[name][idx] = values
+    p_max = out["p_total_Pa"].max(axis=0)
+    closed = out["vent_eff"][1:] <= 0.1
+
+    results = []
+    for j, ctx in enumerate(contexts):
+        series: Dict[str, List[float]] = {name: values[:, j].tolist() for name, values in out.items()}
+        series["time_s"] = time
+        closure = float(time[1 + int(np.argmax(closed[:, j]))]) if closed[:, j].any() else None
+        results.append(simulation.finalize_result(ctx, series, float(p_max[j]), closure))
+    return results
+
+
+class PlantSimulator:
+    """Simulates all molds of a plant, vectorized per material system."""
+
+    def __init__(self, config: Optional[SimulationConfig] = None) -> None:
+        self.config = config or SimulationConfig()
+
+    def run(
+        self,
+        units: List[PlantUnit],
+        material: Optional[MaterialSystem] = None,
+        quality: Optional[QualityTargets] = None,
+    ) -> PlantResult:
+        """Simulate every unit; `material`/`quality` are defaults for units that do not set their own."""
+
+        names = [unit.name for unit in units]
+        if len(set(names)) != len(names):
+            raise ValueError("Plant unit names must be unique.")
+        groups: Dict[str, List[PlantUnit]] = {}
+        for unit in units:
+            unit_material = unit.material or material
+            if unit_material is None:
+                raise ValueError(f"Unit '{unit.name}' has no material system and no plant default was given.")
+            if unit.process.total_mass <= 0:
+                raise ValueError(f"Unit '{unit.name}': total shot mass must be > 0 kg.")
+            if unit.mold.cavity_volume_m3 <= 0:
+                raise ValueError(f"Unit '{unit.name}': mold cavity volume must be > 0 m^3.")
+            groups.setdefault(unit_material.system_id, []).append(unit)
+
+        results: Dict[str, SimulationResult] = {}
+        vectorized = batch.is_vectorized(self.config)
+        for group in groups.values():
+            group_material = group[0].material or material
+            if not vectorized:
+                simulator = MVP0DSimulator(self.config)
+                for unit in group:
+                    results[unit.name] = simulator.run(
+                        unit.material or group_material, unit.process, unit.mold, unit.quality or quality
+                    )
+                continue
+            contexts = [
+                simulation.prepare_context(
+                    unit.material or group_material,
+                    unit.process,
+                    unit.mold,
+                    unit.quality or quality or QualityTargets(),
+                    self.config,
+                    unit.mold.vent or VentProperties(),
+                )
+                for unit in group
+            ]
+            for unit, result in zip(group, _integrate_group(contexts)):
+                results[unit.name] = result
+
+        ordered = {name: results[name] for name in names}
+        return PlantResult(results=ordered, summary=_summarize(ordered, len(groups)))
+
+
+def _summarize(results: Dict[str, SimulationResult], group_count: int) -> Dict[str, Any]:
+    values = list(results.values())
+    if not values:
+        return {"molds": 0, "material_groups": 0}
+    p_max_bar = [result.p_max_Pa / 100_000.0 for result in values]
+    risks = [result.defect_risk for result in values]
+    demold = [result.t_demold_opt_s for result in values if result.t_demold_opt_s is not None]
+    return {
+        "molds": len(values),
+        "material_groups": group_count,
+        "quality_status": dict(Counter(result.quality_status for result in values)),
+        "pressure_status": dict(Counter(result.pressure_status for result in values)),
+        "p_max_bar_max": max(p_max_bar),
+        "p_max_bar_mean": mean(p_max_bar),
+        "defect_risk_mean": mean(risks),
+        "defect_risk_max": max(risks),
+        "rho_moulded_mean": mean(result.rho_moulded for result in values),
+        "t_demold_opt_s_mean": mean(demold) if demold else None,
+        "t_demold_opt_s_max": max(demold) if demold else None,
+        "molds_without_demold_window": [name for name, result in results.items() if result.t_demold_opt_s is None],
+        "molds_failing": [name for name, result in results.items() if result.quality_status == "FAIL"],
+    }
@@ -0,0 +1,129 @@
+"""
+Fast, selective serialization of `SimulationResult`.
+
+Most of the cost of emitting a result is not `model_dump()` but turning
+~13 x N floats into JSON text, and `json.dumps(indent=...)` switches to the
+pure-Python encoder. `result_to_dict` reads fields directly (no validation or
+recursive copy), can keep only selected fields or just the KPI scalars, round
+floats to a number of significant digits and emit series as base64 float64
+bytes instead of decimal lists. `dumps_json` pretty-prints dicts but encodes
+every list with the C encoder, so indented output costs about as much as
+compact output.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import math
+from typing import Any, Dict, Iterable, Literal, Optional, Tuple
+
+import numpy as np
+
+from .types import SERIES_CHANNELS, SimulationResult
+
+
+SeriesFormat = Literal["list", "base64"]
+
+SERIES_FIELDS: Tuple[str, ...] = SERIES_CHANNELS
+KPI_FIELDS: Tuple[str, ...] = tuple(
+    name for name in SimulationResult.model_fields if name not in SERIES_FIELDS
+)
+
+
+def _round_significant(values: np.ndarray, digits: int) -> np.ndarray:
+    finite = np.isfinite(values) & (values != 0)
+    magnitude = np.zeros_like(values)
+    magnitude[finite] = np.floor(np.log10(np.abs(values[finite])))
+    scale = np.power(10.0, digits - 1 - magnitude)
+    return np.where(finite, np.round(values * scale) / scale, values)
+
+
+def _round_scalar(value: Any, digits: Optional[int]) -> Any:
+    if digits is None or not isinstance(value, float) or value == 0 or not math.isfinite(value):
+        return value
+    return round(value, digits - 1 - int(math.floor(math.log10(abs(value)))))
+
+
+def encode_series(values: Iterable[float], digits: Optional[int] = None, series_format: SeriesFormat = "list") -> Any:
+    """One series as a JSON-ready list, or `{"dtype", "data"}` with base64 little-endian float64 bytes."""
+
+    if digits is None and series_format == "list":
+        return list(values)
+    array = np.asarray(values, dtype=np.float64)
+    if digits is not None:
+        array = _round_significant(array, digits)
+    if series_format == "base64":
+        return {"dtype": "<f8", "data": base64.b64encode(array.astype("<f8").tobytes()).decode("ascii")}
+    return array.tolist()
+
+
+def decode_series(encoded: Any) -> np.ndarray:
+    """Inverse of `encode_series` for either format."""
+
+    if isinstance(encoded, dict):
+        return np.frombuffer(base64.b64decode(encoded["data"]), dtype=encoded.get("dtype", "<f8"))
+    return np.asarray(encoded, dtype=np.float64)
+
+
+def result_to_dict(
+    result: SimulationResult,
+    fields: Optional[Iterable[str]] = None,
+    kpi_only: bool = False,
+    precision: Optional[int] = None,
+    series_format: SeriesFormat = "list",
+) -> Dict[str, Any]:
+    """
+    Selective `SimulationResult.to_dict()` replacement.
+
+    - `fields`: keep only these fields (unknown names raise ValueError),
+    - `kpi_only`: drop all time series (a few hundred bytes of JSON),
+    - `precision`: round floats to this many significant digits,
+    - `series_format`: `"list"` or `"base64"` (see `encode_series`).
+
+    With the defaults the output equals `result.to_dict()`; series lists are
+    shallow copies.
+    """
+
+    if series_format not in ("list", "base64"):
+        raise ValueError(f"Unknown series_format '{series_format}'")
+    if precision is not None and precision < 1:
+        raise ValueError("precision must be >= 1 significant digit")
+    names: Iterable[str] = SimulationResult.model_fields
+    if fields is not None:
+        names = list(dict.fromkeys(fields))
+        unknown = [name for name in names if name not in SimulationResult.model_fields]
+        if unknown:
+            raise ValueError(f"Unknown SimulationResult fields: {', '.join(unknown)}")
+    if kpi_only:
+        names = [name for name in names if name not in SERIES_FIELDS]
+
+    payload: Dict[str, Any] = {}
+    for name in names:
+        value = getattr(result, name)
+        if name in SERIES_FIELDS:
+            payload[name] = encode_series(value, precision, series_format)
+        elif isinstance(value, list):
+            payload[name] = list(value)
+        else:
+            payload[name] = _round_scalar(value, precision)
+    return payload
+
+
+def dumps_json(payload: Any, indent: Optional[int] = None, ensure_ascii: bool = False) -> str:
+    """`json.dumps` with the same `indent` layout for dicts, but lists written compactly on one line."""
+
+    if indent is None:
+        return json.dumps(payload, ensure_ascii=ensure_ascii)
+
+    def render(value: Any, level: int) -> str:
+        if not isinstance(value, dict) or not value:
+            return json.dumps(value, ensure_ascii=ensure_ascii)
+        pad = " " * (indent * (level + 1))
+        items = [
+            f"{pad}{json.dumps(str(key), ensure_ascii=ensure_ascii)}: {render(item, level + 1)}"
+            for key, item in value.items()
+        ]
+        return "{\n" + ",\n".join(items) + "\n" + " " * (indent * level) + "}"
+
+    return render(payload, 0)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional, TYPE_CHECKING
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
 
 from ..material_db.models import MaterialSystem
 
@@ -14,7 +14,14 @@ from .gases import (
     pressure_status,
     vent_effectiveness,
 )
-from .hardness import compute_hardness_profile, demold_window, predict_h24, sample_profile
+from .hardness import (
+    compute_hardness_profile,
+    demold_window,
+    hardness_value,
+    is_demoldable,
+    predict_h24,
+    sample_profile,
+)
 from .kinetics import alpha_derivative, alpha_from_phi, arrhenius_multiplier, calibrate_reaction_curve
 from .thermal import (
     compute_water_balance,
@@ -126,6 +133,24 @@ class GasStepResult:
     vent_closed: bool
 
 
+@dataclass
+class StepRecord:
+    """Compact state of one time step, as yielded by `iter_simulation_steps`."""
+
+    step: int
+    time_s: float
+    alpha: float
+    T_core_K: float
+    T_mold_K: float
+    rho_kg_per_m3: float
+    fill_ratio: float
+    p_total_Pa: float
+    vent_eff: float
+    hardness_shore: float
+    p_max_Pa: float
+    demoldable: bool
+
+
 def prepare_context(
     material: "MaterialSystem",
     process: "ProcessConditions",
@@ -343,6 +368,104 @@ def step_gas_state(
     )
 
 
+def iter_simulation_steps(ctx: SimulationContext, every: int = 1) -> Iterator[StepRecord]:
+    """
+    Advance kinetics, heat transfer and the gas balance together and yield one
+    `StepRecord` per step (every `every`-th step plus the last one).
+
+    Uses the explicit `manual` backend scheme, so records match
+    `integrate_manual` + `assemble_result` step for step. Only the current state
+    is held, so memory does not grow with the horizon, and leaving the loop
+    stops the integration.
+    """
+
+    if every < 1:
+        raise ValueError("every must be >= 1")
+    cfg = ctx.config
+    n_steps = cfg.steps()
+    delta = cfg.total_time_s / (n_steps - 1)
+
+    T_core = initial_core_temperature(ctx.process)
+    T_mold = celsius_to_kelvin(ctx.process.T_mold_init_C)
+    alpha = 0.0
+    phi = 0.0
+    rho = initial_density(
+        ctx.material,
+        ctx.process,
+        extra_mass=ctx.water_balance.water_from_rh_kg,
+        extra_volume=ctx.extra_water_volume,
+    )
+    fill_ratio = clamp(ctx.effective_liquid_volume / max(ctx.cavity_volume, 1e-12), 0.0, 1.5)
+    gas_state = GasState(
+        n_air=ctx.n_air_initial,
+        n_co2=0.0,
+        n_pentane_liquid=ctx.n_pentane_total,
+        n_pentane_gas=0.0,
+    )
+    headspace0 = headspace_volume(cfg, ctx.cavity_volume, min(ctx.effective_liquid_volume, ctx.cavity_volume))
+    p_total = compute_pressures(
+        n_air=ctx.n_air_initial,
+        n_co2=0.0,
+        n_pentane=0.0,
+        temperature_K=T_core,
+        headspace_volume=headspace0,
+    )[3]
+    if p_total <= 0:
+        p_total = cfg.ambient_pressure_Pa
+    vent_eff = 1.0
+    p_max = p_total
+
+    def record(step: int, time: float) -> StepRecord:
+        hardness = hardness_value(alpha, rho, cfg)
+        return StepRecord(
+            step=step,
+            time_s=time,
+            alpha=alpha,
+            T_core_K=T_core,
+            T_mold_K=T_mold,
+            rho_kg_per_m3=rho,
+            fill_ratio=fill_ratio,
+            p_total_Pa=p_total,
+            vent_eff=vent_eff,
+            hardness_shore=hardness,
+            p_max_Pa=p_max,
+            demoldable=is_demoldable(alpha, rho, T_core, hardness, ctx.quality),
+        )
+
+    yield record(0, 0.0)
+    time_prev = 0.0
+    for idx in range(1, n_steps):
+        time = idx * delta
+        dt = time - time_prev
+        time_prev = time
+        kinetics = step_kinetics(ctx, alpha, phi, T_core, dt)
+        heat = step_heat_transfer(
+            ctx=ctx,
+            T_core_current=T_core,
+            T_mold_current=T_mold,
+            heat_release_W=cfg.reaction_enthalpy_J_per_kg * ctx.mass_total * kinetics.dalpha_dt,
+            dt=dt,
+        )
+        phi, alpha = kinetics.phi, kinetics.alpha
+        T_core, T_mold = heat.T_core_K, heat.T_mold_K
+        gas_step = step_gas_state(
+            ctx=ctx,
+            vent_cfg=ctx.vent,
+            state=gas_state,
+            alpha_value=alpha,
+            T_core_value=T_core,
+            dt=dt,
+        )
+        gas_state = gas_step.state
+        rho = gas_step.density
+        fill_ratio = gas_step.fill_ratio
+        p_total = gas_step.p_total_Pa
+        vent_eff = gas_step.vent_eff
+        p_max = max(p_max, p_total)
+        if idx % every == 0 or idx == n_steps - 1:
+            yield record(idx, time)
+
+
 def simulate(material, process, mold, quality, config, backend: str, vent_cfg) -> "SimulationResult":
     from . import ode_backends
 
@@ -427,14 +550,46 @@ def assemble_result(ctx: SimulationContext, trajectory: Trajectory) -> "Simulati
             vent_closure_time = float(time[idx])
         p_max_value = max(p_max_value, gas_step.p_total_Pa)
 
+    return finalize_result(
+        ctx,
+        {
+            "time_s": time,
+            "alpha": trajectory.alpha,
+            "T_core_K": trajectory.T_core_K,
+            "T_mold_K": trajectory.T_mold_K,
+            "rho_kg_per_m3": rho,
+            "fill_ratio": fill_ratio,
+            "n_CO2_mol": n_co2,
+            "p_air_Pa": p_air,
+            "p_CO2_Pa": p_co2,
+            "p_pentane_Pa": p_pentane,
+            "p_total_Pa": p_total,
+            "vent_eff": vent_eff,
+        },
+        p_max_value,
+        vent_closure_time,
+    )
+
+
+def finalize_result(
+    ctx: SimulationContext,
+    series: Dict[str, List[float]],
+    p_max_value: float,
+    vent_closure_time: Optional[float],
+) -> "SimulationResult":
+    """KPIs, quality evaluation and output selection from full-resolution state series (all but hardness)."""
+
+    cfg = ctx.config
+    time = series["time_s"]
+    rho = series["rho_kg_per_m3"]
     rho_moulded = rho[-1]
-    hardness = compute_hardness_profile(trajectory.alpha, rho, cfg)
+    hardness = compute_hardness_profile(series["alpha"], rho, cfg)
     H_24h = predict_h24(rho_moulded, cfg)
     t_min, t_max, t_opt = demold_window(
         time=time,
-        alpha=trajectory.alpha,
+        alpha=series["alpha"],
         rho=rho,
-        T_core=trajectory.T_core_K,
+        T_core=series["T_core_K"],
         hardness_profile=hardness,
         quality=ctx.quality,
     )
@@ -453,20 +608,10 @@ def assemble_result(ctx: SimulationContext, trajectory: Trajectory) -> "Simulati
         p_max_value,
     )
 
+    series = {**series, "hardness_shore": hardness}
+
     return SimulationResult(
-        time_s=time,
-        alpha=trajectory.alpha,
-        T_core_K=trajectory.T_core_K,
-        T_mold_K=trajectory.T_mold_K,
-        rho_kg_per_m3=rho,
-        fill_ratio=fill_ratio,
-        n_CO2_mol=n_co2,
-        p_air_Pa=p_air,
-        p_CO2_Pa=p_co2,
-        p_pentane_Pa=p_pentane,
-        p_total_Pa=p_total,
-        vent_eff=vent_eff,
-        hardness_shore=hardness,
+        **select_output_series(cfg, series),
         t_demold_min_s=t_min,
         t_demold_max_s=t_max,
         t_demold_opt_s=t_opt,
@@ -487,6 +632,18 @@ def assemble_result(ctx: SimulationContext, trajectory: Trajectory) -> "Simulati
     )
 
 
+def select_output_series(config: SimulationConfig, series: Dict[str, List[float]]) -> Dict[str, List[float]]:
+    """Keep only `config.record` channels, decimated per `output_every` / `output_points`."""
+
+    channels = config.recorded_channels()
+    if not channels:
+        return {}
+    indices = config.output_indices(len(series["time_s"]))
+    if indices is None:
+        return {name: series[name] for name in channels}
+    return {name: [series[name][idx] for idx in indices] for name in channels}
+
+
 def evaluate_quality(
     process,
     quality,
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, List, Optional, Literal, Tuple
+from typing import Any, List, Optional, Literal, Tuple, Union
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
@@ -112,6 +112,23 @@ class QualityTargets(BaseModel):
         return _coerce_quantity(value, "kilogram / meter ** 3")
 
 
+SERIES_CHANNELS: Tuple[str, ...] = (
+    "time_s",
+    "alpha",
+    "T_core_K",
+    "T_mold_K",
+    "rho_kg_per_m3",
+    "fill_ratio",
+    "n_CO2_mol",
+    "p_air_Pa",
+    "p_CO2_Pa",
+    "p_pentane_Pa",
+    "p_total_Pa",
+    "vent_eff",
+    "hardness_shore",
+)
+
+
 class SimulationConfig(BaseModel):
     total_time_s: float = Field(600.0, gt=0)
     time_step_s: float = Field(0.5, gt=0)
@@ -144,16 +161,53 @@ class SimulationConfig(BaseModel):
     layers_count: int = Field(1, ge=1, description="Number of layers for 1D experimental mode")
     foam_conductivity_W_per_mK: float = Field(0.2, ge=0.0)
     dimension: Literal["0d", "1d_experimental"] = "0d"
+    record: Union[Literal["all", "kpi_only"], List[str]] = Field(
+        "all", description="Series kept in the result: 'all', 'kpi_only' or a list of channel names"
+    )
+    output_every: int = Field(1, ge=1, description="Keep every N-th step of the recorded series")
+    output_points: Optional[int] = Field(
+        None, ge=2, description="Target number of points per recorded series (overrides output_every)"
+    )
 
     def steps(self) -> int:
         return int(self.total_time_s / self.time_step_s) + 1
 
+    def recorded_channels(self) -> Tuple[str, ...]:
+        """Series channels stored in `SimulationResult` (KPIs are always computed at full resolution)."""
+
+        if self.record == "all":
+            return SERIES_CHANNELS
+        if self.record == "kpi_only":
+            return ()
+        return tuple(name for name in SERIES_CHANNELS if name in self.record)
+
+    def output_indices(self, n_points: int) -> Optional[List[int]]:
+        """Indices of the kept time steps (first and last always kept); None keeps every step."""
+
+        stride = self.output_every
+        if self.output_points is not None and n_points > self.output_points:
+            stride = -(-(n_points - 1) // (self.output_points - 1))
+        if stride <= 1 or n_points <= 2:
+            return None
+        indices = list(range(0, n_points, stride))
+        if indices[-1] != n_points - 1:
+            indices.append(n_points - 1)
+        return indices
+
     @model_validator(mode="after")
     def _validate_total_time(self) -> "SimulationConfig":
         if self.total_time_s <= self.time_step_s:
             raise ValueError("total_time_s must be greater than time_step_s.")
         return self
 
+    @field_validator("record")
+    def _validate_record(cls, value: Union[str, List[str]]) -> Union[str, List[str]]:
+        if isinstance(value, list):
+            unknown = [name for name in value if name not in SERIES_CHANNELS]
+            if unknown:
+                raise ValueError(f"Unknown series channels in record: {', '.join(unknown)}")
+        return value
+
     @field_validator("reference_temperature_K", "pentane_evap_onset_K", mode="before")
     def _convert_kelvin_fields(cls, value: Any) -> float:
         return _coerce_quantity(value, "kelvin")
@@ -0,0 +1,151 @@
+"""
+Time alignment of sensor channels onto a common grid.
+
+Sensors sample at different rates and with jitter; an outer merge on `time_s`
+produces one sparse, NaN-filled row per distinct timestamp. `align_sensor_frames`
+instead resamples every channel onto one regular grid (one sorted pass per
+channel, `np.searchsorted` / `np.interp`), giving a dense frame that
+downstream feature code can consume directly.
+
+Resampling is opt-in (`load_log_bundle(..., alignment=AlignmentConfig())`):
+linear interpolation between grid points can flatten short peaks, so the
+default ETL path keeps the raw samples.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Literal, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+AlignMethod = Literal["linear", "nearest", "previous"]
+
+
+@dataclass
+class AlignmentConfig:
+    """
+    Resampling settings.
+
+    - `rate_hz`: grid rate; `None` infers it from the fastest channel (median
+      sampling interval).
+    - `tolerance_s`: a grid point is left NaN for a channel when the closest
+      usable sample (the previous one for `method="previous"`) is further
+      away than this; `None` disables the check.
+    - `method`: `linear` (np.interp), `nearest` or `previous` (zero-order hold,
+      like `pandas.merge_asof(direction="backward")`).
+
+    Grid points outside a channel's recorded span are always NaN.
+    """
+
+    rate_hz: Optional[float] = None
+    tolerance_s: Optional[float] = None
+    method: AlignMethod = "linear"
+
+    def __post_init__(self) -> None:
+        if self.rate_hz is not None and self.rate_hz <= 0:
+            raise ValueError("rate_hz must be > 0")
+        if self.tolerance_s is not None and self.tolerance_s < 0:
+            raise ValueError("tolerance_s must be >= 0")
+        if self.method not in ("linear", "nearest", "previous"):
+            raise ValueError(f"Unknown alignment method '{self.method}'")
+
+
+def _channel_series(frames: Iterable[pd.DataFrame]) -> List[Tuple[str, np.ndarray, np.ndarray]]:
+    """(name, sorted times, values) for every channel, NaN samples dropped."""
+
+    series: List[Tuple[str, np.ndarray, np.ndarray]] = []
+    for frame in frames:
+        if frame is None or frame.empty or "time_s" not in frame.columns:
+            continue
+        times = frame["time_s"].to_numpy(dtype=np.float64, na_value=np.nan)
+        order = None
+        if np.any(np.diff(times) < 0):
+            order = np.argsort(times, kind="stable")
+            times = times[order]
+        for name in frame.columns:
+            if name == "time_s":
+                continue
+            values = frame[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            if order is not None:
+                values = values[order]
+            valid = ~(np.isnan(times) | np.isnan(values))
+            series.append((name, times[valid], values[valid]))
+    return series
+
+
+def _infer_step(series: List[Tuple[str, np.ndarray, np.ndarray]]) -> Optional[float]:
+    steps = [float(np.median(np.diff(t))) for _, t, _ in series if t.size > 1]
+    steps = [step for step in steps if step > 0]
+    return min(steps) if steps else None
+
+
+def _build_grid(series: List[Tuple[str, np.ndarray, np.ndarray]], config: AlignmentConfig) -> np.ndarray:
+    populated = [t for _, t, _ in series if t.size]
+    start = min(float(t[0]) for t in populated)
+    stop = max(float(t[-1]) for t in populated)
+    step = 1.0 / config.rate_hz if config.rate_hz else _infer_step(series)
+    if step is None:
+        return np.unique(np.concatenate(populated))
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return start + step * np.arange(count, dtype=np.float64)
+
+
+def _resample(grid: np.ndarray, times: np.ndarray, values: np.ndarray, config: AlignmentConfig) -> np.ndarray:
+    out = np.full(grid.shape, np.nan)
+    if times.size == 0:
+        return out
+    inside = (grid >= times[0]) & (grid <= times[-1])
+
+    if config.method == "previous":
+        idx = np.searchsorted(times, grid, side="right") - 1
+        idx_safe = np.clip(idx, 0, times.size - 1)
+        out = values[idx_safe]
+        distance = grid - times[idx_safe]
+    else:
+        right = np.clip(np.searchsorted(times, grid, side="left"), 0, times.size - 1)
+        left = np.clip(right - 1, 0, times.size - 1)
+        d_left = np.abs(grid - times[left])
+        d_right = np.abs(times[right] - grid)
+        distance = np.minimum(d_left, d_right)
+        if config.method == "nearest":
+            out = np.where(d_left <= d_right, values[left], values[right])
+        else:
+            out = np.interp(grid, times, values)
+
+    mask = ~inside
+    if config.tolerance_s is not None:
+        mask |= distance > config.tolerance_s + 1e-12
+    out = np.array(out, dtype=np.float64)
+    out[mask] = np.nan
+    return out
+
+
+def align_sensor_frames(frames: Iterable[pd.DataFrame], config: Optional[AlignmentConfig] = None) -> pd.DataFrame:
+    """
+    Resample sensor frames (`time_s` + channel columns) onto a common grid.
+
+    Returns a dense frame `time_s, <channel>...` (float64). Channels appearing
+    in several frames keep the first occurrence.
+    """
+
+    config = config or AlignmentConfig()
+    series = _channel_series(frames)
+    if not any(t.size for _, t, _ in series):
+        return pd.DataFrame()
+    grid = _build_grid(series, config)
+    data: Dict[str, np.ndarray] = {"time_s": grid}
+    for name, times, values in series:
+        if name not in data:
+            data[name] = _resample(grid, times, values, config)
+    return pd.DataFrame(data)
+
+
+def align_measured(measured: Optional[pd.DataFrame], config: Optional[AlignmentConfig] = None) -> pd.DataFrame:
+    """Re-grid an already merged (possibly sparse) measured frame."""
+
+    if measured is None or measured.empty or "time_s" not in measured.columns:
+        return pd.DataFrame() if measured is None else measured
+    return align_sensor_frames([measured], config)
@@ -1,20 +1,54 @@
 """
 Dataset builder combining simulation logs and measured features.
+
+`build_dataset` handles a single shot. `build_dataset_streaming` walks a whole
+archive (log directory tree or `ProcessLogSource`) in bounded chunks, computes
+feature rows on a thread pool and appends each chunk as a Parquet row group.
+Simulation inputs come either from stored simulation JSON (`sim_path`) or from
+a `ShotSimulator` that simulates each shot's process conditions, reusing
+cached summaries (see `data.sim_cache`).
 """
 
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
 
 import pandas as pd
 
+try:  # pyarrow opcjonalne (zapis Parquet porcjami)
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+from ..data.alignment import AlignmentConfig, align_measured
 from ..data.etl import LogBundle, load_log_bundle, load_measured_csv
-from ..logging.features import compute_basic_features
+from ..data.interfaces import ProcessLogQuery, ProcessLogSource
+from ..data.sim_cache import ShotSimulator
+from ..data.schema import FEATURE_COLUMNS, ID_COLUMNS, TARGET_COLUMNS
+from ..logging.binary_log import BINARY_SUFFIX, SEGMENT_SUFFIX, SimulationLogSegment, read_binary_log
+from ..logging.features import compute_basic_features, compute_feature_row
+from ..utils import get_logger
+
+
+LOGGER = get_logger(__name__)
 
+STREAM_COLUMNS: List[str] = ID_COLUMNS + FEATURE_COLUMNS + TARGET_COLUMNS
 
-def _load_simulation_payload(path: Path) -> dict:
+
+def _load_simulation_payload(path: Path) -> Mapping[str, Any]:
+    """
+    Simulation payload from a SimulationResult/SimulationLog JSON or a binary
+    log (`.npz`, series are read lazily on first access).
+    """
+
+    if path.suffix.lower() == BINARY_SUFFIX:
+        return read_binary_log(path).simulation
     payload = json.loads(path.read_text(encoding="utf-8"))
     if "simulation" in payload:  # SimulationLog format
         return payload["simulation"]
@@ -62,3 +96,189 @@ def build_dataset(sim_path: Path, log_path: Optional[Path], output_path: Path) -
     features = compute_basic_features(sim, measured, qc=qc, process=process)
     saved_path = _persist_features(features, output_path)
     return features, saved_path
+
+
+def iter_log_dirs(root: Path) -> Iterator[Path]:
+    """Yield shot log directories (containing meta.yaml) below `root`, sorted by name."""
+
+    for meta_path in sorted(root.rglob("meta.yaml")):
+        yield meta_path.parent
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _SimulationResolver:
+    """
+    Map a shot to its simulation payload.
+
+    `sim_path` may be a single JSON/`.npz` log (shared by all shots), a
+    directory with one `<shot_id>.json` or `<shot_id>.npz` per shot, or a
+    binary log segment (`.simseg`, runs looked up by run id / shot_id through
+    its index). Shared payloads are parsed once.
+    """
+
+    def __init__(self, sim_path: Path) -> None:
+        self.sim_path = sim_path
+        self._shared: Optional[Mapping[str, Any]] = None
+        self._segment: Optional[SimulationLogSegment] = None
+        if sim_path.suffix.lower() == SEGMENT_SUFFIX:
+            self._segment = SimulationLogSegment(sim_path)
+        elif not sim_path.is_dir():
+            self._shared = _load_simulation_payload(sim_path)
+
+    def __call__(self, shot_id: Optional[str]) -> Mapping[str, Any]:
+        if self._shared is not None:
+            return self._shared
+        if self._segment is not None and shot_id:
+            run_ids = [shot_id] if shot_id in self._segment else self._segment.find(shot_id=shot_id)
+            if run_ids:
+                return self._segment.read(run_ids[-1]).simulation
+        elif shot_id:
+            for suffix in (".json", BINARY_SUFFIX):
+                candidate = self.sim_path / f"{shot_id}{suffix}"
+                if candidate.exists():
+                    return _load_simulation_payload(candidate)
+        LOGGER.warning("No simulation payload for shot '%s' in %s", shot_id, self.sim_path)
+        return {}
+
+
+def _iso_text(value: Any) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _shot_id(bundle: LogBundle) -> Optional[str]:
+    shot_id = bundle.metadata.get("shot_id")
+    return None if shot_id is None else str(shot_id)
+
+
+def _bundle_to_row(bundle: LogBundle, sim: Mapping[str, Any], alignment: Optional[AlignmentConfig] = None) -> Dict[str, Any]:
+    measured = bundle.measured if alignment is None else align_measured(bundle.measured, alignment)
+    row = compute_feature_row(sim, measured, qc=bundle.qc, process=bundle.process)
+    row["shot_id"] = _shot_id(bundle)
+    system_id = bundle.metadata.get("system_id")
+    row["system_id"] = None if system_id is None else str(system_id)
+    timestamp = bundle.metadata.get("timestamp")
+    row["timestamp"] = None if timestamp is None else _iso_text(timestamp)
+    return row
+
+
+def iter_feature_rows(
+    logs: Union[Path, ProcessLogSource],
+    sim_path: Optional[Path],
+    query: Optional[ProcessLogQuery] = None,
+    workers: int = 4,
+    chunk_size: int = 500,
+    alignment: Optional[AlignmentConfig] = None,
+    simulator: Optional[ShotSimulator] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield chunks of feature rows (dicts) for every shot in `logs`.
+
+    For a directory the worker pool also loads each log bundle (file I/O is the
+    dominant cost); for a `ProcessLogSource` bundles are pulled lazily from the
+    source and only feature extraction runs on the pool. At most `chunk_size`
+    shots are in flight at once, so memory stays bounded for any archive size.
+    `alignment` re-grids sensor channels (log directories on load, source
+    bundles before feature extraction); without it raw samples are used. With a `simulator`
+    each chunk's shots are simulated in one batch (cache hits are reused) and
+    `sim_path` is ignored.
+    """
+
+    if simulator is None and sim_path is None:
+        raise ValueError("Either sim_path or simulator must be provided")
+    resolve_sim = None if simulator is not None else _SimulationResolver(sim_path)
+    from_source = isinstance(logs, ProcessLogSource)
+    items: Iterable[Any] = logs.fetch_shots(query or ProcessLogQuery()) if from_source else iter_log_dirs(Path(logs))
+    row_alignment = alignment if from_source else None  # directories are aligned (if at all) on load
+
+    def load(log_dir: Path) -> LogBundle:
+        return load_log_bundle(log_dir, alignment)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for chunk in _chunked(items, max(1, chunk_size)):
+            bundles = chunk if from_source else list(pool.map(load, chunk))
+            if simulator is not None:
+                sims = simulator.summaries(bundles)
+            else:
+                sims = list(pool.map(lambda bundle: resolve_sim(_shot_id(bundle)), bundles))
+            yield list(pool.map(lambda bundle, sim: _bundle_to_row(bundle, sim, row_alignment), bundles, sims))
+
+
+def _arrow_schema() -> "pa.Schema":
+    fields = [pa.field(name, pa.string()) for name in ID_COLUMNS]
+    fields += [pa.field(name, pa.float64()) for name in FEATURE_COLUMNS + TARGET_COLUMNS]
+    return pa.schema(fields)
+
+
+def _rows_to_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(rows, columns=STREAM_COLUMNS)
+    numeric = FEATURE_COLUMNS + TARGET_COLUMNS
+    frame[numeric] = frame[numeric].apply(pd.to_numeric, errors="coerce").astype("float64")
+    return frame
+
+
+def build_dataset_streaming(
+    logs: Union[Path, ProcessLogSource],
+    sim_path: Optional[Path],
+    output_path: Path,
+    query: Optional[ProcessLogQuery] = None,
+    workers: int = 4,
+    chunk_size: int = 500,
+    alignment: Optional[AlignmentConfig] = None,
+    simulator: Optional[ShotSimulator] = None,
+) -> tuple[int, Path]:
+    """
+    Build a feature file for a whole shot archive with bounded memory.
+
+    Each chunk of `chunk_size` shots becomes one Parquet row group (fixed
+    schema: `STREAM_COLUMNS`). Without pyarrow, or for a `.csv` output, chunks
+    are appended to a CSV instead. Pass a `simulator` instead of `sim_path`
+    to simulate shots from their process logs (see `iter_feature_rows`).
+    Returns (rows_written, path_written).
+    """
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    use_parquet = output_path.suffix.lower() != ".csv" and pq is not None
+    if not use_parquet:
+        output_path = output_path.with_suffix(".csv")
+
+    rows_written = 0
+    writer = None
+    schema = _arrow_schema() if use_parquet else None
+    try:
+        for rows in iter_feature_rows(
+            logs,
+            sim_path,
+            query=query,
+            workers=workers,
+            chunk_size=chunk_size,
+            alignment=alignment,
+            simulator=simulator,
+        ):
+            frame = _rows_to_frame(rows)
+            if use_parquet:
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, schema)
+                writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+            else:
+                frame.to_csv(output_path, mode="w" if rows_written == 0 else "a", header=rows_written == 0, index=False)
+            rows_written += len(frame)
+            LOGGER.debug("Wrote %d feature rows to %s", rows_written, output_path)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if rows_written == 0:
+        empty = _rows_to_frame([])
+        if use_parquet:
+            pq.write_table(pa.Table.from_pandas(empty, schema=schema, preserve_index=False), output_path)
+        else:
+            empty.to_csv(output_path, index=False)
+    return rows_written, output_path
@@ -4,15 +4,20 @@ ETL helpers for processing raw process logs into ProcessConditions-like dicts.
 
 from __future__ import annotations
 
+import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import reduce
 from pathlib import Path
-from typing import Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional
 
 import pandas as pd
 from ruamel.yaml import YAML
 
 from ..core.types import ProcessConditions
+from .alignment import AlignmentConfig, align_sensor_frames
 
 
 DEFAULT_PROCESS_VALUES: Dict[str, float] = {
@@ -27,6 +32,12 @@ DEFAULT_PROCESS_VALUES: Dict[str, float] = {
     "mixing_eff": 1.0,
 }
 
+# Per-sensor CSV files in a log directory and the channel each one carries.
+SENSOR_FILES: Dict[str, str] = {
+    "sensors_core_temp.csv": "T_core_C",
+    "sensors_pressure.csv": "p_total_bar",
+}
+
 
 @dataclass
 class LogBundle:
@@ -51,13 +62,17 @@ def _merge_frames_on_time(frames: list[pd.DataFrame]) -> pd.DataFrame:
     return merged.sort_values("time_s").reset_index(drop=True)
 
 
-def load_log_bundle(log_dir: Path) -> LogBundle:
+def load_log_bundle(log_dir: Path, alignment: Optional[AlignmentConfig] = None) -> LogBundle:
     """
     Load a log directory containing:
     - meta.yaml (mandatory fields: shot_id/system_id optional)
     - process.yaml (optional overrides)
     - sensors_core_temp.csv, sensors_pressure.csv (optional timeseries)
     - qc.yaml (optional QC results)
+
+    By default sensor CSVs are outer-merged on `time_s`, keeping every raw
+    sample (peaks and their times stay exact). With `alignment` they are
+    resampled onto one common time grid instead (see `data.alignment`).
     """
 
     meta = _load_yaml(log_dir / "meta.yaml")
@@ -69,19 +84,35 @@ def load_log_bundle(log_dir: Path) -> LogBundle:
         process["RH_ambient"] = float(process["RH_ambient_pct"]) * 0.01
 
     frames: list[pd.DataFrame] = []
-    core_temp = log_dir / "sensors_core_temp.csv"
-    pressure = log_dir / "sensors_pressure.csv"
-    if core_temp.exists():
-        frames.append(pd.read_csv(core_temp))
-    if pressure.exists():
-        frames.append(pd.read_csv(pressure))
+    for filename in SENSOR_FILES:
+        sensor_path = log_dir / filename
+        if sensor_path.exists():
+            frames.append(pd.read_csv(sensor_path))
 
-    measured = _merge_frames_on_time(frames) if frames else pd.DataFrame()
+    if alignment is None:
+        measured = _merge_frames_on_time(frames)
+    else:
+        measured = align_sensor_frames(frames, alignment) if frames else pd.DataFrame()
 
     metadata = {k: v for k, v in meta.items() if k != "process"}
     return LogBundle(process=process, measured=measured, qc=qc, metadata=metadata)
 
 
+def write_sensor_csvs(measured: pd.DataFrame, log_dir: Path) -> list[Path]:
+    """Write measured channels into the per-sensor CSVs read by `load_log_bundle`."""
+
+    written: list[Path] = []
+    if measured is None or measured.empty or "time_s" not in measured.columns:
+        return written
+    for filename, column in SENSOR_FILES.items():
+        if column not in measured.columns:
+            continue
+        path = log_dir / filename
+        measured[["time_s", column]].dropna().to_csv(path, index=False)
+        written.append(path)
+    return written
+
+
 def load_measured_csv(path: Path) -> Optional[pd.DataFrame]:
     if not path.exists():
         return None
@@ -94,8 +125,15 @@ def build_process_conditions_from_logs(log_dir: Path) -> ProcessConditions:
     when data is missing (see DEFAULT_PROCESS_VALUES).
     """
 
-    bundle = load_log_bundle(log_dir)
+    return process_conditions_from_bundle(load_log_bundle(log_dir))
+
+
+def process_conditions_from_bundle(bundle: LogBundle) -> ProcessConditions:
+    """ProcessConditions for a loaded bundle (defaults fill missing fields, extra keys are ignored)."""
+
     data = {**DEFAULT_PROCESS_VALUES, **bundle.process}
+    if "RH_ambient_pct" in bundle.process:
+        data["RH_ambient"] = float(bundle.process["RH_ambient_pct"]) * 0.01
     return ProcessConditions(**data)
 
 
@@ -109,3 +147,179 @@ def build_log_bundles_from_source(source, query) -> Iterable[LogBundle]:
     """
 
     return source.fetch_shots(query)
+
+
+@dataclass
+class ImportSummary:
+    """Outcome of `export_log_bundles`."""
+
+    written: int
+    skipped: int
+    output: Path
+
+
+_YAML_LOCAL = threading.local()
+
+
+def _safe_yaml() -> YAML:
+    # ruamel emitters are not thread-safe: keep one fast "safe" emitter per thread.
+    yaml = getattr(_YAML_LOCAL, "yaml", None)
+    if yaml is None:
+        yaml = YAML(typ="safe")
+        yaml.default_flow_style = False
+        _YAML_LOCAL.yaml = yaml
+    return yaml
+
+
+def write_log_bundle(bundle: LogBundle, shot_dir: Path, shot_id: str) -> Path:
+    """
+    Write a bundle in the log directory format read by `load_log_bundle`.
+
+    meta.yaml is written last, so its presence marks a complete shot (used by
+    resumable imports).
+    """
+
+    yaml = _safe_yaml()
+    shot_dir.mkdir(parents=True, exist_ok=True)
+    with (shot_dir / "process.yaml").open("w", encoding="utf-8") as handle:
+        yaml.dump(bundle.process, handle)
+    with (shot_dir / "qc.yaml").open("w", encoding="utf-8") as handle:
+        yaml.dump(bundle.qc, handle)
+    write_sensor_csvs(bundle.measured, shot_dir)
+    meta = {**bundle.metadata, "shot_id": shot_id, "system_id": bundle.metadata.get("system_id")}
+    with (shot_dir / "meta.yaml").open("w", encoding="utf-8") as handle:
+        yaml.dump(meta, handle)
+    return shot_dir
+
+
+def _bundle_to_json_line(bundle: LogBundle, shot_id: str) -> str:
+    measured = bundle.measured
+    record: Dict[str, Any] = {
+        "metadata": {**bundle.metadata, "shot_id": shot_id},
+        "process": bundle.process,
+        "qc": bundle.qc,
+        "measured": {} if measured is None or measured.empty else measured.to_dict(orient="list"),
+    }
+    return json.dumps(record, default=str)
+
+
+def _existing_jsonl_ids(path: Path) -> set[str]:
+    """
+    Shot ids already present in `shots.jsonl`, for `--resume`.
+
+    A crash mid-append can leave a truncated last line; it is treated as a
+    partial write and cut off, so appending resumes after the last good record.
+    """
+
+    ids: set[str] = set()
+    if not path.exists():
+        return ids
+    good_end = 0
+    last = b""
+    with path.open("rb") as handle:
+        for line in handle:
+            try:
+                if line.strip():
+                    ids.add(str(json.loads(line)["metadata"]["shot_id"]))
+            except (ValueError, KeyError, TypeError):
+                if handle.read(1):  # corruption before the tail is not a partial write
+                    raise
+                break
+            good_end += len(line)
+            last = line
+    if good_end < path.stat().st_size:
+        with path.open("r+b") as handle:
+            handle.truncate(good_end)
+    elif last and not last.endswith(b"\n"):
+        with path.open("ab") as handle:
+            handle.write(b"\n")
+    return ids
+
+
+def export_log_bundles(
+    bundles: Iterable[LogBundle],
+    output_dir: Path,
+    workers: int = 4,
+    resume: bool = False,
+    output_format: str = "dirs",
+) -> ImportSummary:
+    """
+    Stream bundles to disk without materialising them.
+
+    - `output_format="dirs"`: one log directory per shot (meta/process/qc YAML +
+      sensor CSVs), written concurrently by `workers` threads.
+    - `output_format="jsonl"`: a single `shots.jsonl` file, one record per shot;
+      serialisation runs on the pool, lines are appended in source order.
+    - `output_format="store"`: partitioned Parquet shot store (see
+      `data.shot_store`), appended in batches.
+
+    At most `4 * workers` shots are in flight. With `resume=True` shots that are
+    already present (complete directory / JSONL record) are skipped.
+    """
+
+    if output_format not in {"dirs", "jsonl", "store"}:
+        raise ValueError(f"Unknown import output format '{output_format}'")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if output_format == "store":
+        return _export_to_shot_store(bundles, output_dir, resume)
+    jsonl_path = output_dir / "shots.jsonl"
+    done_ids = _existing_jsonl_ids(jsonl_path) if resume and output_format == "jsonl" else set()
+    if output_format == "jsonl" and not resume:
+        jsonl_path.write_text("", encoding="utf-8")
+
+    written = skipped = 0
+    max_in_flight = 4 * max(1, workers)
+    pending: deque = deque()
+    sink = jsonl_path.open("a", encoding="utf-8") if output_format == "jsonl" else None
+
+    def _drain(limit: int) -> None:
+        nonlocal written
+        while len(pending) > limit:
+            line = pending.popleft().result()
+            if sink is not None:
+                sink.write(line + "\n")
+            written += 1
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for index, bundle in enumerate(bundles, start=1):
+                shot_id = str(bundle.metadata.get("shot_id") or f"shot_{index}")
+                if output_format == "dirs":
+                    shot_dir = output_dir / shot_id
+                    if resume and (shot_dir / "meta.yaml").exists():
+                        skipped += 1
+                        continue
+                    pending.append(pool.submit(write_log_bundle, bundle, shot_dir, shot_id))
+                else:
+                    if shot_id in done_ids:
+                        skipped += 1
+                        continue
+                    pending.append(pool.submit(_bundle_to_json_line, bundle, shot_id))
+                _drain(max_in_flight)
+            _drain(0)
+    finally:
+        if sink is not None:
+            sink.close()
+
+    output = jsonl_path if output_format == "jsonl" else output_dir
+    return ImportSummary(written=written, skipped=skipped, output=output)
+
+
+def _export_to_shot_store(bundles: Iterable[LogBundle], output_dir: Path, resume: bool) -> ImportSummary:
+    from .shot_store import ShotStoreSource, is_shot_store, write_shot_store  # local import to avoid cycles
+
+    done_ids: set[str] = set()
+    if resume and is_shot_store(output_dir):
+        done_ids = set(ShotStoreSource(output_dir).read_shots(columns=["shot_id"])["shot_id"])
+    skipped = 0
+
+    def _pending() -> Iterator[LogBundle]:
+        nonlocal skipped
+        for bundle in bundles:
+            if str(bundle.metadata.get("shot_id")) in done_ids:
+                skipped += 1
+                continue
+            yield bundle
+
+    written = write_shot_store(_pending(), output_dir)
+    return ImportSummary(written=written, skipped=skipped, output=output_dir)
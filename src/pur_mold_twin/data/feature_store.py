@@ -0,0 +1,114 @@
+"""
+Projected, typed reads of feature files (Parquet/CSV).
+
+Drift checks and training usually need a handful of columns out of a
+multi-GB feature store. `load_features` reads only those columns (`columns=`
+for Parquet, `usecols` for CSV), can downcast float64 features to float32
+(tree models train on float32 anyway) and, for Parquet, skips row groups
+outside a `timestamp` range using the row-group statistics.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:  # pyarrow opcjonalne (projekcja/filtry Parquet)
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+from .schema import TARGET_COLUMNS
+
+TIME_COLUMN = "timestamp"
+
+
+def feature_file_columns(path: Path) -> list[str]:
+    """Column names of a feature file without reading its data."""
+
+    if path.suffix.lower() == ".csv":
+        return list(pd.read_csv(path, nrows=0).columns)
+    if pq is not None:
+        return list(pq.read_schema(path).names)
+    return list(pd.read_parquet(path).columns)  # pragma: no cover - pyarrow missing
+
+
+def _time_bounds(start_time: Optional[datetime], end_time: Optional[datetime]) -> list[tuple]:
+    filters: list[tuple] = []
+    if start_time is not None:
+        filters.append((TIME_COLUMN, ">=", start_time.isoformat()))
+    if end_time is not None:
+        filters.append((TIME_COLUMN, "<", end_time.isoformat()))
+    return filters
+
+
+def _downcast(frame: pd.DataFrame, keep: Sequence[str]) -> pd.DataFrame:
+    columns = [c for c in frame.columns if frame[c].dtype == np.float64 and c not in keep]
+    if columns:
+        frame[columns] = frame[columns].astype(np.float32)
+    return frame
+
+
+def load_features(
+    path: Path,
+    columns: Optional[Sequence[str]] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    float32: bool = False,
+) -> pd.DataFrame:
+    """
+    Load a feature file, reading only what is needed.
+
+    - `columns`: projection; names missing from the file are ignored (callers
+      such as `compute_drift` report them as unavailable).
+    - `start_time`/`end_time`: keep rows with `start <= timestamp < end`
+      (ISO strings, as written by `build_dataset_streaming`). Parquet row
+      groups outside the range are not read at all.
+    - `float32`: downcast float64 columns to float32, except targets.
+    """
+
+    if not path.exists():
+        raise FileNotFoundError(f"Features file '{path}' not found")
+
+    available = feature_file_columns(path)
+    selected = None if columns is None else [c for c in dict.fromkeys(columns) if c in available]
+    time_filter = _time_bounds(start_time, end_time) if TIME_COLUMN in available else []
+
+    if path.suffix.lower() == ".csv":
+        wanted = None if selected is None else set(selected) | ({TIME_COLUMN} if time_filter else set())
+        dtype = None
+        if float32:
+            dtype = {c: np.float32 for c in (wanted or available) if c not in TARGET_COLUMNS and c not in {TIME_COLUMN, "shot_id", "system_id"}}
+        try:
+            frame = pd.read_csv(path, usecols=None if wanted is None else lambda c: c in wanted, dtype=dtype)
+        except ValueError:  # non-numeric data in a column requested as float32
+            frame = pd.read_csv(path, usecols=None if wanted is None else lambda c: c in wanted)
+        if time_filter:
+            stamps = frame[TIME_COLUMN].astype(str)
+            mask = np.ones(len(frame), dtype=bool)
+            for _, op, value in time_filter:
+                mask &= (stamps >= value).to_numpy() if op == ">=" else (stamps < value).to_numpy()
+            frame = frame.loc[mask].reset_index(drop=True)
+        if selected is not None:
+            frame = frame[selected]
+    elif pq is not None:
+        table = pq.read_table(path, columns=selected, filters=time_filter or None)
+        if float32:
+            fields = [
+                pa.field(f.name, pa.float32()) if f.type == pa.float64() and f.name not in TARGET_COLUMNS else f
+                for f in table.schema
+            ]
+            table = table.cast(pa.schema(fields))
+        frame = table.to_pandas()
+    else:  # pragma: no cover - pyarrow missing
+        frame = pd.read_parquet(path, columns=selected)
+
+    if float32:
+        frame = _downcast(frame, TARGET_COLUMNS)
+    return frame
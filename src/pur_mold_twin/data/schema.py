@@ -39,3 +39,10 @@ TARGET_COLUMNS: List[str] = [
     "defect_risk",
     "any_defect",
 ]
+
+# Identifier columns added by archive-level builders (not used as model inputs).
+ID_COLUMNS: List[str] = [
+    "shot_id",
+    "system_id",
+    "timestamp",
+]
@@ -0,0 +1,320 @@
+"""
+Consolidated columnar shot store (partitioned Parquet).
+
+Replaces thousands of per-shot log directories (meta/process/qc YAML + sensor
+CSVs) with two hive-partitioned Parquet datasets under one root:
+
+    <root>/shots/system_id=<id>/date=<YYYY-MM-DD>/part-*.parquet
+    <root>/sensors/system_id=<id>/date=<YYYY-MM-DD>/part-*.parquet
+
+`shots` holds one row per shot: ids/metadata columns plus `process_<key>` and
+`qc_<key>` columns (`qc_defects` as a JSON list). `sensors` is long-format,
+one row per (shot_id, time_s) with one column per channel. `ShotStoreSource`
+implements `ProcessLogSource`; `ProcessLogQuery` filters are pushed down to
+partition pruning (system_id, date) and Parquet row-group statistics
+(timestamp, mold_id, quality_status), so loading a whole archive is a handful
+of file reads instead of five per shot.
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:  # pyarrow opcjonalne (wymagane przez magazyn Parquet)
+    import pyarrow as pa  # type: ignore
+    import pyarrow.dataset as ds  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    pa = None  # type: ignore
+    ds = None  # type: ignore
+    pq = None  # type: ignore
+
+from .etl import LogBundle
+from .interfaces import ProcessLogQuery, ProcessLogSource
+
+
+SHOTS_DIR = "shots"
+SENSORS_DIR = "sensors"
+PARTITION_COLUMNS: List[str] = ["system_id", "date"]
+METADATA_COLUMNS: List[str] = ["shot_id", "timestamp", "mold_id", "quality_status"]
+PROCESS_PREFIX = "process_"
+QC_PREFIX = "qc_"
+UNKNOWN_PARTITION = "unknown"
+
+
+def _require_pyarrow() -> None:
+    if pa is None:  # pragma: no cover
+        raise RuntimeError("pyarrow is required for the shot store; install per py_lib.md")
+
+
+def _partitioning():
+    # Explicit string types: numeric-looking system ids must not be inferred as ints.
+    return ds.partitioning(pa.schema([("system_id", pa.string()), ("date", pa.string())]), flavor="hive")
+
+
+def is_shot_store(root: Path) -> bool:
+    """True if `root` looks like a shot store (has a `shots/` dataset)."""
+
+    return (Path(root) / SHOTS_DIR).is_dir()
+
+
+def _timestamp_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _partition_date(timestamp: Optional[str]) -> str:
+    if not timestamp or len(timestamp) < 10:
+        return UNKNOWN_PARTITION
+    return timestamp[:10]
+
+
+def _bundle_to_record(bundle: LogBundle, index: int) -> Dict[str, Any]:
+    meta = bundle.metadata
+    timestamp = _timestamp_text(meta.get("timestamp"))
+    record: Dict[str, Any] = {
+        "shot_id": str(meta.get("shot_id") or f"shot_{index}"),
+        "system_id": str(meta.get("system_id") or UNKNOWN_PARTITION),
+        "date": _partition_date(timestamp),
+        "timestamp": timestamp,
+        "mold_id": None if meta.get("mold_id") is None else str(meta["mold_id"]),
+        "quality_status": None if meta.get("quality_status") is None else str(meta["quality_status"]),
+    }
+    for key, value in bundle.process.items():
+        record[PROCESS_PREFIX + key] = value
+    for key, value in bundle.qc.items():
+        record[QC_PREFIX + key] = json.dumps(list(value or [])) if key == "defects" else value
+    return record
+
+
+def _sensor_columns(chunk: Sequence[LogBundle]) -> Dict[str, List[np.ndarray]]:
+    """Column-wise numpy pieces of all sensor samples in `chunk` (one concat per column later)."""
+
+    channels: List[str] = []
+    for bundle in chunk:
+        measured = bundle.measured
+        if measured is not None and "time_s" in measured.columns:
+            channels.extend(c for c in measured.columns if c != "time_s" and c not in channels)
+    pieces: Dict[str, List[np.ndarray]] = {name: [] for name in ("time_s", *channels)}
+    pieces["_row"] = []
+    for row, bundle in enumerate(chunk):
+        measured = bundle.measured
+        if measured is None or measured.empty or "time_s" not in measured.columns:
+            continue
+        size = len(measured)
+        pieces["_row"].append(np.full(size, row, dtype=np.int64))
+        for name in ("time_s", *channels):
+            if name in measured.columns:
+                pieces[name].append(measured[name].to_numpy(dtype=np.float64, na_value=np.nan))
+            else:
+                pieces[name].append(np.full(size, np.nan))
+    return pieces
+
+
+def _write_partitioned(frame: pd.DataFrame, base_dir: Path) -> None:
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    for name in (*METADATA_COLUMNS, QC_PREFIX + "defects"):
+        index = table.schema.get_field_index(name)
+        if index >= 0 and table.schema.field(index).type != pa.string():
+            table = table.set_column(index, name, table.column(index).cast(pa.string()))
+    pq.write_to_dataset(
+        table,
+        root_path=str(base_dir),
+        partition_cols=PARTITION_COLUMNS,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+    )
+
+
+def write_shot_store(bundles: Iterable[LogBundle], root: Path, rows_per_file: int = 10_000) -> int:
+    """
+    Append bundles to the shot store at `root`; returns the number of shots written.
+
+    Bundles are buffered `rows_per_file` at a time, so every flush writes one
+    Parquet file per (system_id, date) partition for shots and for sensors.
+    """
+
+    _require_pyarrow()
+    if rows_per_file <= 0:
+        raise ValueError("rows_per_file must be > 0")
+    root = Path(root)
+    written = 0
+    iterator = iter(bundles)
+    while True:
+        chunk = list(islice(iterator, rows_per_file))
+        if not chunk:
+            return written
+        records = [_bundle_to_record(bundle, offset) for offset, bundle in enumerate(chunk, start=written + 1)]
+        shots = pd.DataFrame.from_records(records)
+        _write_partitioned(shots, root / SHOTS_DIR)
+        pieces = _sensor_columns(chunk)
+        rows = pieces.pop("_row")
+        if rows:
+            owner = np.concatenate(rows)
+            sensors = {
+                "shot_id": shots["shot_id"].to_numpy()[owner],
+                **{name: np.concatenate(parts) for name, parts in pieces.items()},
+                "system_id": shots["system_id"].to_numpy()[owner],
+                "date": shots["date"].to_numpy()[owner],
+            }
+            _write_partitioned(pd.DataFrame(sensors), root / SENSORS_DIR)
+        written += len(chunk)
+
+
+class ShotStoreSource(ProcessLogSource):
+    """
+    `ProcessLogSource` over a shot store written by `write_shot_store`.
+
+    Shots are returned ordered by `shot_id` (like `SQLProcessLogSource`);
+    `batch_size` bounds how many shots' sensor samples are loaded per read.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        sensor_columns: Optional[Sequence[str]] = None,
+        batch_size: int = 5_000,
+    ) -> None:
+        _require_pyarrow()
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+        self.root = Path(root)
+        self.sensor_columns = list(sensor_columns) if sensor_columns else None
+        self.batch_size = batch_size
+        if not is_shot_store(self.root):
+            raise FileNotFoundError(f"No shot store found under '{self.root}'")
+
+    def close(self) -> None:
+        """No-op, kept for parity with `SQLProcessLogSource`."""
+
+    def _dataset(self, name: str):
+        path = str(self.root / name)
+        dataset = ds.dataset(path, format="parquet", partitioning=_partitioning())
+        # Files written by different flushes may carry different column sets
+        # (new process keys, all-null chunks); read them under one unified schema.
+        schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+        if len(schemas) <= 1:
+            return dataset
+        schema = pa.unify_schemas([*schemas, _partitioning().schema])
+        return ds.dataset(path, schema=schema, format="parquet", partitioning=_partitioning())
+
+    @staticmethod
+    def _filter(query: ProcessLogQuery, dataset) -> Optional[Any]:
+        names = set(dataset.schema.names)
+        parts = []
+        if query.system_id:
+            parts.append(ds.field("system_id") == str(query.system_id))
+        if query.start_time is not None:
+            parts.append(ds.field("date") >= query.start_time.date().isoformat())
+        if query.end_time is not None:
+            parts.append(ds.field("date") <= query.end_time.date().isoformat())
+        if "timestamp" in names:
+            if query.start_time is not None:
+                parts.append(ds.field("timestamp") >= query.start_time.isoformat())
+            if query.end_time is not None:
+                parts.append(ds.field("timestamp") < query.end_time.isoformat())
+        if query.mold_id:
+            parts.append(ds.field("mold_id") == str(query.mold_id))
+        if query.quality_status:
+            parts.append(ds.field("quality_status") == str(query.quality_status))
+        expression = None
+        for part in parts:
+            expression = part if expression is None else expression & part
+        return expression
+
+    def read_shots(self, query: Optional[ProcessLogQuery] = None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Shot-level table (one row per shot) matching `query`, ordered by shot_id.
+
+        `columns` projects the read to the listed columns (`shot_id` is always kept).
+        """
+
+        query = query or ProcessLogQuery()
+        dataset = self._dataset(SHOTS_DIR)
+        if columns is not None:
+            columns = ["shot_id", *[c for c in columns if c != "shot_id"]]
+        table = dataset.to_table(columns=columns, filter=self._filter(query, dataset))
+        frame = table.to_pandas().sort_values("shot_id", kind="stable").reset_index(drop=True)
+        start = max(query.offset, 0)
+        stop = None if query.limit is None else start + query.limit
+        return frame.iloc[start:stop].reset_index(drop=True)
+
+    def read_sensors(self, shot_ids: Sequence[str], query: Optional[ProcessLogQuery] = None) -> Dict[str, pd.DataFrame]:
+        """Sensor frames (`time_s` + channels) for `shot_ids`, loaded in one read."""
+
+        if not shot_ids or not (self.root / SENSORS_DIR).is_dir():
+            return {}
+        query = query or ProcessLogQuery()
+        dataset = self._dataset(SENSORS_DIR)
+        # Only partition filters apply here; row filters live on the shots table.
+        partition_query = ProcessLogQuery(
+            system_id=query.system_id, start_time=query.start_time, end_time=query.end_time
+        )
+        expression = ds.field("shot_id").isin(list(shot_ids))
+        partition_filter = self._filter(partition_query, dataset)
+        if partition_filter is not None:
+            expression = expression & partition_filter
+        columns = None
+        if self.sensor_columns:
+            columns = ["shot_id", "time_s", *[c for c in self.sensor_columns if c not in ("shot_id", "time_s")]]
+        table = dataset.to_table(columns=columns, filter=expression)
+        samples = table.to_pandas().drop(columns=PARTITION_COLUMNS, errors="ignore")
+        if samples.empty:
+            return {}
+        samples = samples.sort_values(["shot_id", "time_s"], kind="stable")
+        keys = samples["shot_id"].to_numpy()
+        # Slice plain numpy columns per shot; per-shot DataFrame.iloc dominates otherwise.
+        columns_np = {name: samples[name].to_numpy(dtype=np.float64) for name in samples.columns if name != "shot_id"}
+        bounds = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds, [len(keys)]))
+        frames: Dict[str, pd.DataFrame] = {}
+        for lo, hi in zip(starts, ends):
+            data = {name: values[lo:hi] for name, values in columns_np.items()}
+            # Channels a shot never recorded come back as all-NaN; drop them.
+            data = {name: values for name, values in data.items() if name == "time_s" or not np.isnan(values).all()}
+            frames[keys[lo]] = pd.DataFrame(data)
+        return frames
+
+    def fetch_shots(self, query: ProcessLogQuery) -> Iterator[LogBundle]:
+        shots = self.read_shots(query)
+        for start in range(0, len(shots), self.batch_size):
+            batch = shots.iloc[start : start + self.batch_size]
+            sensors = self.read_sensors(batch["shot_id"].tolist(), query)
+            for record in batch.to_dict(orient="records"):
+                yield _record_to_bundle(record, sensors.get(record["shot_id"]))
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _record_to_bundle(record: Dict[str, Any], measured: Optional[pd.DataFrame]) -> LogBundle:
+    process: Dict[str, Any] = {}
+    qc: Dict[str, Any] = {}
+    metadata: Dict[str, Any] = {}
+    for column, value in record.items():
+        if _is_missing(value):
+            continue
+        if column.startswith(PROCESS_PREFIX):
+            process[column[len(PROCESS_PREFIX) :]] = value
+        elif column.startswith(QC_PREFIX):
+            key = column[len(QC_PREFIX) :]
+            qc[key] = json.loads(value) if key == "defects" else value
+        elif column in METADATA_COLUMNS or column == "system_id":
+            metadata[column] = value
+    if metadata.get("system_id") == UNKNOWN_PARTITION:
+        metadata["system_id"] = None
+    if measured is None:
+        measured = pd.DataFrame()
+    return LogBundle(process=process, measured=measured, qc=qc, metadata=metadata)
@@ -0,0 +1,247 @@
+"""
+Simulation-as-feature: per-shot simulation summaries cached by input hash.
+
+Feature rows need the simulator's view of each shot (`sim_*` columns).
+`ShotSimulator` builds `ProcessConditions` from every shot's process log,
+runs the 0D model for it (optionally on a process pool; the solver is pure
+Python and CPU-bound) and reduces the result to a compact summary
+(`SIM_SUMMARY_KEYS`). Summaries are stored in a `SimulationCache` keyed by a
+hash of all simulation inputs (process, material system, mold, quality
+targets, solver config), so rebuilding a feature set only simulates new or
+changed shots.
+
+The cache is a directory of append-only part files (`part-*.parquet`, CSV
+without pyarrow); each `flush()` writes the entries added since the last one.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:  # pyarrow opcjonalne (czesci cache jako Parquet)
+    import pyarrow.parquet as pq  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    pq = None  # type: ignore
+
+from ..core import MVP0DSimulator, MoldProperties, ProcessConditions, QualityTargets, SimulationConfig
+from ..core.types import SimulationResult
+from ..material_db.models import MaterialSystem
+from .etl import LogBundle, process_conditions_from_bundle
+
+# Bump when the summary definition changes: old entries then stop matching.
+SUMMARY_VERSION = 1
+HASH_COLUMN = "input_hash"
+SIM_SUMMARY_KEYS = (
+    "T_core_max_K",
+    "T_core_t_at_max_s",
+    "p_max_Pa",
+    "p_t_at_max_s",
+    "rho_moulded",
+    "t_demold_min_s",
+    "t_demold_max_s",
+    "t_demold_opt_s",
+    "defect_risk",
+)
+# Series `summarize_result` reads; everything else is dropped from the simulated results.
+SUMMARY_CHANNELS = ["time_s", "T_core_K", "p_total_Pa"]
+_OUTPUT_OPTIONS = {"record", "output_every", "output_points"}
+
+
+def _max_with_time(values: Sequence[float], times: Sequence[float]) -> tuple[Optional[float], Optional[float]]:
+    arr = np.asarray(values, dtype=float)
+    if arr.size == 0 or np.isnan(arr).all():
+        return None, None
+    idx = int(np.nanargmax(arr))
+    return float(arr[idx]), float(times[idx]) if idx < len(times) else None
+
+
+def summarize_result(result: SimulationResult) -> Dict[str, Optional[float]]:
+    """Compact summary of a run; `compute_feature_row` accepts it in place of the full payload."""
+
+    T_max, T_t = _max_with_time(result.T_core_K, result.time_s)
+    p_max, p_t = _max_with_time(result.p_total_Pa, result.time_s)
+    return {
+        "T_core_max_K": T_max,
+        "T_core_t_at_max_s": T_t,
+        "p_max_Pa": p_max,
+        "p_t_at_max_s": p_t,
+        "rho_moulded": result.rho_moulded,
+        "t_demold_min_s": result.t_demold_min_s,
+        "t_demold_max_s": result.t_demold_max_s,
+        "t_demold_opt_s": result.t_demold_opt_s,
+        "defect_risk": result.defect_risk,
+    }
+
+
+def _digest(payload: Any) -> str:
+    text = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _clean(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+class SimulationCache:
+    """Summaries keyed by input hash, persisted as append-only part files under `root`."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._entries: Dict[str, Dict[str, Optional[float]]] = {}
+        self._pending: Dict[str, Dict[str, Optional[float]]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.root.is_dir():
+            return
+        for part in sorted(self.root.glob("part-*")):
+            if part.suffix == ".parquet" and pq is not None:
+                frame = pd.read_parquet(part)
+            elif part.suffix == ".csv":
+                frame = pd.read_csv(part)
+            else:
+                continue
+            columns = [c for c in SIM_SUMMARY_KEYS if c in frame.columns]
+            for key, values in zip(frame[HASH_COLUMN].astype(str), frame[columns].itertuples(index=False)):
+                self._entries[key] = {name: _clean(v) for name, v in zip(columns, values)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[Dict[str, Optional[float]]]:
+        return self._entries.get(key)
+
+    def put(self, key: str, summary: Dict[str, Optional[float]]) -> None:
+        self._entries[key] = summary
+        self._pending[key] = summary
+
+    def flush(self) -> Optional[Path]:
+        """Write entries added since the last flush as a new part file."""
+
+        if not self._pending:
+            return None
+        self.root.mkdir(parents=True, exist_ok=True)
+        frame = pd.DataFrame.from_records(
+            [{HASH_COLUMN: key, **summary} for key, summary in self._pending.items()],
+            columns=[HASH_COLUMN, *SIM_SUMMARY_KEYS],
+        )
+        frame[list(SIM_SUMMARY_KEYS)] = frame[list(SIM_SUMMARY_KEYS)].astype("float64")
+        suffix = ".parquet" if pq is not None else ".csv"
+        path = self.root / f"part-{time.time_ns()}-{os.getpid()}{suffix}"
+        tmp = path.with_name(path.name + ".tmp")
+        if pq is not None:
+            frame.to_parquet(tmp, index=False)
+        else:  # pragma: no cover - pyarrow missing
+            frame.to_csv(tmp, index=False)
+        tmp.replace(path)
+        self._pending.clear()
+        return path
+
+
+# Per-worker simulation setup (sent once per process via the pool initializer).
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(material, mold, quality, config) -> None:
+    _WORKER.update(material=material, mold=mold, quality=quality, simulator=MVP0DSimulator(config))
+
+
+def _simulate_summary(process: ProcessConditions) -> Dict[str, Optional[float]]:
+    result = _WORKER["simulator"].run(_WORKER["material"], process, _WORKER["mold"], _WORKER["quality"])
+    return summarize_result(result)
+
+
+class ShotSimulator:
+    """
+    Simulation summaries for log bundles: cached ones are reused, the rest are
+    simulated (`workers > 1`: on a process pool) and added to the cache.
+    """
+
+    def __init__(
+        self,
+        material: MaterialSystem,
+        mold: MoldProperties,
+        quality: Optional[QualityTargets] = None,
+        config: Optional[SimulationConfig] = None,
+        cache: Optional[SimulationCache] = None,
+        workers: int = 1,
+    ) -> None:
+        self.material = material
+        self.mold = mold
+        self.quality = quality or QualityTargets()
+        self.config = (config or SimulationConfig()).model_copy(
+            update={"record": SUMMARY_CHANNELS, "output_every": 1, "output_points": None}
+        )
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.simulated = 0
+        self.reused = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._context_hash = _digest(
+            {
+                "version": SUMMARY_VERSION,
+                "material": dataclasses.asdict(material),
+                "mold": mold.model_dump(),
+                "quality": self.quality.model_dump(),
+                "config": self.config.model_dump(exclude=_OUTPUT_OPTIONS),
+            }
+        )
+
+    def input_hash(self, process: ProcessConditions) -> str:
+        return _digest({"context": self._context_hash, "process": process.model_dump()})
+
+    def _run(self, processes: List[ProcessConditions]) -> List[Dict[str, Optional[float]]]:
+        if self.workers == 1 or len(processes) == 1:
+            simulator = MVP0DSimulator(self.config)
+            return [
+                summarize_result(simulator.run(self.material, process, self.mold, self.quality))
+                for process in processes
+            ]
+        if self._pool is None:
+            initargs = (self.material, self.mold, self.quality, self.config)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=initargs)
+        chunksize = max(1, len(processes) // (4 * self.workers))
+        return list(self._pool.map(_simulate_summary, processes, chunksize=chunksize))
+
+    def summaries(self, bundles: Iterable[LogBundle]) -> List[Dict[str, Optional[float]]]:
+        """One summary per bundle; identical inputs within a call are simulated once."""
+
+        keys: List[str] = []
+        missing: Dict[str, ProcessConditions] = {}
+        for bundle in bundles:
+            process = process_conditions_from_bundle(bundle)
+            key = self.input_hash(process)
+            keys.append(key)
+            if (self.cache is None or key not in self.cache) and key not in missing:
+                missing[key] = process
+
+        computed = dict(zip(missing, self._run(list(missing.values())))) if missing else {}
+        self.simulated += len(computed)
+        self.reused += len(keys) - len(computed)
+        if self.cache is not None:
+            for key, summary in computed.items():
+                self.cache.put(key, summary)
+            self.cache.flush()
+            return [computed.get(key) or self.cache.get(key) for key in keys]
+        return [computed[key] for key in keys]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
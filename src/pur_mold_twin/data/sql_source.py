@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import json
+import queue
+import re
 import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 from ruamel.yaml import YAML
 
@@ -13,13 +18,88 @@ from .etl import LogBundle
 from .interfaces import ProcessLogQuery, ProcessLogSource
 
 
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# Stay well below SQLite's bound-parameter limit for `IN (...)` lists.
+_MAX_IN_PARAMS = 500
+
+
 @dataclass
 class SQLSourceConfig:
-    """Configuration for SQL-based log source."""
+    """
+    Configuration for SQL-based log source.
+
+    Column names map `ProcessLogQuery` filters onto the table; a filter is only
+    rendered into SQL when the corresponding query field is set, so tables
+    without e.g. a mold column keep working.
+
+    `sensor_table` (optional) points at a long-format samples table with one
+    row per (shot, time): `key_column`, `time_s` and one column per channel
+    (`T_core_C`, `p_total_bar`, ... as in `data.etl.load_log_bundle`).
+    `sensor_columns` restricts the channels that are loaded.
+    """
 
     driver: str
     dsn: str
     table: str
+    key_column: str = "shot_id"
+    time_column: str = "timestamp"
+    mold_column: str = "mold_id"
+    quality_column: str = "quality_status"
+    page_size: int = 1000
+    fetch_size: int = 256
+    pool_size: int = 2
+    sensor_table: Optional[str] = None
+    sensor_columns: Optional[List[str]] = None
+
+    def __post_init__(self) -> None:
+        names = [self.table, self.key_column, self.time_column, self.mold_column, self.quality_column]
+        if self.sensor_table is not None:
+            names.append(self.sensor_table)
+        names.extend(self.sensor_columns or [])
+        for name in names:
+            if not _IDENTIFIER_RE.match(name):
+                raise ValueError(f"Invalid SQL identifier '{name}' in SQL source config")
+        if self.page_size <= 0 or self.fetch_size <= 0 or self.pool_size <= 0:
+            raise ValueError("page_size, fetch_size and pool_size must be > 0")
+
+
+class _ConnectionPool:
+    """Tiny thread-safe pool reusing DB-API connections between fetch calls."""
+
+    def __init__(self, factory, max_size: int) -> None:
+        self._factory = factory
+        self._idle: "queue.LifoQueue" = queue.LifoQueue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._factory()
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                keep = not self._closed
+            if keep:
+                try:
+                    self._idle.put_nowait(conn)
+                    conn = None
+                except queue.Full:
+                    pass
+            if conn is not None:
+                conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
 
 
 class SQLProcessLogSource(ProcessLogSource):
@@ -29,41 +109,159 @@ class SQLProcessLogSource(ProcessLogSource):
     Current implementation focuses on SQLite for tests and local development.
     Other drivers can reuse the same contract by providing a DB-API compatible
     connection for the configured DSN.
+
+    Rows are streamed with keyset pagination (`key_column > last_key ORDER BY
+    key_column LIMIT page_size`) and read in `fetchmany` batches, so memory
+    stays bounded for arbitrarily large tables. All `ProcessLogQuery` filters
+    are evaluated in SQL; see `recommended_index_statements` for the matching
+    indexes. Connections are reused through a small pool; call `close()` when
+    the source is no longer needed.
     """
 
     def __init__(self, config: SQLSourceConfig) -> None:
         self.config = config
+        self._pool = _ConnectionPool(self._connect, config.pool_size)
 
     def _connect(self):
         if self.config.driver == "sqlite":
-            return sqlite3.connect(self.config.dsn)
+            conn = sqlite3.connect(self.config.dsn, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            return conn
         raise RuntimeError(f"Unsupported SQL driver '{self.config.driver}'")
 
-    def fetch_shots(self, query: ProcessLogQuery) -> Iterable[LogBundle]:
-        conn = self._connect()
-        try:
-            conn.row_factory = sqlite3.Row
-            sql = f"SELECT * FROM {self.config.table}"
-            params: list = []
-            # Basic filters (start_time/end_time/system_id) are optional; for now we only
-            # support system_id as an example.
-            where_clauses = []
-            if query.system_id:
-                where_clauses.append("system_id = ?")
-                params.append(query.system_id)
-            if where_clauses:
-                sql += " WHERE " + " AND ".join(where_clauses)
-            if query.limit is not None:
-                sql += " LIMIT ? OFFSET ?"
-                params.extend([query.limit, query.offset])
+    def close(self) -> None:
+        self._pool.close()
+
+    def recommended_index_statements(self) -> List[str]:
+        """DDL for indexes backing the keyset pagination and query filters."""
+
+        cfg = self.config
+        statements = [
+            f"CREATE INDEX IF NOT EXISTS idx_{cfg.table}_{column} ON {cfg.table} ({column}, {cfg.key_column})"
+            for column in ("system_id", cfg.time_column, cfg.mold_column, cfg.quality_column)
+        ]
+        if cfg.sensor_table:
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS idx_{cfg.sensor_table}_{cfg.key_column}_time "
+                f"ON {cfg.sensor_table} ({cfg.key_column}, time_s)"
+            )
+        return statements
+
+    def _where_clauses(self, query: ProcessLogQuery) -> tuple[List[str], list]:
+        cfg = self.config
+        clauses: List[str] = []
+        params: list = []
+        if query.system_id:
+            clauses.append("system_id = ?")
+            params.append(query.system_id)
+        if query.mold_id:
+            clauses.append(f"{cfg.mold_column} = ?")
+            params.append(query.mold_id)
+        if query.quality_status:
+            clauses.append(f"{cfg.quality_column} = ?")
+            params.append(query.quality_status)
+        if query.start_time is not None:
+            clauses.append(f"{cfg.time_column} >= ?")
+            params.append(query.start_time.isoformat())
+        if query.end_time is not None:
+            clauses.append(f"{cfg.time_column} < ?")
+            params.append(query.end_time.isoformat())
+        return clauses, params
+
+    def _iter_pages(self, conn, query: ProcessLogQuery) -> Iterator[List[sqlite3.Row]]:
+        cfg = self.config
+        base_clauses, base_params = self._where_clauses(query)
+        remaining = query.limit
+        offset = max(query.offset, 0)
+        last_key = None
+
+        while remaining is None or remaining > 0:
+            clauses = list(base_clauses)
+            params = list(base_params)
+            if last_key is not None:
+                clauses.append(f"{cfg.key_column} > ?")
+                params.append(last_key)
+            page_limit = cfg.page_size if remaining is None else min(cfg.page_size, remaining)
+            sql = f"SELECT * FROM {cfg.table}"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            sql += f" ORDER BY {cfg.key_column} LIMIT ?"
+            params.append(page_limit)
+            if offset:  # query.offset applies once, to the first page
+                sql += " OFFSET ?"
+                params.append(offset)
+                offset = 0
 
             cursor = conn.execute(sql, params)
-            for row in cursor.fetchall():
-                yield self._row_to_bundle(row)
-        finally:
-            conn.close()
+            page: List[sqlite3.Row] = []
+            try:
+                while True:
+                    batch = cursor.fetchmany(cfg.fetch_size)
+                    if not batch:
+                        break
+                    page.extend(batch)
+            finally:
+                cursor.close()
+
+            if page:
+                last_key = page[-1][cfg.key_column]
+                yield page
+            if remaining is not None:
+                remaining -= len(page)
+            if len(page) < page_limit:
+                return
 
-    def _row_to_bundle(self, row: sqlite3.Row) -> LogBundle:
+    def iter_rows(self, query: ProcessLogQuery) -> Iterator[sqlite3.Row]:
+        """Stream raw rows matching `query` page by page."""
+
+        with self._pool.connection() as conn:
+            for page in self._iter_pages(conn, query):
+                yield from page
+
+    def fetch_shots(self, query: ProcessLogQuery) -> Iterable[LogBundle]:
+        key = self.config.key_column
+        with self._pool.connection() as conn:
+            for page in self._iter_pages(conn, query):
+                sensors: Dict[object, pd.DataFrame] = {}
+                if self.config.sensor_table:
+                    sensors = self._fetch_sensor_frames(conn, [row[key] for row in page])
+                for row in page:
+                    yield self._row_to_bundle(row, measured=sensors.get(row[key]))
+
+    def _fetch_sensor_frames(self, conn, shot_keys: Sequence[object]) -> Dict[object, pd.DataFrame]:
+        """
+        Bulk-load sensor samples for a page of shots and split them per shot.
+
+        One `IN (...)` query per `_MAX_IN_PARAMS` keys, ordered by (key, time_s),
+        then a single pass over the key boundaries builds the per-shot frames.
+        """
+
+        cfg = self.config
+        key = cfg.key_column
+        columns = "*"
+        if cfg.sensor_columns:
+            columns = ", ".join([key, "time_s", *[c for c in cfg.sensor_columns if c not in (key, "time_s")]])
+        frames: Dict[object, pd.DataFrame] = {}
+        for start in range(0, len(shot_keys), _MAX_IN_PARAMS):
+            chunk = list(shot_keys[start : start + _MAX_IN_PARAMS])
+            placeholders = ", ".join("?" * len(chunk))
+            sql = (
+                f"SELECT {columns} FROM {cfg.sensor_table} WHERE {key} IN ({placeholders}) "
+                f"ORDER BY {key}, time_s"
+            )
+            samples = pd.read_sql_query(sql, conn, params=chunk)
+            if samples.empty:
+                continue
+            keys = samples[key].to_numpy()
+            data = samples.drop(columns=[key])
+            bounds = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+            starts = np.concatenate(([0], bounds))
+            ends = np.concatenate((bounds, [len(keys)]))
+            for lo, hi in zip(starts, ends):
+                frames[keys[lo]] = data.iloc[lo:hi].reset_index(drop=True)
+        return frames
+
+    def _row_to_bundle(self, row: sqlite3.Row, measured: Optional[pd.DataFrame] = None) -> LogBundle:
         process = {
             "m_polyol": row["m_polyol"],
             "m_iso": row["m_iso"],
@@ -83,21 +281,41 @@ class SQLProcessLogSource(ProcessLogSource):
             "defects": json.loads(row["defects"]) if row["defects"] else [],
         }
         metadata = {
-            "shot_id": row["shot_id"],
+            "shot_id": row[self.config.key_column],
             "system_id": row["system_id"],
         }
-        measured = pd.DataFrame()  # timeseries can be added in future iterations
+        columns = row.keys()
+        for column in (self.config.time_column, self.config.mold_column, self.config.quality_column):
+            if column in columns and row[column] is not None:
+                metadata[column] = row[column]
+        if measured is None:
+            measured = pd.DataFrame()
         return LogBundle(process=process, measured=measured, qc=qc, metadata=metadata)
 
 
 def load_sql_source_from_yaml(path: Path) -> SQLProcessLogSource:
     yaml = YAML(typ="safe")
-    data = yaml.load(path.read_text(encoding="utf-8")) or {}
+    with path.open("r", encoding="utf-8") as handle:
+        data = yaml.load(handle) or {}
     driver = data.get("driver", "sqlite")
     dsn = str(data.get("dsn") or data.get("database") or "")
     table = data.get("table", "process_logs")
     if not dsn:
         raise ValueError(f"Missing DSN/database in SQL source config '{path}'")
-    config = SQLSourceConfig(driver=driver, dsn=dsn, table=table)
+    optional = {
+        key: data[key]
+        for key in (
+            "key_column",
+            "time_column",
+            "mold_column",
+            "quality_column",
+            "page_size",
+            "fetch_size",
+            "pool_size",
+            "sensor_table",
+            "sensor_columns",
+        )
+        if key in data
+    }
+    config = SQLSourceConfig(driver=driver, dsn=dsn, table=table, **optional)
     return SQLProcessLogSource(config)
-
@@ -0,0 +1,234 @@
+"""
+Compact binary storage for `SimulationLog`.
+
+A run is encoded as an NPZ archive: one float64 array per time series
+(`time_s`, `T_core_K`, ...) plus a small JSON header member holding the
+metadata, inputs and the scalar result fields. Compared with indented JSON
+the series are stored as raw doubles, so logs are several times smaller and
+are written/parsed without any text conversion.
+
+Compression (`compression=`):
+- `None`: plain NPZ (members can be read individually without decoding the rest),
+- `"gzip"`: DEFLATE (gzip's algorithm) inside the NPZ, no extra dependency,
+- `"zstd"`: the whole NPZ compressed with zstd (needs pyarrow).
+
+Many runs can be appended to one segment file (`SimulationLogSegment`): each
+record is a length-prefixed run blob, and a `<segment>.index.jsonl` sidecar
+stores one line per run (run_id, offset, length, metadata). Appends never
+rewrite existing bytes; the index line is written after the data, so a crash
+leaves at most an unindexed tail. Reading a run seeks straight to its record.
+
+Decoded payloads are lazy (`LazySimulationPayload`): a series is only
+materialized when it is accessed.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import struct
+import threading
+import uuid
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Literal, Optional
+
+import numpy as np
+
+try:  # pyarrow opcjonalne (kodek zstd)
+    import pyarrow as pa  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    pa = None  # type: ignore
+
+from .logger import SimulationLog
+
+
+Compression = Optional[Literal["gzip", "zstd"]]
+
+FORMAT_NAME = "pur-mold-twin/simulation-log"
+FORMAT_VERSION = 1
+BINARY_SUFFIX = ".npz"
+SEGMENT_SUFFIX = ".simseg"
+HEADER_MEMBER = "__header__"
+_ZSTD_MAGIC = b"PMTZ"
+_LENGTH = struct.Struct("<Q")
+
+
+def _as_series(value: Any) -> Optional[np.ndarray]:
+    """float64 array for a non-empty numeric sequence, else None (kept in the JSON header)."""
+
+    if not isinstance(value, (list, tuple, np.ndarray)) or len(value) == 0:
+        return None
+    try:
+        array = np.asarray(value)
+    except ValueError:  # ragged
+        return None
+    if array.ndim != 1 or array.dtype.kind not in "iuf":
+        return None
+    return array.astype(np.float64, copy=False)
+
+
+def encode_simulation_log(log: SimulationLog, compression: Compression = None) -> bytes:
+    """Serialize one run to bytes (NPZ, optionally zstd-wrapped)."""
+
+    if compression not in (None, "gzip", "zstd"):
+        raise ValueError(f"Unknown compression '{compression}' (expected None, 'gzip' or 'zstd')")
+    arrays: Dict[str, np.ndarray] = {}
+    scalars: Dict[str, Any] = {}
+    for key, value in log.simulation.items():
+        series = _as_series(value)
+        if series is None:
+            scalars[key] = value
+        else:
+            arrays[key] = series
+    header = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "metadata": log.metadata,
+        "inputs": log.inputs,
+        "scalars": scalars,
+        "series": list(arrays),
+    }
+    arrays[HEADER_MEMBER] = np.frombuffer(json.dumps(header, default=str).encode("utf-8"), dtype=np.uint8)
+
+    buffer = io.BytesIO()
+    (np.savez_compressed if compression == "gzip" else np.savez)(buffer, **arrays)
+    data = buffer.getvalue()
+    if compression == "zstd":
+        if pa is None:
+            raise ImportError("zstd compression requires pyarrow; install with pur-mold-twin[ml]")
+        data = _ZSTD_MAGIC + _LENGTH.pack(len(data)) + pa.compress(data, codec="zstd", asbytes=True)
+    return data
+
+
+class LazySimulationPayload(Mapping):
+    """Read-only `SimulationResult.to_dict()`-like mapping; series are loaded on first access."""
+
+    def __init__(self, archive: "np.lib.npyio.NpzFile", scalars: Dict[str, Any], series: List[str]) -> None:
+        self._archive = archive
+        self._scalars = scalars
+        self._series = series
+        self._loaded: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._scalars:
+            return self._scalars[key]
+        if key not in self._series:
+            raise KeyError(key)
+        values = self._loaded.get(key)
+        if values is None:
+            with self._lock:  # NpzFile members share one underlying file object
+                values = self._loaded[key] = self._archive[key]
+        return values
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._series
+        yield from self._scalars
+
+    def __len__(self) -> int:
+        return len(self._series) + len(self._scalars)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fully materialized plain dict (series as lists), e.g. for `SimulationResult(**...)`."""
+
+        return {key: (value.tolist() if isinstance(value, np.ndarray) else value) for key, value in self.items()}
+
+
+def decode_simulation_log(data: bytes) -> SimulationLog:
+    """Inverse of `encode_simulation_log`; the simulation payload is a `LazySimulationPayload`."""
+
+    if data[:4] == _ZSTD_MAGIC:
+        if pa is None:
+            raise ImportError("Reading zstd-compressed logs requires pyarrow")
+        (size,) = _LENGTH.unpack_from(data, 4)
+        data = pa.decompress(data[4 + _LENGTH.size :], decompressed_size=size, codec="zstd", asbytes=True)
+    archive = np.load(io.BytesIO(data), allow_pickle=False)
+    header = json.loads(archive[HEADER_MEMBER].tobytes().decode("utf-8"))
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError("Not a binary simulation log")
+    if header.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported simulation log version {header.get('version')}")
+    simulation = LazySimulationPayload(archive, header.get("scalars", {}), header.get("series", []))
+    return SimulationLog(simulation=simulation, metadata=header.get("metadata", {}), inputs=header.get("inputs", {}))
+
+
+def write_binary_log(log: SimulationLog, path: Path, compression: Compression = None) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(encode_simulation_log(log, compression))
+    tmp.replace(path)
+    return path
+
+
+def read_binary_log(path: Path) -> SimulationLog:
+    return decode_simulation_log(path.read_bytes())
+
+
+class SimulationLogSegment:
+    """Append-only file of many binary runs with a JSON-lines index sidecar."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".index.jsonl")
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if self.index_path.exists():
+            with self.index_path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["run_id"]] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, run_id: str) -> bool:
+        return run_id in self._entries
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Index entries in append order (`run_id`, `offset`, `length`, `metadata`)."""
+
+        return list(self._entries.values())
+
+    def append(self, log: SimulationLog, run_id: Optional[str] = None, compression: Compression = None) -> str:
+        """Append one run; `run_id` defaults to `metadata["shot_id"]` or a random id."""
+
+        run_id = str(run_id or log.metadata.get("shot_id") or uuid.uuid4().hex)
+        blob = encode_simulation_log(log, compression)
+        with self._lock:
+            if run_id in self._entries:
+                raise ValueError(f"Run '{run_id}' already stored in {self.path}")
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as handle:
+                offset = handle.tell()
+                handle.write(_LENGTH.pack(len(blob)))
+                handle.write(blob)
+            entry = {
+                "run_id": run_id,
+                "offset": offset + _LENGTH.size,
+                "length": len(blob),
+                "metadata": log.metadata,
+            }
+            with self.index_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, default=str) + "\n")
+            self._entries[run_id] = entry
+        return run_id
+
+    def read(self, run_id: str) -> SimulationLog:
+        entry = self._entries.get(run_id)
+        if entry is None:
+            raise KeyError(f"Run '{run_id}' not found in {self.path}")
+        with self.path.open("rb") as handle:
+            handle.seek(entry["offset"])
+            data = handle.read(entry["length"])
+        return decode_simulation_log(data)
+
+    def find(self, **metadata: Any) -> List[str]:
+        """Run ids whose metadata matches all given key/value pairs (index only, no data read)."""
+
+        return [
+            run_id
+            for run_id, entry in self._entries.items()
+            if all(entry["metadata"].get(key) == value for key, value in metadata.items())
+        ]
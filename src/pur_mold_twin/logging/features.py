@@ -1,17 +1,28 @@
 """
 Feature engineering for simulation + measurement logs.
+
+`compute_basic_features` works on a single shot; `compute_basic_features_batch`
+produces the same columns for many shots at once from a long-format
+measurement frame and stacked simulation arrays (groupby reductions and
+closed-form least-squares slopes instead of per-shot `np.polyfit`).
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional, Sequence
 
 import numpy as np
 import pandas as pd
 
 
-def _max_with_time(values: list[float], times: list[float]) -> tuple[Optional[float], Optional[float]]:
-    if not values or not times:
+def _series(sim: Mapping[str, Any], key: str) -> Sequence[float]:
+    # Payload series are lists (JSON) or numpy arrays (lazy binary logs).
+    values = sim.get(key)
+    return [] if values is None else values
+
+
+def _max_with_time(values: Sequence[float], times: Sequence[float]) -> tuple[Optional[float], Optional[float]]:
+    if len(values) == 0 or len(times) == 0:
         return None, None
     arr = np.asarray(values, dtype=float)
     idx = int(np.nanargmax(arr))
@@ -47,12 +58,30 @@ def compute_basic_features(
     Names mirror docs/ML_LOGGING.md to keep schema stable.
     """
 
-    sim_time = sim.get("time_s", []) or []
-    sim_T_core = sim.get("T_core_K", []) or []
-    sim_p_total = sim.get("p_total_Pa", []) or []
+    return pd.DataFrame([compute_feature_row(sim, measured, qc=qc, process=process)])
+
+
+def compute_feature_row(
+    sim: Mapping[str, Any],
+    measured: Optional[pd.DataFrame] = None,
+    qc: Optional[Dict[str, Any]] = None,
+    process: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Same features as `compute_basic_features`, returned as a plain dict.
+
+    Used by streaming/batch builders that collect many rows before creating a
+    single DataFrame (or Arrow table) per chunk. `sim` is either a full
+    SimulationResult payload or a cached summary (`T_core_max_K`, ...).
+    """
 
-    sim_T_max_K, sim_T_t_at_max_s = _max_with_time(sim_T_core, sim_time)
-    sim_p_max_Pa, sim_p_t_at_max_s = _max_with_time(sim_p_total, sim_time)
+    if "T_core_max_K" in sim:  # compact summary (data.sim_cache.summarize_result)
+        sim_T_max_K, sim_T_t_at_max_s = sim.get("T_core_max_K"), sim.get("T_core_t_at_max_s")
+        sim_p_max_Pa, sim_p_t_at_max_s = sim.get("p_max_Pa"), sim.get("p_t_at_max_s")
+    else:
+        sim_time = _series(sim, "time_s")
+        sim_T_max_K, sim_T_t_at_max_s = _max_with_time(_series(sim, "T_core_K"), sim_time)
+        sim_p_max_Pa, sim_p_t_at_max_s = _max_with_time(_series(sim, "p_total_Pa"), sim_time)
 
     features: Dict[str, Any] = {
         "sim_T_core_max_C": (sim_T_max_K - 273.15) if sim_T_max_K is not None else None,
@@ -95,8 +124,8 @@ def compute_basic_features(
         features["qc_rho_moulded"] = qc.get("rho_moulded")
         features["qc_H_demold"] = qc.get("H_demold")
         features["qc_H_24h"] = qc.get("H_24h")
-        defects = qc.get("defects") or []
-        features["any_defect"] = int(bool(defects))
+        if "defects" in qc:  # no defects record -> label stays unset (not "no defect")
+            features["any_defect"] = int(bool(qc["defects"] or []))
         if qc.get("defect_risk_operator") is not None:
             features["defect_risk"] = qc.get("defect_risk_operator")
         elif qc.get("defect_risk") is not None:
@@ -111,4 +140,189 @@ def compute_basic_features(
         if process.get("t_demold_actual_s") and features.get("sim_t_demold_opt_s") is not None:
             features["delta_t_demold_s"] = process["t_demold_actual_s"] - features["sim_t_demold_opt_s"]
 
-    return pd.DataFrame([features])
+    return features
+
+
+# Measurement windows shared by the single-shot and batch variants
+# (T_core avg/slope use 0-120 s, pressure slope uses 0-60 s).
+T_CORE_WINDOW_S = 120.0
+PRESSURE_WINDOW_S = 60.0
+SIM_SCALAR_KEYS = ("rho_moulded", "t_demold_opt_s", "defect_risk")
+
+
+def stack_simulations(payloads: Sequence[Dict[str, Any]], shot_ids: Sequence[Any]) -> Dict[str, np.ndarray]:
+    """
+    Stack per-shot simulation dicts into 2-D arrays for `compute_basic_features_batch`.
+
+    Series of different lengths are right-padded with NaN.
+    """
+
+    n_shots = len(payloads)
+    n_steps = max((len(_series(p, "time_s")) for p in payloads), default=0)
+    stack: Dict[str, np.ndarray] = {"shot_id": np.asarray(list(shot_ids), dtype=object)}
+    for key in ("time_s", "T_core_K", "p_total_Pa"):
+        arr = np.full((n_shots, n_steps), np.nan)
+        for row, payload in enumerate(payloads):
+            values = _series(payload, key)
+            arr[row, : len(values)] = values
+        stack[key] = arr
+    for key in SIM_SCALAR_KEYS:
+        stack[key] = np.array(
+            [np.nan if p.get(key) is None else float(p[key]) for p in payloads], dtype=float
+        )
+    return stack
+
+
+def _rowwise_max_with_time(values: np.ndarray, times: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    n_rows = values.shape[0]
+    if values.size == 0:
+        return np.full(n_rows, np.nan), np.full(n_rows, np.nan)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, -np.inf)
+    idx = np.argmax(filled, axis=1)
+    rows = np.arange(n_rows)
+    has_any = valid.any(axis=1)
+    vmax = np.where(has_any, filled[rows, idx], np.nan)
+    t_at = np.where(has_any, times[rows, idx], np.nan)
+    return vmax, t_at
+
+
+def _segment_max_with_time(frame: pd.DataFrame, column: str) -> pd.DataFrame:
+    data = frame[["shot_id", "time_s", column]].dropna(subset=[column]).reset_index(drop=True)
+    if data.empty:
+        return pd.DataFrame(columns=["max", "t_at_max"], dtype=float)
+    # first occurrence of the maximum (matches idxmax on a per-shot frame)
+    idx = data.groupby("shot_id", sort=False)[column].idxmax()
+    out = pd.DataFrame(
+        {
+            "max": data.loc[idx.values, column].to_numpy(dtype=float),
+            "t_at_max": data.loc[idx.values, "time_s"].to_numpy(dtype=float),
+        },
+        index=idx.index,
+    )
+    return out
+
+
+def _segment_window_stats(frame: pd.DataFrame, column: str, upper_s: float) -> pd.DataFrame:
+    """Per-shot mean and least-squares slope of `column` vs time for time <= upper_s."""
+
+    data = frame.loc[frame["time_s"] <= upper_s, ["shot_id", "time_s", column]].dropna()
+    if data.empty:
+        return pd.DataFrame(columns=["mean", "slope"], dtype=float)
+    x = data["time_s"].to_numpy(dtype=float)
+    y = data[column].to_numpy(dtype=float)
+    sums = (
+        pd.DataFrame({"shot_id": data["shot_id"].to_numpy(), "n": 1.0, "x": x, "y": y, "xx": x * x, "xy": x * y})
+        .groupby("shot_id", sort=False)
+        .sum()
+    )
+    n = sums["n"].to_numpy()
+    sx, sy = sums["x"].to_numpy(), sums["y"].to_numpy()
+    # Closed-form OLS: slope = cov(x, y) / var(x), computed from centred sums.
+    sxx = sums["xx"].to_numpy() - sx * sx / n
+    sxy = sums["xy"].to_numpy() - sx * sy / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where((n > 1) & (sxx > 0), sxy / sxx, np.nan)
+    return pd.DataFrame({"mean": sy / n, "slope": slope}, index=sums.index)
+
+
+def compute_basic_features_batch(
+    sims: Mapping[str, Any],
+    measured: Optional[pd.DataFrame] = None,
+    qc: Optional[pd.DataFrame] = None,
+    process: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Vectorized multi-shot variant of `compute_basic_features`.
+
+    Args:
+        sims: stacked simulation arrays (see `stack_simulations`): `shot_id` (n,),
+            `time_s`/`T_core_K`/`p_total_Pa` as (n, steps) or shared (steps,) time,
+            optional scalars `rho_moulded`, `t_demold_opt_s`, `defect_risk` (n,).
+        measured: long-format frame with `shot_id`, `time_s`, `T_core_C`, `p_total_bar`.
+        qc: optional frame indexed by shot_id (columns as in qc.yaml).
+        process: optional frame indexed by shot_id (columns as in process.yaml).
+    Returns:
+        One row per shot (order of `sims["shot_id"]`), missing values as NaN.
+    """
+
+    shot_ids = pd.Index(np.asarray(sims["shot_id"]), name="shot_id")
+    n_shots = len(shot_ids)
+
+    def _matrix(key: str) -> np.ndarray:
+        values = sims.get(key)
+        if values is None:
+            return np.full((n_shots, 0), np.nan)
+        arr = np.asarray(values, dtype=float)
+        if arr.ndim == 1:
+            arr = np.broadcast_to(arr, (n_shots, arr.shape[0]))
+        return arr
+
+    times = _matrix("time_s")
+    T_max_K, T_t_at_max = _rowwise_max_with_time(_matrix("T_core_K"), times)
+    p_max_Pa, p_t_at_max = _rowwise_max_with_time(_matrix("p_total_Pa"), times)
+
+    features = pd.DataFrame(index=shot_ids)
+    features["sim_T_core_max_C"] = T_max_K - 273.15
+    features["sim_T_core_t_at_max_s"] = T_t_at_max
+    features["sim_p_max_bar"] = p_max_Pa / 100_000.0
+    features["sim_p_t_at_max_s"] = p_t_at_max
+    for key in SIM_SCALAR_KEYS:
+        values = sims.get(key)
+        features[f"sim_{key}"] = np.nan if values is None else np.asarray(values, dtype=float)
+
+    if measured is not None and not measured.empty and {"shot_id", "time_s"}.issubset(measured.columns):
+        if "T_core_C" in measured.columns:
+            peak = _segment_max_with_time(measured, "T_core_C").reindex(shot_ids)
+            window = _segment_window_stats(measured, "T_core_C", T_CORE_WINDOW_S).reindex(shot_ids)
+            features["meas_T_core_max_C"] = peak["max"].to_numpy()
+            features["meas_T_core_t_at_max_s"] = peak["t_at_max"].to_numpy()
+            features["meas_T_core_avg_0_120_C"] = window["mean"].to_numpy()
+            features["meas_T_core_slope_0_60_C_per_s"] = window["slope"].to_numpy()
+            features["delta_T_core_max_C"] = features["meas_T_core_max_C"] - features["sim_T_core_max_C"]
+        if "p_total_bar" in measured.columns:
+            peak = _segment_max_with_time(measured, "p_total_bar").reindex(shot_ids)
+            window = _segment_window_stats(measured, "p_total_bar", PRESSURE_WINDOW_S).reindex(shot_ids)
+            features["meas_p_max_bar"] = peak["max"].to_numpy()
+            features["meas_p_t_at_max_s"] = peak["t_at_max"].to_numpy()
+            features["meas_p_slope_0_60_bar_per_s"] = window["slope"].to_numpy()
+            features["delta_p_max_bar"] = features["meas_p_max_bar"] - features["sim_p_max_bar"]
+
+    if qc is not None and not qc.empty:
+        has_qc = shot_ids.isin(qc.index)
+        qc = qc.reindex(shot_ids)
+        for src, dst in (("rho_moulded", "qc_rho_moulded"), ("H_demold", "qc_H_demold"), ("H_24h", "qc_H_24h")):
+            features[dst] = pd.to_numeric(qc[src], errors="coerce").to_numpy() if src in qc.columns else np.nan
+        # Shots without a QC row or a defects record get no label (NaN), as in the single-shot path.
+        if "defects" in qc.columns:
+            features["any_defect"] = [
+                float(_has_defects(d)) if present else np.nan for d, present in zip(qc["defects"], has_qc)
+            ]
+        else:
+            features["any_defect"] = np.nan
+        risk = pd.Series(np.nan, index=shot_ids)
+        if "defect_risk" in qc.columns:
+            risk = pd.to_numeric(qc["defect_risk"], errors="coerce")
+        if "defect_risk_operator" in qc.columns:
+            risk = pd.to_numeric(qc["defect_risk_operator"], errors="coerce").fillna(risk)
+        features["defect_risk"] = risk.to_numpy()
+
+    if process is not None and not process.empty:
+        process = process.reindex(shot_ids)
+        for key in ("T_polyol_in_C", "T_iso_in_C", "T_mold_init_C", "RH_ambient", "mixing_eff"):
+            features[f"proc_{key}"] = pd.to_numeric(process[key], errors="coerce").to_numpy() if key in process.columns else np.nan
+        if "t_demold_actual_s" in process.columns:
+            actual = pd.to_numeric(process["t_demold_actual_s"], errors="coerce").to_numpy()
+            actual = np.where(actual == 0, np.nan, actual)
+            features["delta_t_demold_s"] = actual - features["sim_t_demold_opt_s"].to_numpy()
+
+    return features.reset_index()
+
+
+def _has_defects(value: Any) -> bool:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return False
+    try:
+        return len(value) > 0
+    except TypeError:
+        return bool(value)
@@ -3,6 +3,8 @@ Simulation logging helpers.
 
 Provides a thin, serializable wrapper around `SimulationResult` that can be
 stored alongside metadata/inputs for later ETL and feature extraction.
+Logs are written as JSON (`.json`) or in the compact binary format (`.npz`,
+see `logging.binary_log`).
 """
 
 from __future__ import annotations
@@ -10,8 +12,9 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
+from ..core.serialization import dumps_json, result_to_dict
 from ..core.types import SimulationResult
 
 
@@ -31,21 +34,51 @@ def build_simulation_log(
     result: SimulationResult,
     metadata: Optional[Dict[str, Any]] = None,
     inputs: Optional[Dict[str, Any]] = None,
+    fields: Optional[Iterable[str]] = None,
+    kpi_only: bool = False,
+    precision: Optional[int] = None,
 ) -> SimulationLog:
     """
     Wrap SimulationResult with optional metadata (shot_id, operator, timestamps)
     and inputs (process/mold/quality) so the log is self-contained.
+    `fields`/`kpi_only`/`precision` trim the stored result (see
+    `core.serialization.result_to_dict`).
     """
 
     return SimulationLog(
-        simulation=result.to_dict(),
+        simulation=result_to_dict(result, fields=fields, kpi_only=kpi_only, precision=precision),
         metadata=metadata or {},
         inputs=inputs or {},
     )
 
 
-def save_simulation_log(log: SimulationLog, path: Path) -> None:
-    """Persist log to JSON."""
+def save_simulation_log(log: SimulationLog, path: Path, compression: Optional[str] = None) -> None:
+    """
+    Persist log to JSON, or to the binary format when `path` ends with `.npz`
+    (`compression`: None, "gzip" or "zstd"; binary only).
+    """
+
+    if path.suffix.lower() == ".npz":
+        from .binary_log import write_binary_log
 
+        write_binary_log(log, path, compression)  # type: ignore[arg-type]
+        return
+    if compression is not None:
+        raise ValueError("compression is only supported for binary (.npz) simulation logs")
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(log.to_dict(), indent=2), encoding="utf-8")
+    path.write_text(dumps_json(log.to_dict(), indent=2), encoding="utf-8")
+
+
+def load_simulation_log(path: Path) -> SimulationLog:
+    """Load a JSON or binary log; binary payloads load their series lazily."""
+
+    if path.suffix.lower() == ".npz":
+        from .binary_log import read_binary_log
+
+        return read_binary_log(path)
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return SimulationLog(
+        simulation=payload.get("simulation", {}),
+        metadata=payload.get("metadata", {}),
+        inputs=payload.get("inputs", {}),
+    )
@@ -20,9 +20,29 @@ class BaselineModels:
     defect_risk_regressor: Optional[object]
 
 
-def build_baseline_models() -> BaselineModels:
+def build_baseline_models(n_estimators: int = 50, n_jobs: Optional[int] = None) -> BaselineModels:
+    """Untrained baseline forests; `n_jobs` builds trees in parallel (-1 = all cores)."""
+
     if RandomForestClassifier is None or RandomForestRegressor is None:
         raise ImportError("scikit-learn not installed; install with pur-mold-twin[ml]")
-    clf = RandomForestClassifier(n_estimators=50, random_state=0)
-    reg = RandomForestRegressor(n_estimators=50, random_state=0)
+    clf = RandomForestClassifier(n_estimators=n_estimators, random_state=0, n_jobs=n_jobs)
+    reg = RandomForestRegressor(n_estimators=n_estimators, random_state=0, n_jobs=n_jobs)
     return BaselineModels(defect_classifier=clf, defect_risk_regressor=reg)
+
+
+def warm_start_models(models: BaselineModels, extra_trees: int) -> BaselineModels:
+    """
+    Prepare fitted forests for an incremental refit: the next `fit` keeps the
+    existing trees and grows `extra_trees` new ones on the data it is given.
+    """
+
+    if extra_trees <= 0:
+        raise ValueError("extra_trees must be > 0")
+    for model in (models.defect_classifier, models.defect_risk_regressor):
+        if model is None:
+            continue
+        if not hasattr(model, "set_params") or not hasattr(model, "get_params"):
+            raise ValueError(f"{type(model).__name__} does not support warm start")
+        n_estimators = int(model.get_params()["n_estimators"])
+        model.set_params(warm_start=True, n_estimators=n_estimators + extra_trees)
+    return models
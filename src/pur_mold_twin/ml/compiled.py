@@ -0,0 +1,266 @@
+"""
+Tree ensembles compiled to flat NumPy node arrays.
+
+sklearn's generic `predict` pays input validation and per-tree dispatch on
+every call, which dominates single-row inference. `compile_forest` flattens
+a fitted RandomForest (anything exposing `estimators_[i].tree_`) into
+concatenated node arrays:
+
+- `feature`   (int)   split feature per node (0 for leaves),
+- `threshold` (float) split threshold,
+- `children`  (int, n_nodes x 2) left/right child; leaves point to themselves,
+- `value`     (float) leaf output (regression value or class probabilities),
+
+plus one root index per tree. `CompiledForest.predict` walks all trees for
+all rows at once, one vectorized step per tree level (a single row of a small
+forest walks each tree in plain Python instead), and returns the same outputs
+as the sklearn estimator (inputs are rounded to float32 like sklearn does
+before comparing with thresholds).
+
+Compiled forests are stored next to the pickle as a `<model_type>.forest/`
+directory with one raw `.npy` file per array, and picked up by the model
+registry when present. `load` memory-maps those files read-only, so forked
+workers share the node arrays through the page cache.
+"""
+
+from __future__ import annotations
+
+import shutil
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+COMPILED_SUFFIX = ".forest"
+# Above this many nodes the single-row path stays in NumPy: plain-list copies
+# of the node arrays cost ~200 bytes per node in every process.
+ROW_LISTS_MAX_NODES = 50_000
+
+
+@dataclass
+class CompiledForest:
+    feature: np.ndarray
+    threshold: np.ndarray
+    children: np.ndarray
+    missing_left: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    depth: int
+    classes_: Optional[np.ndarray] = None
+    feature_names_in_: Optional[np.ndarray] = None
+
+    @property
+    def is_classifier(self) -> bool:
+        return self.classes_ is not None
+
+    @cached_property
+    def _node_lists(self) -> Tuple[list, list, list, list, list]:
+        # Plain-list copy of the node arrays for the single-row path (built on first use).
+        return (
+            self.feature.tolist(),
+            self.threshold.tolist(),
+            self.children[:, 0].tolist(),
+            self.children[:, 1].tolist(),
+            self.missing_left.tolist(),
+        )
+
+    def _row_leaves(self, row: list) -> np.ndarray:
+        # One row: a per-tree Python walk stops at each tree's own leaf depth and
+        # avoids NumPy call overhead, which dominates the level-by-level loop here.
+        feature, threshold, left, right, missing_left = self._node_lists
+        leaves = []
+        for node in self.roots.tolist():
+            while left[node] != node:
+                value = row[feature[node]]
+                # NaN compares False: it goes right unless the split sends missing values left.
+                go_right = value > threshold[node] or (value != value and not missing_left[node])
+                node = right[node] if go_right else left[node]
+            leaves.append(node)
+        return np.array([leaves], dtype=np.intp)
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        # sklearn trees compare float32-rounded inputs against float64 thresholds
+        # (float32 -> float64 promotion in the comparison is exact).
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows, n_features = X.shape
+        if n_rows == 1 and self.feature.size <= ROW_LISTS_MAX_NODES:
+            return self._row_leaves(X[0].tolist())
+        children = self.children.ravel()  # child of node i: children[2 * i + go_right]
+        feature, threshold = self.feature, self.threshold
+        has_missing = bool(np.isnan(X).any())
+        # Row-major flat lookups: X.ravel()[row * n_features + feature].
+        flat = X.ravel()
+        row_base = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+        nodes = np.tile(self.roots, (n_rows, 1))
+        for _ in range(self.depth):
+            values = flat[row_base + feature[nodes]]
+            go_right = values > threshold[nodes]
+            if has_missing:
+                go_right = np.where(np.isnan(values), ~self.missing_left[nodes], go_right)
+            nodes = children[2 * nodes + go_right]
+        return nodes
+
+    def predict_values(self, X: np.ndarray) -> np.ndarray:
+        """Tree-averaged leaf values: regression output or class probabilities."""
+
+        leaf_values = self.value[self._leaves(X)]
+        # Sequential sum over trees (cumsum), matching sklearn's accumulation order bit for bit.
+        return np.cumsum(leaf_values, axis=1)[:, -1] / self.roots.size
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        if not self.is_classifier:
+            raise AttributeError("predict_proba is only available for classifiers")
+        return self.predict_values(X)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        averaged = self.predict_values(X)
+        if self.is_classifier:
+            return self.classes_[np.argmax(averaged, axis=1)]
+        return averaged[:, 0] if averaged.shape[1] == 1 else averaged
+
+    def save(self, path: Path) -> Path:
+        """Write one `.npy` per array into the directory `path`, replacing it as a whole."""
+
+        arrays = {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "children": self.children,
+            "missing_left": self.missing_left,
+            "value": self.value,
+            "roots": self.roots,
+            "depth": np.asarray(self.depth),
+        }
+        if self.classes_ is not None:
+            arrays["classes"] = self.classes_
+        if self.feature_names_in_ is not None:
+            arrays["feature_names"] = np.asarray(self.feature_names_in_, dtype=str)
+        tmp = path.with_name(path.name + ".tmp")
+        old = path.with_name(path.name + ".old")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        for name, array in arrays.items():
+            np.save(tmp / f"{name}.npy", array, allow_pickle=False)
+        # A directory cannot be renamed over a non-empty one: move the old forest
+        # aside first (open memory maps of it stay valid after the removal).
+        if path.exists():
+            shutil.rmtree(old, ignore_errors=True)
+            path.replace(old)
+        tmp.replace(path)
+        shutil.rmtree(old, ignore_errors=True)
+        return path
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "CompiledForest":
+        def array(name: str) -> Optional[np.ndarray]:
+            file = path / f"{name}.npy"
+            if not file.exists():
+                return None
+            # Plain ndarray views of the read-only maps (np.memmap adds per-operation overhead).
+            return np.load(file, mmap_mode="r" if mmap else None, allow_pickle=False).view(np.ndarray)
+
+        return cls(
+            feature=array("feature"),
+            threshold=array("threshold"),
+            children=array("children"),
+            missing_left=array("missing_left"),
+            value=array("value"),
+            roots=array("roots"),
+            depth=int(np.load(path / "depth.npy", allow_pickle=False)),
+            classes_=array("classes"),
+            feature_names_in_=array("feature_names"),
+        )
+
+
+def _plain_array(values) -> np.ndarray:
+    # .npy files are loaded with allow_pickle=False: store object labels as strings.
+    array = np.asarray(values)
+    return array.astype(str) if array.dtype == object else array
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = np.zeros(left.size, dtype=np.int64)
+    for node in range(left.size):  # sklearn stores parents before children
+        if left[node] >= 0:
+            depth[left[node]] = depth[node] + 1
+            depth[right[node]] = depth[node] + 1
+    return int(depth.max())
+
+
+def compile_forest(model: object) -> Optional[CompiledForest]:
+    """Flatten a fitted tree ensemble; returns None if `model` is not one."""
+
+    estimators = getattr(model, "estimators_", None)
+    if not estimators or not all(hasattr(est, "tree_") for est in estimators):
+        return None
+    classes = getattr(model, "classes_", None)
+    if classes is not None and np.ndim(classes) != 1:
+        return None  # multi-output classifiers are not supported
+
+    features: List[np.ndarray] = []
+    thresholds: List[np.ndarray] = []
+    children: List[np.ndarray] = []
+    missing: List[np.ndarray] = []
+    values: List[np.ndarray] = []
+    roots: List[int] = []
+    depth = 0
+    offset = 0
+    for estimator in estimators:
+        tree = estimator.tree_
+        left = np.asarray(tree.children_left, dtype=np.intp)
+        right = np.asarray(tree.children_right, dtype=np.intp)
+        count = left.size
+        own = np.arange(count, dtype=np.intp)
+        leaf = left < 0
+        child = np.stack([np.where(leaf, own, left), np.where(leaf, own, right)], axis=1) + offset
+        value = np.asarray(tree.value, dtype=np.float64)[:, 0, :]
+        if classes is not None:
+            totals = value.sum(axis=1, keepdims=True)
+            value = np.divide(value, totals, out=np.zeros_like(value), where=totals > 0)
+        feature = np.where(leaf, 0, np.asarray(tree.feature, dtype=np.intp))
+        missing_go_left = getattr(tree, "missing_go_to_left", None)
+        missing.append(
+            np.zeros(count, dtype=bool) if missing_go_left is None else np.asarray(missing_go_left, dtype=bool)
+        )
+        features.append(feature)
+        thresholds.append(np.asarray(tree.threshold, dtype=np.float64))
+        children.append(child)
+        values.append(value)
+        roots.append(offset)
+        depth = max(depth, _tree_depth(left, right))
+        offset += count
+
+    names = getattr(model, "feature_names_in_", None)
+    return CompiledForest(
+        feature=np.concatenate(features),
+        threshold=np.concatenate(thresholds),
+        children=np.concatenate(children),
+        missing_left=np.concatenate(missing),
+        value=np.concatenate(values),
+        roots=np.asarray(roots, dtype=np.intp),
+        depth=depth,
+        classes_=None if classes is None else _plain_array(classes),
+        feature_names_in_=None if names is None else np.asarray(names, dtype=str),
+    )
+
+
+def compiled_path(models_dir: Path, model_type: str) -> Path:
+    return models_dir / f"{model_type}{COMPILED_SUFFIX}"
+
+
+def export_compiled(model: object, models_dir: Path, model_type: str) -> Optional[Path]:
+    """
+    Write `<model_type>.forest/` for `model`, or remove a stale one when the
+    model cannot be compiled (so inference never pairs it with a newer pickle).
+    """
+
+    path = compiled_path(models_dir, model_type)
+    compiled = compile_forest(model)
+    if compiled is None:
+        shutil.rmtree(path, ignore_errors=True)
+        return None
+    return compiled.save(path)
@@ -7,6 +7,19 @@ from typing import Dict, List, Optional
 import numpy as np
 import pandas as pd
 
+from ..data.feature_store import load_features
+
+
+# default: core targets + key process features
+DEFAULT_DRIFT_COLUMNS: List[str] = [
+    "defect_risk",
+    "any_defect",
+    "sim_p_max_bar",
+    "sim_T_core_max_C",
+    "proc_T_mold_init_C",
+    "proc_RH_ambient",
+]
+
 
 @dataclass
 class DriftMetrics:
@@ -14,6 +27,10 @@ class DriftMetrics:
     baseline_mean: Optional[float]
     current_mean: Optional[float]
     abs_delta: Optional[float]
+    # Distribution-level metrics, filled by the sketch-based `DriftMonitor`.
+    psi: Optional[float] = None
+    ks: Optional[float] = None
+    current_count: Optional[int] = None
 
 
 @dataclass
@@ -22,12 +39,9 @@ class DriftReport:
     max_abs_delta: float
 
 
-def _load_features(path: Path) -> pd.DataFrame:
-    if not path.exists():
-        raise FileNotFoundError(f"Features file '{path}' not found")
-    if path.suffix.lower() == ".csv":
-        return pd.read_csv(path)
-    return pd.read_parquet(path)
+def _load_features(path: Path, columns: Optional[List[str]] = None, **kwargs) -> pd.DataFrame:
+    # Only the monitored columns are read (Parquet projection / CSV usecols).
+    return load_features(path, columns=columns, **kwargs)
 
 
 def compute_drift(
@@ -42,19 +56,11 @@ def compute_drift(
     absolute difference. The overall max_abs_delta is used for alerting.
     """
 
-    baseline = _load_features(baseline_path)
-    current = _load_features(current_path)
-
     if columns is None:
-        # default: core targets + key process features
-        columns = [
-            "defect_risk",
-            "any_defect",
-            "sim_p_max_bar",
-            "sim_T_core_max_C",
-            "proc_T_mold_init_C",
-            "proc_RH_ambient",
-        ]
+        columns = DEFAULT_DRIFT_COLUMNS
+
+    baseline = _load_features(baseline_path, columns)
+    current = _load_features(current_path, columns)
 
     metrics: List[DriftMetrics] = []
     max_abs_delta = 0.0
@@ -0,0 +1,378 @@
+"""
+Incremental drift monitoring with per-column streaming sketches.
+
+`compute_drift` rescans two full feature files on every call. `DriftMonitor`
+instead keeps, per monitored column, a small mergeable sketch:
+
+- count / mean / M2 (Welford, merged with Chan's parallel formula),
+- min / max,
+- a fixed-edge histogram (edges taken from the baseline), used for PSI, KS
+  and approximate quantiles.
+
+New shots are folded into time buckets (`bucket_s`, default 1 h); the current
+distribution for a rolling window is the merge of the buckets it covers. The
+state is a few KB of JSON, so `check-drift --state` can run every few minutes
+without touching the historical Parquet files.
+
+Updates are idempotent: the state remembers the `shot_id`s folded into each
+bucket (or, for files without ids, the latest timestamp seen), so re-reading
+the same or a growing `--current` file only ingests the new rows.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set
+
+import numpy as np
+import pandas as pd
+
+from .drift import DEFAULT_DRIFT_COLUMNS, DriftMetrics, DriftReport, _load_features
+
+
+STATE_VERSION = 2
+_READABLE_VERSIONS = (1, 2)
+_PSI_EPS = 1e-6
+
+
+def _histogram_edges(values: np.ndarray, bins: int) -> np.ndarray:
+    """Bin edges for a column: value midpoints for discrete data, quantiles otherwise."""
+
+    unique = np.unique(values)
+    if unique.size == 1:
+        return np.array([unique[0] - 0.5, unique[0] + 0.5])
+    if unique.size <= bins:
+        mids = (unique[1:] + unique[:-1]) / 2.0
+        first = unique[0] - (mids[0] - unique[0])
+        last = unique[-1] + (unique[-1] - mids[-1])
+        return np.concatenate(([first], mids, [last]))
+    return np.unique(np.quantile(values, np.linspace(0.0, 1.0, bins + 1)))
+
+
+@dataclass
+class ColumnSketch:
+    """Mergeable summary of one column; `counts` has underflow/overflow slots at both ends."""
+
+    edges: np.ndarray
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = float("inf")
+    max: float = float("-inf")
+    counts: np.ndarray = field(default=None)  # type: ignore[assignment]
+
+    def __post_init__(self) -> None:
+        self.edges = np.asarray(self.edges, dtype=np.float64)
+        if self.counts is None:
+            self.counts = np.zeros(self.edges.size + 1, dtype=np.int64)
+        else:
+            self.counts = np.asarray(self.counts, dtype=np.int64)
+
+    @property
+    def variance(self) -> Optional[float]:
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        self._merge_moments(values.size, batch_mean, batch_m2)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        slots = np.searchsorted(self.edges, values, side="right")
+        slots[values == self.edges[-1]] = self.edges.size - 1
+        self.counts += np.bincount(slots, minlength=self.counts.size)
+
+    def merge(self, other: "ColumnSketch") -> None:
+        if other.count == 0:
+            return
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.counts += other.counts
+
+    def _merge_moments(self, n_b: int, mean_b: float, m2_b: float) -> None:
+        n_a = self.count
+        total = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / total
+        self.m2 += m2_b + delta * delta * n_a * n_b / total
+        self.count = total
+
+    def copy_empty(self) -> "ColumnSketch":
+        return ColumnSketch(edges=self.edges.copy())
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate quantile, interpolated linearly inside histogram bins."""
+
+        if self.count == 0:
+            return None
+        bounds = np.concatenate(([self.min], self.edges, [self.max]))
+        lower = np.minimum(bounds[:-1], bounds[1:])
+        upper = np.maximum(bounds[:-1], bounds[1:])
+        lower = np.clip(lower, self.min, self.max)
+        upper = np.clip(upper, self.min, self.max)
+        cumulative = np.cumsum(self.counts)
+        target = q * self.count
+        slot = int(np.searchsorted(cumulative, target, side="left"))
+        slot = min(slot, self.counts.size - 1)
+        before = cumulative[slot - 1] if slot > 0 else 0
+        inside = self.counts[slot]
+        fraction = 0.0 if inside == 0 else (target - before) / inside
+        return float(lower[slot] + fraction * (upper[slot] - lower[slot]))
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "counts": self.counts.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, edges: np.ndarray, data: dict) -> "ColumnSketch":
+        return cls(
+            edges=edges,
+            count=int(data["count"]),
+            mean=float(data["mean"]),
+            m2=float(data["m2"]),
+            min=float("inf") if data.get("min") is None else float(data["min"]),
+            max=float("-inf") if data.get("max") is None else float(data["max"]),
+            counts=np.asarray(data["counts"], dtype=np.int64),
+        )
+
+
+def population_stability_index(baseline: ColumnSketch, current: ColumnSketch) -> Optional[float]:
+    if baseline.count == 0 or current.count == 0:
+        return None
+    p = baseline.counts / baseline.count + _PSI_EPS
+    q = current.counts / current.count + _PSI_EPS
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def ks_statistic(baseline: ColumnSketch, current: ColumnSketch) -> Optional[float]:
+    """Kolmogorov-Smirnov distance evaluated on the shared histogram edges."""
+
+    if baseline.count == 0 or current.count == 0:
+        return None
+    cdf_base = np.cumsum(baseline.counts) / baseline.count
+    cdf_curr = np.cumsum(current.counts) / current.count
+    return float(np.max(np.abs(cdf_base - cdf_curr)))
+
+
+def _epoch_seconds(frame: pd.DataFrame, now: Optional[float]) -> np.ndarray:
+    if "timestamp" in frame.columns:
+        stamps = pd.to_datetime(frame["timestamp"], errors="coerce", utc=True)
+        seconds = (stamps - pd.Timestamp(0, tz="UTC")).dt.total_seconds().to_numpy(dtype=np.float64, na_value=np.nan)
+        fallback = time.time() if now is None else now
+        return np.where(np.isnan(seconds), fallback, seconds)
+    return np.full(len(frame), time.time() if now is None else now)
+
+
+class DriftMonitor:
+    """
+    Baseline sketches plus time-bucketed sketches of recent shots.
+
+    Build once with `from_baseline`, then call `update` with each batch of new
+    feature rows and `report(window_s)` for the rolling window. Buckets older
+    than `retention_s` are dropped on update, together with their shot ids.
+    """
+
+    def __init__(
+        self,
+        baseline: Dict[str, ColumnSketch],
+        bucket_s: float = 3600.0,
+        retention_s: float = 30 * 86400.0,
+        buckets: Optional[Dict[int, Dict[str, ColumnSketch]]] = None,
+        seen: Optional[Dict[int, Set[str]]] = None,
+        latest_s: Optional[float] = None,
+    ) -> None:
+        if bucket_s <= 0 or retention_s <= 0:
+            raise ValueError("bucket_s and retention_s must be > 0")
+        self.baseline = baseline
+        self.bucket_s = float(bucket_s)
+        self.retention_s = float(retention_s)
+        self.buckets: Dict[int, Dict[str, ColumnSketch]] = buckets or {}
+        self.seen: Dict[int, Set[str]] = seen or {}
+        self.latest_s = latest_s
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.baseline)
+
+    @classmethod
+    def from_baseline(
+        cls,
+        frame: pd.DataFrame,
+        columns: Optional[Sequence[str]] = None,
+        bins: int = 20,
+        **kwargs,
+    ) -> "DriftMonitor":
+        baseline: Dict[str, ColumnSketch] = {}
+        for column in columns or DEFAULT_DRIFT_COLUMNS:
+            if column not in frame.columns:
+                continue
+            values = pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            if values.size == 0:
+                continue
+            sketch = ColumnSketch(edges=_histogram_edges(values, bins))
+            sketch.update(values)
+            baseline[column] = sketch
+        return cls(baseline, **kwargs)
+
+    @classmethod
+    def from_features_file(cls, path: Path, columns: Optional[Sequence[str]] = None, **kwargs) -> "DriftMonitor":
+        columns = list(columns or DEFAULT_DRIFT_COLUMNS)
+        return cls.from_baseline(_load_features(path, columns), columns=columns, **kwargs)
+
+    def update_from_file(self, path: Path, now: Optional[float] = None) -> int:
+        return self.update(_load_features(path, [*self.columns, "timestamp", "shot_id"]), now=now)
+
+    def update(self, frame: pd.DataFrame, now: Optional[float] = None) -> int:
+        """
+        Fold new feature rows into their time buckets; returns rows consumed.
+
+        Rows are bucketed by their `timestamp` column when present, else by `now`.
+        Rows already ingested are skipped: by `shot_id` when the frame has one,
+        otherwise by timestamp (rows not newer than the last update). Frames
+        with neither are always counted.
+        """
+
+        if frame.empty:
+            return 0
+        seconds = _epoch_seconds(frame, now)
+        keys = np.floor(seconds / self.bucket_s).astype(np.int64)
+        newest = float(np.max(seconds))
+        if "shot_id" in frame.columns:
+            ids = frame["shot_id"].astype(str).to_numpy()
+            fresh = ~pd.Series(ids).duplicated().to_numpy()
+            known = set().union(*self.seen.values())
+            fresh &= np.array([shot not in known for shot in ids], dtype=bool)
+            for shot, key in zip(ids[fresh], keys[fresh]):
+                self.seen.setdefault(int(key), set()).add(shot)
+        elif "timestamp" in frame.columns and self.latest_s is not None:
+            fresh = seconds > self.latest_s
+        else:
+            fresh = np.ones(len(frame), dtype=bool)
+        if "timestamp" in frame.columns:
+            self.latest_s = newest if self.latest_s is None else max(self.latest_s, newest)
+        if not fresh.any():
+            return 0
+        frame, seconds, keys = frame[fresh], seconds[fresh], keys[fresh]
+        columns = [c for c in self.columns if c in frame.columns]
+        values = {
+            c: pd.to_numeric(frame[c], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan) for c in columns
+        }
+        for key in np.unique(keys):
+            rows = keys == key
+            bucket = self.buckets.setdefault(int(key), {})
+            for column in columns:
+                sketch = bucket.get(column)
+                if sketch is None:
+                    sketch = bucket[column] = self.baseline[column].copy_empty()
+                sketch.update(values[column][rows])
+        self._prune(newest)
+        return len(frame)
+
+    def _prune(self, latest_s: float) -> None:
+        oldest = int(np.floor((latest_s - self.retention_s) / self.bucket_s))
+        for key in [k for k in self.buckets if k < oldest]:
+            del self.buckets[key]
+        for key in [k for k in self.seen if k < oldest]:
+            del self.seen[key]
+
+    def window(self, window_s: Optional[float] = None, now: Optional[float] = None) -> Dict[str, ColumnSketch]:
+        """Merged sketches of the buckets covering the last `window_s` seconds (all buckets if None)."""
+
+        merged = {column: sketch.copy_empty() for column, sketch in self.baseline.items()}
+        if window_s is not None:
+            end = time.time() if now is None else now
+            first = int(np.floor((end - window_s) / self.bucket_s))
+        for key, bucket in self.buckets.items():
+            if window_s is not None and key < first:
+                continue
+            for column, sketch in bucket.items():
+                if column in merged:
+                    merged[column].merge(sketch)
+        return merged
+
+    def report(self, window_s: Optional[float] = None, now: Optional[float] = None) -> DriftReport:
+        current = self.window(window_s, now)
+        metrics: List[DriftMetrics] = []
+        max_abs_delta = 0.0
+        for column, base in self.baseline.items():
+            curr = current[column]
+            if base.count == 0 or curr.count == 0:
+                metrics.append(DriftMetrics(column, None, None, None))
+                continue
+            delta = abs(curr.mean - base.mean)
+            max_abs_delta = max(max_abs_delta, delta)
+            metrics.append(
+                DriftMetrics(
+                    column,
+                    base.mean,
+                    curr.mean,
+                    delta,
+                    psi=population_stability_index(base, curr),
+                    ks=ks_statistic(base, curr),
+                    current_count=curr.count,
+                )
+            )
+        return DriftReport(metrics=metrics, max_abs_delta=max_abs_delta)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": STATE_VERSION,
+            "bucket_s": self.bucket_s,
+            "retention_s": self.retention_s,
+            "columns": {
+                column: {"edges": sketch.edges.tolist(), "baseline": sketch.to_dict()}
+                for column, sketch in self.baseline.items()
+            },
+            "buckets": {
+                str(key): {column: sketch.to_dict() for column, sketch in bucket.items()}
+                for key, bucket in sorted(self.buckets.items())
+            },
+            "seen": {str(key): sorted(ids) for key, ids in sorted(self.seen.items())},
+            "latest_s": self.latest_s,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DriftMonitor":
+        if data.get("version") not in _READABLE_VERSIONS:
+            raise ValueError(f"Unsupported drift monitor state version {data.get('version')!r}")
+        edges = {column: np.asarray(spec["edges"], dtype=np.float64) for column, spec in data["columns"].items()}
+        baseline = {column: ColumnSketch.from_dict(edges[column], spec["baseline"]) for column, spec in data["columns"].items()}
+        buckets = {
+            int(key): {column: ColumnSketch.from_dict(edges[column], spec) for column, spec in bucket.items()}
+            for key, bucket in data.get("buckets", {}).items()
+        }
+        seen = {int(key): set(ids) for key, ids in data.get("seen", {}).items()}
+        return cls(
+            baseline,
+            bucket_s=data["bucket_s"],
+            retention_s=data["retention_s"],
+            buckets=buckets,
+            seen=seen,
+            latest_s=data.get("latest_s"),
+        )
+
+    def save(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), separators=(",", ":")), encoding="utf-8")
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "DriftMonitor":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
@@ -1,86 +1,186 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 import logging
+import warnings
 
-from .versioning import load_manifest, get_model_info
+import numpy as np
 
-logger = logging.getLogger(__name__)
+from .registry import LoadedModels, ModelRegistry, get_registry  # noqa: F401 - re-exported
 
-try:
-    import joblib  # type: ignore
-except ModuleNotFoundError:  # pragma: no cover
-    joblib = None
+logger = logging.getLogger(__name__)
 
+# Models directory used when callers pass none (`attach_ml_predictions`, `predict_batch`).
+_DEFAULT_MODELS_DIR = Path("models")
 
-@dataclass
-class LoadedModels:
-    """Container for loaded ML models with version metadata."""
-    defect_risk: Optional[object]
-    defect_classifier: Optional[object]
-    manifest_data: Optional[Dict[str, Any]] = None
 
+def set_default_models_dir(models_dir: Path) -> None:
+    """Set the models directory used by calls that do not name one (process-wide)."""
 
-_CACHED_MODELS: Optional[LoadedModels] = None
+    global _DEFAULT_MODELS_DIR
+    _DEFAULT_MODELS_DIR = Path(models_dir)
 
 
-def _load_models(models_dir: Path = Path("models")) -> LoadedModels:
+def _load_models(models_dir: Optional[Path] = None) -> LoadedModels:
     """
     Load ML models from disk with manifest metadata.
     
-    Implements lazy loading with caching.
-    Logs warnings if models exist but manifest is missing.
+    Backed by the hot-reloading `ModelRegistry` for `models_dir` (default:
+    see `set_default_models_dir`, initially `models/`): models are
+    memory-mapped on first use and swapped when `manifest.json` or an artifact
+    changes. Logs warnings if models exist but manifest is missing.
     """
-    global _CACHED_MODELS
-    if _CACHED_MODELS is not None:
-        return _CACHED_MODELS
-    
-    if joblib is None:
-        raise ImportError("joblib is required for ML inference; install with pur-mold-twin[ml]")
-    
-    # Load models
-    risk_path = models_dir / "defect_risk.pkl"
-    cls_path = models_dir / "defect_classifier.pkl"
-    
-    risk_model = None
-    cls_model = None
-    
-    if risk_path.exists():
-        try:
-            risk_model = joblib.load(risk_path)
-            logger.info(f"Loaded defect risk model from {risk_path}")
-        except Exception as e:
-            logger.error(f"Failed to load defect risk model: {e}")
-    
-    if cls_path.exists():
+    return get_registry(_DEFAULT_MODELS_DIR if models_dir is None else models_dir).get()
+
+
+TARGET_KEYS = ("defect_risk", "any_defect")
+MODEL_TYPES = ("defect_risk", "defect_classifier")
+
+
+def _model_feature_names(models: LoadedModels, model_type: str, model: object) -> Optional[List[str]]:
+    """Column order the model was trained on: estimator attribute first, then manifest."""
+
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None:
+        return [str(name) for name in names]
+    info = (models.manifest_data or {}).get("models", {}).get(model_type) or {}
+    features = info.get("features_used")
+    return list(features) if features else None
+
+
+def _default_feature_names(rows: Sequence[Mapping[str, Any]]) -> List[str]:
+    # Same column order a DataFrame built from `rows` would have.
+    names: Dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            if key not in TARGET_KEYS:
+                names.setdefault(key, None)
+    return list(names)
+
+
+def build_feature_matrix(rows: Sequence[Mapping[str, Any]], feature_names: Sequence[str]) -> np.ndarray:
+    """Stack feature dicts into a float64 matrix in `feature_names` order (missing/non-numeric -> NaN)."""
+
+    matrix = np.full((len(rows), len(feature_names)), np.nan, dtype=np.float64)
+    for i, row in enumerate(rows):
+        for j, name in enumerate(feature_names):
+            value = row.get(name)
+            if value is None:
+                continue
+            try:
+                matrix[i, j] = float(value)
+            except (TypeError, ValueError):
+                continue
+    return matrix
+
+
+def _to_python(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def predict_batch(
+    features_rows: Sequence[Mapping[str, Any]],
+    models: Optional[LoadedModels] = None,
+) -> Dict[str, List[Any]]:
+    """
+    Run every available model once over all `features_rows`.
+
+    Rows are stacked into one matrix per distinct feature order (usually a
+    single one: the manifest's `features_used`), so sklearn is dispatched
+    once per model instead of once per row. Returns
+    `{"defect_risk_pred": [...], "defect_class_pred": [...]}` for the models
+    that are loaded and succeeded.
+    """
+
+    if models is None:
+        models = _load_models()
+    rows = list(features_rows)
+    predictions: Dict[str, List[Any]] = {}
+    if not rows:
+        return predictions
+
+    matrices: Dict[Tuple[str, ...], np.ndarray] = {}
+    fallback_names: Optional[List[str]] = None
+    outputs = (
+        ("defect_risk", models.defect_risk, "defect_risk_pred"),
+        ("defect_classifier", models.defect_classifier, "defect_class_pred"),
+    )
+    for model_type, model, key in outputs:
+        if model is None:
+            continue
+        names = _model_feature_names(models, model_type, model)
+        if names is None:
+            fallback_names = fallback_names or _default_feature_names(rows)
+            names = fallback_names
+        order = tuple(names)
+        if order not in matrices:
+            matrices[order] = build_feature_matrix(rows, order)
         try:
-            cls_model = joblib.load(cls_path)
-            logger.info(f"Loaded defect classifier from {cls_path}")
+            with warnings.catch_warnings():
+                # Estimators fitted on DataFrames warn about plain arrays; the column order is aligned above.
+                warnings.filterwarnings("ignore", message="X does not have valid feature names")
+                values = model.predict(matrices[order])
         except Exception as e:
-            logger.error(f"Failed to load defect classifier: {e}")
-    
-    # Load manifest
-    manifest = load_manifest(models_dir)
-    manifest_data = None
-    
-    if manifest is not None:
-        manifest_data = manifest.to_dict()
-        logger.info(f"Loaded model manifest with {len(manifest.models)} entries")
-    else:
-        if risk_model or cls_model:
-            logger.warning(
-                f"Models found in {models_dir} but no manifest.json present. "
-                "Consider retraining models to generate version metadata."
-            )
-    
-    _CACHED_MODELS = LoadedModels(
-        defect_risk=risk_model,
-        defect_classifier=cls_model,
-        manifest_data=manifest_data,
-    )
-    return _CACHED_MODELS
+            logger.warning(f"{model_type} batch prediction failed: {e}")
+            continue
+        if model_type == "defect_risk":
+            predictions[key] = [float(v) for v in values]
+        else:
+            predictions[key] = [_to_python(v) for v in values]
+    return predictions
+
+
+def _model_metadata(models: LoadedModels) -> Dict[str, Any]:
+    ml_metadata: Dict[str, Any] = {}
+    if not models.manifest_data:
+        return ml_metadata
+    for model_type in MODEL_TYPES:
+        if model_type in models.manifest_data.get("models", {}):
+            model_info = models.manifest_data["models"][model_type]
+            ml_metadata[model_type] = {
+                "version": model_info.get("version"),
+                "trained_at": model_info.get("trained_at"),
+                "git_commit": model_info.get("git_commit"),
+                "metrics": model_info.get("metrics", {}),
+            }
+    return ml_metadata
+
+
+def attach_ml_predictions_batch(
+    sim_results: Sequence[Dict[str, Any]],
+    features_rows: Sequence[Mapping[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Batched `attach_ml_predictions`: one `predict` call per model for all rows.
+
+    Never raises if models are missing; results are returned unchanged then.
+    """
+
+    if len(sim_results) != len(features_rows):
+        raise ValueError("sim_results and features_rows must have the same length")
+    try:
+        models = _load_models()
+    except Exception as e:
+        logger.debug(f"Could not load models: {e}")
+        return list(sim_results)
+
+    try:
+        predictions = predict_batch(features_rows, models)
+    except Exception as e:
+        logger.warning(f"Batch prediction failed: {e}")
+        predictions = {}
+    ml_metadata = _model_metadata(models)
+
+    results = list(sim_results)
+    for i, sim_result in enumerate(results):
+        for key, values in predictions.items():
+            sim_result[key] = values[i]
+        if ml_metadata:
+            sim_result["ml_model_metadata"] = ml_metadata
+    if ml_metadata:
+        logger.debug(f"Attached metadata for {len(ml_metadata)} models")
+    return results
 
 
 def attach_ml_predictions(sim_result: Dict[str, Any], features_row: Dict[str, Any]) -> Dict[str, Any]:
@@ -89,7 +189,7 @@ def attach_ml_predictions(sim_result: Dict[str, Any], features_row: Dict[str, An
     
     Also attaches model version metadata from manifest if available.
     This function never raises if models are missing; in such case it returns the
-    original dict unchanged.
+    original dict unchanged. Thin wrapper over `attach_ml_predictions_batch`.
     
     Args:
         sim_result: Dictionary representing simulation results
@@ -98,48 +198,6 @@ def attach_ml_predictions(sim_result: Dict[str, Any], features_row: Dict[str, An
     Returns:
         Enhanced sim_result with ML predictions and metadata
     """
-    try:
-        models = _load_models()
-    except Exception as e:
-        logger.debug(f"Could not load models: {e}")
-        return sim_result
-
-    from pandas import DataFrame
-
-    X = DataFrame([features_row]).drop(columns=["defect_risk", "any_defect"], errors="ignore")
-
-    # Attach predictions
-    if models.defect_risk is not None:
-        try:
-            risk_pred = float(models.defect_risk.predict(X)[0])
-            sim_result["defect_risk_pred"] = risk_pred
-        except Exception as e:
-            logger.warning(f"Defect risk prediction failed: {e}")
-    
-    if models.defect_classifier is not None:
-        try:
-            cls_pred = models.defect_classifier.predict(X)[0]
-            sim_result["defect_class_pred"] = cls_pred
-        except Exception as e:
-            logger.warning(f"Defect classifier prediction failed: {e}")
-    
-    # Attach model metadata from manifest
-    if models.manifest_data:
-        ml_metadata = {}
-        
-        for model_type in ["defect_risk", "defect_classifier"]:
-            if model_type in models.manifest_data.get("models", {}):
-                model_info = models.manifest_data["models"][model_type]
-                ml_metadata[model_type] = {
-                    "version": model_info.get("version"),
-                    "trained_at": model_info.get("trained_at"),
-                    "git_commit": model_info.get("git_commit"),
-                    "metrics": model_info.get("metrics", {}),
-                }
-        
-        if ml_metadata:
-            sim_result["ml_model_metadata"] = ml_metadata
-            logger.debug(f"Attached metadata for {len(ml_metadata)} models")
-    
-    return sim_result
-
+    if not isinstance(features_row, Mapping):
+        features_row = {}
+    return attach_ml_predictions_batch([sim_result], [features_row])[0]
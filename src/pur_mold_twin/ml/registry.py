@@ -0,0 +1,178 @@
+"""
+Hot-reloadable model registry.
+
+`ModelRegistry` owns the models of one `models/` directory. Every `get()`
+(throttled to `check_interval_s`) stats `manifest.json` and the model files;
+when their signature changes, a fresh `LoadedModels` snapshot is loaded and
+swapped in with a single reference assignment, so readers always see a
+consistent (models, manifest) pair and retraining needs no restart. If the
+new artifacts cannot be loaded the previous snapshot is kept.
+
+Artifacts are loaded with `joblib.load(..., mmap_mode="r")`: numpy arrays of
+the forests are memory-mapped read-only, so forked workers share them via
+the page cache instead of holding private copies. When training also wrote
+a compiled forest (`<model_type>.forest/`, see `compiled.py`) it is
+served instead of the pickle: same predictions, without sklearn's per-call
+overhead, and its node arrays are memory-mapped the same way.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .compiled import CompiledForest, compiled_path
+from .versioning import load_manifest
+
+logger = logging.getLogger(__name__)
+
+try:
+    import joblib  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    joblib = None
+
+
+MODEL_FILES: Dict[str, str] = {
+    "defect_risk": "defect_risk.pkl",
+    "defect_classifier": "defect_classifier.pkl",
+}
+MANIFEST_FILE = "manifest.json"
+
+
+@dataclass
+class LoadedModels:
+    """Container for loaded ML models with version metadata."""
+    defect_risk: Optional[object]
+    defect_classifier: Optional[object]
+    manifest_data: Optional[Dict[str, Any]] = None
+
+
+Signature = Tuple[Tuple[str, int, int], ...]
+
+
+def _load_artifact(path: Path, mmap: bool) -> object:
+    if mmap:
+        try:
+            return joblib.load(path, mmap_mode="r")
+        except TypeError:  # minimal joblib-compatible loaders without mmap support
+            pass
+    return joblib.load(path)
+
+
+class ModelRegistry:
+    """Models of one directory, reloaded when `manifest.json` or an artifact changes."""
+
+    def __init__(self, models_dir: Path = Path("models"), check_interval_s: float = 2.0, mmap: bool = True) -> None:
+        self.models_dir = Path(models_dir)
+        self.check_interval_s = check_interval_s
+        self.mmap = mmap
+        self._lock = threading.Lock()
+        self._snapshot: Optional[LoadedModels] = None
+        self._signature: Optional[Signature] = None
+        self._last_check = float("-inf")
+
+    def _signature_now(self) -> Signature:
+        entries = []
+        compiled = [compiled_path(Path(), model_type).name for model_type in MODEL_FILES]
+        for name in (MANIFEST_FILE, *MODEL_FILES.values(), *compiled):
+            try:
+                stat = (self.models_dir / name).stat()
+            except FileNotFoundError:
+                continue
+            entries.append((name, stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+
+    def get(self) -> LoadedModels:
+        """Current snapshot; reloads first if the directory changed since the last check."""
+
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - self._last_check < self.check_interval_s:
+            return snapshot
+        with self._lock:
+            if self._snapshot is not None and now - self._last_check < self.check_interval_s:
+                return self._snapshot
+            self._last_check = now
+            signature = self._signature_now()
+            if self._snapshot is None or signature != self._signature:
+                self._reload(signature)
+            return self._snapshot
+
+    def reload(self) -> LoadedModels:
+        """Force a reload regardless of the change check."""
+
+        with self._lock:
+            self._last_check = time.monotonic()
+            self._reload(self._signature_now())
+            return self._snapshot
+
+    def _reload(self, signature: Signature) -> None:
+        if joblib is None:
+            raise ImportError("joblib is required for ML inference; install with pur-mold-twin[ml]")
+        try:
+            snapshot = self._load_snapshot()
+        except Exception as e:
+            if self._snapshot is None:
+                raise
+            logger.error(f"Model reload from {self.models_dir} failed, keeping previous models: {e}")
+            return
+        if self._snapshot is not None:
+            logger.info(f"Reloaded models from {self.models_dir}")
+        self._snapshot = snapshot  # atomic swap: readers hold either the old or the new snapshot
+        self._signature = signature
+
+    def _load_snapshot(self) -> LoadedModels:
+        loaded: Dict[str, Optional[object]] = {}
+        for model_type, filename in MODEL_FILES.items():
+            path = self.models_dir / filename
+            loaded[model_type] = None
+            if not path.exists():
+                continue
+            compiled = compiled_path(self.models_dir, model_type)
+            if compiled.exists():
+                try:
+                    loaded[model_type] = CompiledForest.load(compiled, mmap=self.mmap)
+                    logger.info(f"Loaded compiled {model_type} model from {compiled}")
+                    continue
+                except Exception as e:
+                    logger.warning(f"Failed to load compiled {model_type} model, using {path}: {e}")
+            try:
+                loaded[model_type] = _load_artifact(path, self.mmap)
+                logger.info(f"Loaded {model_type} model from {path}")
+            except Exception as e:
+                logger.error(f"Failed to load {model_type} model: {e}")
+
+        manifest = load_manifest(self.models_dir)
+        manifest_data = None
+        if manifest is not None:
+            manifest_data = manifest.to_dict()
+            logger.info(f"Loaded model manifest with {len(manifest.models)} entries")
+        elif any(model is not None for model in loaded.values()):
+            logger.warning(
+                f"Models found in {self.models_dir} but no manifest.json present. "
+                "Consider retraining models to generate version metadata."
+            )
+        return LoadedModels(
+            defect_risk=loaded["defect_risk"],
+            defect_classifier=loaded["defect_classifier"],
+            manifest_data=manifest_data,
+        )
+
+
+_REGISTRIES: Dict[Path, ModelRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_registry(models_dir: Path = Path("models")) -> ModelRegistry:
+    """Process-wide registry for `models_dir` (one per resolved directory)."""
+
+    key = Path(models_dir).resolve()
+    with _REGISTRIES_LOCK:
+        registry = _REGISTRIES.get(key)
+        if registry is None:
+            registry = _REGISTRIES[key] = ModelRegistry(models_dir)
+        return registry
@@ -6,15 +6,26 @@ Usage (script):
 
 Usage (CLI):
     pur-mold-twin train-ml --features data/ml/features.parquet
+
+Scaling options:
+    --n-jobs N            build trees on N cores (-1 = all)
+    --cv-folds K          K-fold cross-validated metrics, folds fitted concurrently
+    --warm-start-trees N  keep the trees in --models-dir and grow N more on the
+                          given (typically recent, see --since) shots
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 try:
     import pandas as pd  # type: ignore
@@ -26,7 +37,10 @@ except ModuleNotFoundError:  # pragma: no cover
     f1_score = None
     joblib = None
 
-from .baseline import BaselineModels, build_baseline_models
+from ..data.feature_store import feature_file_columns, load_features
+from ..data.schema import ID_COLUMNS, TARGET_COLUMNS
+from .baseline import BaselineModels, build_baseline_models, warm_start_models
+from .compiled import export_compiled
 from .versioning import (
     create_model_metadata,
     update_manifest_for_model,
@@ -39,26 +53,99 @@ class TrainingReport:
     features: int
     mae_defect_risk: float | None
     f1_any_defect: float | None
+    cv_folds: int = 0
+    cv_mae_defect_risk: float | None = None
+    cv_f1_any_defect: float | None = None
+
+
+def _worker_count(n_jobs: Optional[int], tasks: int) -> int:
+    """joblib-style `n_jobs` (None = 1, -1 = all cores) capped at `tasks`."""
+
+    cpus = os.cpu_count() or 1
+    if n_jobs is None or n_jobs == 0:
+        workers = 1
+    elif n_jobs < 0:
+        workers = max(1, cpus + 1 + n_jobs)
+    else:
+        workers = n_jobs
+    return max(1, min(workers, tasks))
+
+
+def _kfold_indices(n_samples: int, folds: int, seed: int = 0) -> List[Tuple[np.ndarray, np.ndarray]]:
+    order = np.random.default_rng(seed).permutation(n_samples)
+    chunks = np.array_split(order, folds)
+    return [(np.concatenate(chunks[:i] + chunks[i + 1 :]), test) for i, test in enumerate(chunks)]
+
+
+def _cross_validate(X: "pd.DataFrame", df: "pd.DataFrame", folds: int, n_jobs: Optional[int]) -> Dict[str, float]:
+    """
+    Mean out-of-fold MAE/F1. Folds are fitted concurrently (tree building
+    releases the GIL), each with single-threaded forests so the total
+    parallelism stays at `n_jobs`.
+    """
+
+    if folds < 2:
+        raise ValueError("cv_folds must be >= 2")
+    if len(X) < folds:
+        raise ValueError(f"cv_folds={folds} needs at least {folds} samples, got {len(X)}")
+
+    def fit_fold(split: Tuple[np.ndarray, np.ndarray]) -> Dict[str, float]:
+        train, test = split
+        fold_models = build_baseline_models(n_jobs=1)
+        scores: Dict[str, float] = {}
+        if "defect_risk" in df.columns and mean_absolute_error is not None:
+            y = df["defect_risk"]
+            fold_models.defect_risk_regressor.fit(X.iloc[train], y.iloc[train])
+            preds = fold_models.defect_risk_regressor.predict(X.iloc[test])
+            scores["mae_defect_risk"] = float(mean_absolute_error(y.iloc[test], preds))
+        if "any_defect" in df.columns and f1_score is not None:
+            labelled = df["any_defect"].notna().to_numpy()
+            train, test = train[labelled[train]], test[labelled[test]]
+            y = df["any_defect"].astype(float)
+            fold_models.defect_classifier.fit(X.iloc[train], y.iloc[train].astype(int))
+            preds = fold_models.defect_classifier.predict(X.iloc[test])
+            scores["f1_any_defect"] = float(f1_score(y.iloc[test].astype(int), preds))
+        return scores
+
+    splits = _kfold_indices(len(X), folds)
+    with ThreadPoolExecutor(max_workers=_worker_count(n_jobs, folds)) as pool:
+        results = list(pool.map(fit_fold, splits))
+    return {name: float(np.mean([r[name] for r in results])) for name in results[0]}
+
 
+def _train_models(
+    df: "pd.DataFrame",
+    n_jobs: Optional[int] = None,
+    cv_folds: int = 0,
+    models: Optional[BaselineModels] = None,
+) -> Tuple[BaselineModels, TrainingReport]:
+    """
+    Fit the baseline models on `df` and report in-sample metrics (plus
+    cross-validated ones when `cv_folds >= 2`). Passing already fitted
+    `models` prepared by `warm_start_models` grows their forests instead of
+    starting from scratch; cross-validation always scores fresh models.
+    """
 
-def _train_models(df: "pd.DataFrame") -> Tuple[BaselineModels, TrainingReport]:
-    models = build_baseline_models()
+    models = models or build_baseline_models(n_jobs=n_jobs)
 
     mae_value: float | None = None
     f1_value: float | None = None
 
-    X = df.drop(columns=["defect_risk", "any_defect"], errors="ignore")
+    X = df.drop(columns=TARGET_COLUMNS + ID_COLUMNS, errors="ignore")
+    cv_scores = _cross_validate(X, df, cv_folds, n_jobs) if cv_folds else {}
 
-    if "defect_risk" in df.columns and mean_absolute_error is not None:
+    if "defect_risk" in df.columns and mean_absolute_error is not None and models.defect_risk_regressor is not None:
         y_risk = df["defect_risk"]
         models.defect_risk_regressor.fit(X, y_risk)
         preds = models.defect_risk_regressor.predict(X)
         mae_value = float(mean_absolute_error(y_risk, preds))
 
-    if "any_defect" in df.columns and f1_score is not None:
-        y_cls = df["any_defect"]
-        models.defect_classifier.fit(X, y_cls)
-        preds_cls = models.defect_classifier.predict(X)
+    if "any_defect" in df.columns and f1_score is not None and models.defect_classifier is not None:
+        # Shots without a QC defects record carry no label; train and score on the labelled ones.
+        labelled = df["any_defect"].notna()
+        y_cls = df.loc[labelled, "any_defect"].astype(int)
+        models.defect_classifier.fit(X[labelled], y_cls)
+        preds_cls = models.defect_classifier.predict(X[labelled])
         f1_value = float(f1_score(y_cls, preds_cls))
 
     report = TrainingReport(
@@ -66,10 +153,52 @@ def _train_models(df: "pd.DataFrame") -> Tuple[BaselineModels, TrainingReport]:
         features=int(X.shape[1]),
         mae_defect_risk=mae_value,
         f1_any_defect=f1_value,
+        cv_folds=cv_folds,
+        cv_mae_defect_risk=cv_scores.get("mae_defect_risk"),
+        cv_f1_any_defect=cv_scores.get("f1_any_defect"),
     )
     return models, report
 
 
+def _load_for_warm_start(models_dir: Path, df: "pd.DataFrame", extra_trees: int) -> Tuple[BaselineModels, "pd.DataFrame"]:
+    """
+    Load the saved models for an incremental refit and order the feature
+    columns of `df` like the ones the models were fitted on (sklearn would
+    otherwise silently re-bind the old trees to the new column order).
+    """
+
+    if joblib is None:
+        raise ImportError("joblib is required to load ML models; install with pur-mold-twin[ml]")
+    loaded: Dict[str, Optional[object]] = {}
+    for model_type in ("defect_risk", "defect_classifier"):
+        path = models_dir / f"{model_type}.pkl"
+        loaded[model_type] = joblib.load(path) if path.exists() else None
+    if all(model is None for model in loaded.values()):
+        raise FileNotFoundError(f"No models to warm-start in '{models_dir}'")
+
+    features = [c for c in df.columns if c not in TARGET_COLUMNS and c not in ID_COLUMNS]
+    for model_type, model in loaded.items():
+        names = getattr(model, "feature_names_in_", None)
+        if names is None:
+            continue
+        if set(names) != set(features):
+            raise ValueError(
+                f"Cannot warm-start {model_type}: features differ from the saved model "
+                f"(missing {sorted(set(names) - set(features))}, new {sorted(set(features) - set(names))})"
+            )
+        features = list(names)
+    rest = [c for c in df.columns if c not in features]
+    models = BaselineModels(defect_classifier=loaded["defect_classifier"], defect_risk_regressor=loaded["defect_risk"])
+    return warm_start_models(models, extra_trees), df[features + rest]
+
+
+def _dump_atomic(model: object, path: Path) -> None:
+    # Uncompressed dump (memory-mappable) replaced atomically for hot-reloading readers.
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+
+
 def _save_models(models: BaselineModels, out_dir: Path, feature_names: list[str], metrics: Dict[str, float]) -> Dict[str, str]:
     """
     Save models to disk and update manifest with version metadata.
@@ -93,7 +222,8 @@ def _save_models(models: BaselineModels, out_dir: Path, feature_names: list[str]
     if models.defect_risk_regressor is not None:
         model_type = "defect_risk"
         path = out_dir / f"{model_type}.pkl"
-        joblib.dump(models.defect_risk_regressor, path)
+        _dump_atomic(models.defect_risk_regressor, path)
+        export_compiled(models.defect_risk_regressor, out_dir, model_type)
         paths[model_type] = str(path)
         
         # Update manifest
@@ -111,7 +241,8 @@ def _save_models(models: BaselineModels, out_dir: Path, feature_names: list[str]
     if models.defect_classifier is not None:
         model_type = "defect_classifier"
         path = out_dir / f"{model_type}.pkl"
-        joblib.dump(models.defect_classifier, path)
+        _dump_atomic(models.defect_classifier, path)
+        export_compiled(models.defect_classifier, out_dir, model_type)
         paths[model_type] = str(path)
         
         # Update manifest
@@ -138,6 +269,10 @@ def _write_metrics_report(report: TrainingReport, model_paths: Dict[str, str], o
         lines.append(f"- MAE defect_risk: {report.mae_defect_risk:.4f}")
     if report.f1_any_defect is not None:
         lines.append(f"- F1 any_defect: {report.f1_any_defect:.4f}")
+    if report.cv_mae_defect_risk is not None:
+        lines.append(f"- CV ({report.cv_folds}-fold) MAE defect_risk: {report.cv_mae_defect_risk:.4f}")
+    if report.cv_f1_any_defect is not None:
+        lines.append(f"- CV ({report.cv_folds}-fold) F1 any_defect: {report.cv_f1_any_defect:.4f}")
     lines.append("")
     lines.append("## Model artifacts")
     lines.append("")
@@ -153,6 +288,19 @@ def main(argv: list[str] | None = None) -> None:
     parser.add_argument("--features", required=True, type=Path, help="Path to features parquet/CSV file.")
     parser.add_argument("--models-dir", type=Path, default=Path("models"), help="Directory for saved models.")
     parser.add_argument("--metrics-path", type=Path, default=Path("reports/ml/metrics.md"), help="Metrics report path.")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None, help="Only rows with timestamp >= ISO date.")
+    parser.add_argument("--until", type=datetime.fromisoformat, default=None, help="Only rows with timestamp < ISO date.")
+    parser.add_argument(
+        "--float32", action="store_true", help="Load features as float32 (halves memory; trees train on float32)."
+    )
+    parser.add_argument("--n-jobs", type=int, default=None, help="Cores for tree building / CV folds (-1 = all).")
+    parser.add_argument("--cv-folds", type=int, default=0, help="K-fold cross-validation (K >= 2); 0 disables.")
+    parser.add_argument(
+        "--warm-start-trees",
+        type=int,
+        default=0,
+        help="Grow N trees on the given shots on top of the models already in --models-dir.",
+    )
     args = parser.parse_args(argv)
 
     if pd is None:
@@ -161,21 +309,33 @@ def main(argv: list[str] | None = None) -> None:
     if not args.features.exists():
         raise FileNotFoundError(f"Features file '{args.features}' not found")
 
-    if args.features.suffix.lower() == ".csv":
-        df = pd.read_csv(args.features)
-    else:
-        df = pd.read_parquet(args.features)
+    # Identifier columns are never model inputs: skip reading them.
+    columns = [c for c in feature_file_columns(args.features) if c not in ID_COLUMNS]
+    df = load_features(
+        args.features, columns=columns, start_time=args.since, end_time=args.until, float32=args.float32
+    )
+
+    base_models = None
+    if args.warm_start_trees:
+        base_models, df = _load_for_warm_start(args.models_dir, df, args.warm_start_trees)
+        for model in (base_models.defect_classifier, base_models.defect_risk_regressor):
+            if model is not None and args.n_jobs is not None:
+                model.set_params(n_jobs=args.n_jobs)
 
-    models, report = _train_models(df)
+    models, report = _train_models(df, n_jobs=args.n_jobs, cv_folds=args.cv_folds, models=base_models)
     
     # Collect feature names and metrics for manifest
-    X = df.drop(columns=["defect_risk", "any_defect"], errors="ignore")
+    X = df.drop(columns=TARGET_COLUMNS + ID_COLUMNS, errors="ignore")
     feature_names = list(X.columns)
     metrics_dict = {}
     if report.mae_defect_risk is not None:
         metrics_dict["mae_defect_risk"] = report.mae_defect_risk
     if report.f1_any_defect is not None:
         metrics_dict["f1_any_defect"] = report.f1_any_defect
+    if report.cv_mae_defect_risk is not None:
+        metrics_dict["mae_defect_risk_cv"] = report.cv_mae_defect_risk
+    if report.cv_f1_any_defect is not None:
+        metrics_dict["f1_any_defect_cv"] = report.cv_f1_any_defect
     
     model_paths = _save_models(models, args.models_dir, feature_names, metrics_dict)
     _write_metrics_report(report, model_paths, args.metrics_path)
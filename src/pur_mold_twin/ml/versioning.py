@@ -10,6 +10,7 @@ This module provides:
 from __future__ import annotations
 
 import json
+import os
 import subprocess
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -135,8 +136,11 @@ def save_manifest(manifest: ModelManifest, models_dir: Path = Path("models")) ->
     manifest.updated_at = datetime.now().isoformat()
     
     manifest_path = models_dir / "manifest.json"
-    with open(manifest_path, "w", encoding="utf-8") as f:
+    # Write-then-rename so a hot-reloading reader never sees a partial manifest.
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(manifest.to_dict(), f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
 
 
 def load_manifest(models_dir: Path = Path("models")) -> Optional[ModelManifest]:
@@ -4,12 +4,17 @@ Random/grid search style Process Optimizer for PUR-MOLD-TWIN.
 The initial implementation follows TODO1 §9-10 requirements by sampling
 temperatures i demold time, uruchamiając symulacje MVP 0D oraz filtrując je
 przez proste ograniczenia/diagnozy.
+
+With a `KPISurrogate` (analysis.surrogate) trained over the three
+temperatures, candidates whose predicted KPIs violate a constraint by more
+than the surrogate's error margin are rejected without a simulation; every
+candidate near a limit or outside the training box is simulated as before.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
 
 import random
 
@@ -19,6 +24,15 @@ from ..core import MVP0DSimulator, ProcessConditions, QualityTargets, Simulation
 from ..core.mvp0d import SimulationResult
 from .constraints import ConstraintReport, evaluate_constraints
 
+if TYPE_CHECKING:  # pragma: no cover - analysis imports the data/ETL stack
+    from ..analysis.surrogate import KPISurrogate
+
+
+# Series read by `evaluate_constraints`; candidates record only these (KPIs are always full resolution).
+SEARCH_CHANNELS = ["time_s", "alpha", "hardness_shore"]
+# Process fields set per candidate; a screening surrogate must vary all of them.
+CANDIDATE_PARAMETERS = ["process.T_polyol_in_C", "process.T_iso_in_C", "process.T_mold_init_C"]
+
 
 class OptimizerBounds(BaseModel):
     """Numerical ranges for decision variables."""
@@ -69,6 +83,7 @@ class CandidateEvaluation:
     t_demold_window: Tuple[Optional[float], Optional[float]]
     p_max_bar: float
     quality_status: str
+    screened: bool = False
 
 
 @dataclass
@@ -92,8 +107,15 @@ class ProcessOptimizer:
         self,
         simulator: Optional[MVP0DSimulator] = None,
         sim_config: Optional[SimulationConfig] = None,
+        surrogate: Optional[KPISurrogate] = None,
     ) -> None:
         self.simulator = simulator or MVP0DSimulator(config=sim_config)
+        self.surrogate = surrogate
+        # Candidates run on the caller's simulator with a per-run override that records
+        # only the series the constraints need.
+        self._search_config = self.simulator.config.model_copy(
+            update={"record": SEARCH_CHANNELS, "output_every": 1, "output_points": None}
+        )
 
     def optimize(
         self,
@@ -105,11 +127,15 @@ class ProcessOptimizer:
     ) -> OptimizationResult:
         config = config or OptimizationConfig()
         rng = random.Random(config.random_seed)
+        if self.surrogate is not None and not self.surrogate.matches(
+            material, base_process, mold, quality, self.simulator.config, varied=CANDIDATE_PARAMETERS
+        ):
+            raise ValueError("Surrogate was trained for other inputs or does not vary the candidate temperatures.")
 
         evaluations: List[CandidateEvaluation] = []
         best_idx = None
         best_objective = float("inf")
-        best_result: Optional[SimulationResult] = None
+        best_process: Optional[ProcessConditions] = None
         best_candidate: Optional[OptimizationCandidate] = None
         best_constraints: Optional[ConstraintReport] = None
 
@@ -122,7 +148,17 @@ class ProcessOptimizer:
                     "T_mold_init_C": candidate.T_mold_init_C,
                 }
             )
-            sim_result = self.simulator.run(material, process_variant, mold, quality)
+            screened = self._screen(candidate, material, process_variant, mold, quality, config)
+            if screened is not None:
+                evaluations.append(screened)
+                if screened.objective < best_objective:
+                    best_objective = screened.objective
+                    best_idx = len(evaluations) - 1
+                    best_process = process_variant
+                    best_candidate = candidate
+                    best_constraints = screened.constraints
+                continue
+            sim_result = self.simulator.run(material, process_variant, mold, quality, config=self._search_config)
             constraints = evaluate_constraints(
                 result=sim_result,
                 quality=quality,
@@ -149,13 +185,26 @@ class ProcessOptimizer:
             if objective < best_objective:
                 best_objective = objective
                 best_idx = len(evaluations) - 1
-                best_result = sim_result
+                best_process = process_variant
                 best_candidate = candidate
                 best_constraints = constraints
 
-        if best_idx is None or best_result is None or best_candidate is None or best_constraints is None:
+        if best_idx is None or best_process is None or best_candidate is None or best_constraints is None:
             raise RuntimeError("Optimizer failed to evaluate any candidates.")
 
+        # Only the winner is re-run with the caller's output settings (full series by default).
+        best_result = self.simulator.run(material, best_process, mold, quality)
+        if evaluations[best_idx].screened:
+            # No simulated candidate beat it: report constraints from a simulation, not the surrogate.
+            checked = best_result if self._records_search_series() else self.simulator.run(
+                material, best_process, mold, quality, config=self._search_config
+            )
+            best_constraints = evaluate_constraints(
+                result=checked,
+                quality=quality,
+                candidate_demold_s=best_candidate.t_demold_s,
+                t_cycle_max_s=config.t_cycle_max_s,
+            )
         return OptimizationResult(
             best_candidate=best_candidate,
             best_simulation=best_result,
@@ -163,6 +212,14 @@ class ProcessOptimizer:
             evaluations=evaluations,
         )
 
+    def _records_search_series(self) -> bool:
+        sim_config = self.simulator.config
+        return (
+            set(SEARCH_CHANNELS) <= set(sim_config.recorded_channels())
+            and sim_config.output_every == 1
+            and sim_config.output_points is None
+        )
+
     def _sample_candidate(
         self, rng: random.Random, bounds: OptimizerBounds
     ) -> OptimizationCandidate:
@@ -173,16 +230,92 @@ class ProcessOptimizer:
             t_demold_s=float(rng.uniform(*bounds.t_demold_s)),
         )
 
+    def _screen(
+        self,
+        candidate: OptimizationCandidate,
+        material,
+        process: ProcessConditions,
+        mold,
+        quality: QualityTargets,
+        config: OptimizationConfig,
+    ) -> Optional[CandidateEvaluation]:
+        """Evaluation of a candidate the surrogate shows clearly infeasible, else None (simulate it)."""
+
+        if self.surrogate is None:
+            return None
+        prediction = self.surrogate.predict(self.surrogate.values_for(material, process, mold, self.simulator.config))
+        if not prediction.in_envelope:
+            return None
+        kpis = prediction.kpis
+        margin = self.surrogate.margin
+        violations: List[str] = []
+        penalty = 0.0
+
+        window = (kpis["t_demold_min_s"], kpis["t_demold_max_s"])
+        window_ok = not (
+            candidate.t_demold_s < window[0] - margin("t_demold_min_s")
+            or candidate.t_demold_s > window[1] + margin("t_demold_max_s")
+        )
+        if not window_ok:
+            violations.append("Demold target outside predicted safe window (surrogate).")
+            penalty += 1.5
+
+        p_limit = quality.p_max_allowable_bar * 100_000.0
+        if kpis["p_max_Pa"] - margin("p_max_Pa") > p_limit:
+            violations.append(
+                f"Pressure {kpis['p_max_Pa']/100000:.2f} bar exceeds limit {quality.p_max_allowable_bar:.2f} bar "
+                "(surrogate)."
+            )
+            penalty += (kpis["p_max_Pa"] - p_limit) / max(p_limit, 1.0)
+
+        if kpis["defect_risk"] - margin("defect_risk") > quality.defect_risk_max:
+            violations.append(
+                f"Defect risk {kpis['defect_risk']:.2f} > limit {quality.defect_risk_max:.2f} (surrogate)."
+            )
+            penalty += kpis["defect_risk"] - quality.defect_risk_max
+
+        if not violations:
+            return None
+        constraints = ConstraintReport(
+            feasible=False,
+            violations=violations,
+            penalty=penalty,
+            window_ok=window_ok,
+            demold_time_s=candidate.t_demold_s,
+            demold_window=window,
+        )
+        return CandidateEvaluation(
+            candidate=candidate,
+            objective=self._penalized_objective(
+                candidate, kpis["p_max_Pa"], constraints, config.prefer_lower_pressure
+            ),
+            constraints=constraints,
+            feasible=False,
+            t_demold_window=window,
+            p_max_bar=kpis["p_max_Pa"] / 100_000.0,
+            quality_status="SCREENED",
+            screened=True,
+        )
+
     @staticmethod
     def _objective_value(
         candidate: OptimizationCandidate,
         result: SimulationResult,
         constraints: ConstraintReport,
         prefer_lower_pressure: bool,
+    ) -> float:
+        return ProcessOptimizer._penalized_objective(candidate, result.p_max_Pa, constraints, prefer_lower_pressure)
+
+    @staticmethod
+    def _penalized_objective(
+        candidate: OptimizationCandidate,
+        p_max_Pa: float,
+        constraints: ConstraintReport,
+        prefer_lower_pressure: bool,
     ) -> float:
         base_value = candidate.t_demold_s
         if prefer_lower_pressure:
-            base_value += 0.05 * (result.p_max_Pa / 100_000.0)
+            base_value += 0.05 * (p_max_Pa / 100_000.0)
         if not constraints.feasible:
             penalty_scale = 1e5 * max(1.0, constraints.penalty)
             return base_value + penalty_scale
@@ -1,19 +1,25 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from ..core import MVP0DSimulator, ProcessConditions, MoldProperties, QualityTargets, SimulationConfig
+from ..core.serialization import result_to_dict
 from ..material_db.loader import load_material_catalog
 from ..material_db.models import MaterialSystem
 from ..optimizer import OptimizationConfig, OptimizerBounds, ProcessOptimizer
-from ..logging.features import compute_basic_features
-from ..ml.inference import attach_ml_predictions
+from ..optimizer.search import CANDIDATE_PARAMETERS
+from ..logging.features import compute_feature_row
+from ..ml.inference import attach_ml_predictions_batch
+
+if TYPE_CHECKING:  # pragma: no cover - analysis imports the data/ETL stack
+    from ..analysis.surrogate import KPISurrogate
 
 
 @dataclass
 class APIConfig:
     systems_catalog_path: Optional[str] = "configs/systems/jr_purtec_catalog.yaml"
+    surrogate_path: Optional[str] = None
 
 
 class APIService:
@@ -22,6 +28,7 @@ class APIService:
     def __init__(self, config: Optional[APIConfig] = None) -> None:
         self.config = config or APIConfig()
         self._systems: Optional[dict[str, MaterialSystem]] = None
+        self._surrogate: Optional[KPISurrogate] = None
 
     def _load_systems(self) -> dict[str, MaterialSystem]:
         if self._systems is None:
@@ -30,6 +37,13 @@ class APIService:
             self._systems = load_material_catalog(self.config.systems_catalog_path)
         return self._systems
 
+    def _load_surrogate(self) -> Optional[KPISurrogate]:
+        if self._surrogate is None and self.config.surrogate_path:
+            from ..analysis.surrogate import KPISurrogate  # local import: only needed with a surrogate
+
+            self._surrogate = KPISurrogate.load(self.config.surrogate_path)
+        return self._surrogate
+
     def _resolve_system(self, payload: Dict[str, Any]) -> MaterialSystem:
         if "system" in payload and isinstance(payload["system"], dict):
             return MaterialSystem(**payload["system"])
@@ -41,23 +55,30 @@ class APIService:
             raise ValueError(f"Unknown system_id '{system_id}'")
         return systems[system_id]
 
-    def simulate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Run a simulation from a JSON-like payload."""
-
+    def _run_simulation(self, payload: Dict[str, Any]) -> tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
         system = self._resolve_system(payload)
         process = ProcessConditions(**payload["process"])
         mold = MoldProperties(**payload["mold"])
         quality = QualityTargets(**payload.get("quality", {})) if payload.get("quality") else QualityTargets()
         sim_cfg = SimulationConfig(**payload.get("simulation", {})) if payload.get("simulation") else SimulationConfig()
 
+        output = payload.get("output") or {}
+
         simulator = MVP0DSimulator(sim_cfg)
         result = simulator.run(system, process, mold, quality)
-        result_dict = result.to_dict()
-
-        # Optional ML predictions (best-effort)
+        full_dict = result_to_dict(result)
+        result_dict = full_dict if not output else result_to_dict(
+            result,
+            fields=output.get("fields"),
+            kpi_only=bool(output.get("kpi_only", False)),
+            precision=output.get("precision"),
+            series_format=output.get("series_format", "list"),
+        )
+
+        features_row = None
         try:
-            features_df = compute_basic_features(
-                result_dict,
+            features_row = compute_feature_row(
+                full_dict,
                 measured=None,
                 qc=None,
                 process={
@@ -69,12 +90,39 @@ class APIService:
                     "mixing_eff": process.mixing_eff,
                 },
             )
-            features_row = dict(features_df.iloc[0])
-            result_dict = attach_ml_predictions(result_dict, features_row)
         except Exception:
             pass
+        return result_dict, features_row
+
+    def simulate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a simulation from a JSON-like payload.
+
+        Optional `payload["output"]` shapes the response (see
+        `core.serialization.result_to_dict`): `{"kpi_only": true}` returns
+        KPI scalars only, `fields`, `precision` (significant digits) and
+        `series_format` ("list" or "base64") trim the time series.
+        """
+
+        return self.simulate_batch([payload])[0]
+
+    def simulate_batch(self, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run several simulations; ML predictions are attached in one batched call."""
 
-        return result_dict
+        runs = [self._run_simulation(payload) for payload in payloads]
+        results = [result_dict for result_dict, _ in runs]
+
+        # Optional ML predictions (best-effort)
+        with_features = [i for i, (_, row) in enumerate(runs) if row is not None]
+        if with_features:
+            try:
+                attach_ml_predictions_batch(
+                    [results[i] for i in with_features],
+                    [runs[i][1] for i in with_features],
+                )
+            except Exception:
+                pass
+        return results
 
     def optimize(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Run process optimization from a JSON-like payload."""
@@ -89,27 +137,74 @@ class APIService:
         bounds_model = OptimizerBounds(**bounds) if bounds else OptimizerBounds()
         opt_config = OptimizationConfig(bounds=bounds_model, **opt_cfg)
 
-        optimizer = ProcessOptimizer()
+        # Only KPI metrics are returned, so the baseline and best runs keep no series.
+        sim_config = SimulationConfig(record="kpi_only")
+        surrogate = self._load_surrogate()
+        if surrogate is not None and not surrogate.matches(
+            system, process, mold, quality, sim_config, varied=CANDIDATE_PARAMETERS
+        ):
+            surrogate = None
+        optimizer = ProcessOptimizer(sim_config=sim_config, surrogate=surrogate)
         result = optimizer.optimize(system, process, mold, quality, opt_config)
-        baseline = result.baseline
-        optimized = result.best_constraints
+        baseline = optimizer.simulator.run(system, process, mold, quality)
 
-        def _metrics(constraints) -> dict:
-            if constraints is None:
-                return {}
+        def _metrics(sim) -> dict:
             return {
-                "quality_status": constraints.quality_status,
-                "pressure_status": constraints.pressure_status,
-                "t_demold_opt_s": constraints.t_demold_opt_s,
-                "p_max_bar": constraints.p_max_bar,
-                "rho_moulded": constraints.rho_moulded,
-                "H_demold_shore": constraints.H_demold_shore,
-                "defect_risk": constraints.defect_risk,
+                "quality_status": sim.quality_status,
+                "pressure_status": sim.pressure_status,
+                "t_demold_opt_s": sim.t_demold_opt_s,
+                "p_max_bar": sim.p_max_Pa / 100_000.0,
+                "rho_moulded": sim.rho_moulded,
+                "H_demold_shore": sim.H_demold_shore,
+                "defect_risk": sim.defect_risk,
             }
 
         return {
             "baseline": _metrics(baseline),
-            "optimized": _metrics(optimized),
-            "candidate": result.best_candidate.model_dump() if result.best_candidate else None,
+            "optimized": _metrics(result.best_simulation),
+            "feasible": result.feasible,
+            "candidate": asdict(result.best_candidate) if result.best_candidate else None,
+            "screened": sum(evaluation.screened for evaluation in result.evaluations),
+        }
+
+    def predict(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fast KPI estimate from the configured surrogate (`APIConfig.surrogate_path`).
+
+        Falls back to a KPI-only simulation when no surrogate is configured,
+        the fixed inputs differ from its training scenario, the point lies
+        outside its parameter box or a KPI is predicted near a limit;
+        `source` and `reason` tell which path answered.
+        """
+
+        system = self._resolve_system(payload)
+        process = ProcessConditions(**payload["process"])
+        mold = MoldProperties(**payload["mold"])
+        quality = QualityTargets(**payload.get("quality", {})) if payload.get("quality") else QualityTargets()
+        sim_cfg = SimulationConfig(**payload.get("simulation", {})) if payload.get("simulation") else SimulationConfig()
+
+        surrogate = self._load_surrogate()
+        if surrogate is None:
+            reason = "no_surrogate"
+        elif not surrogate.matches(system, process, mold, quality, sim_cfg):
+            reason = "inputs_mismatch"
+        else:
+            prediction = surrogate.predict(surrogate.values_for(system, process, mold, sim_cfg))
+            flags = surrogate.boundary_flags(prediction.kpis, quality)
+            if not prediction.in_envelope:
+                reason = "outside_envelope"
+            elif flags:
+                reason = "near_limit:" + ",".join(flags)
+            else:
+                return {"source": "surrogate", "kpis": prediction.kpis, "error": prediction.error, "reason": None}
+
+        from ..analysis.surrogate import SURROGATE_KPIS  # local import, see `_load_surrogate`
+
+        result = MVP0DSimulator(sim_cfg.model_copy(update={"record": "kpi_only"})).run(system, process, mold, quality)
+        return {
+            "source": "simulation",
+            "kpis": {kpi: getattr(result, kpi) for kpi in SURROGATE_KPIS},
+            "error": None,
+            "reason": reason,
         }
 
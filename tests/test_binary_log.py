@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pur_mold_twin.core.types import SimulationResult
+from pur_mold_twin.data.dataset import _load_simulation_payload, _SimulationResolver
+from pur_mold_twin.logging.binary_log import SimulationLogSegment, decode_simulation_log, encode_simulation_log
+from pur_mold_twin.logging.logger import build_simulation_log, load_simulation_log, save_simulation_log
+
+
+SAMPLE_SIM = Path("tests/data/ml/sample_sim_result.json")
+
+
+def _log(shot_id: str = "S1", scale: float = 1.0):
+    payload = json.loads(SAMPLE_SIM.read_text(encoding="utf-8"))
+    payload = payload.get("simulation", payload)
+    payload["T_core_K"] = [value * scale for value in payload["T_core_K"]]
+    payload["diagnostics"] = ["vent closed early"]
+    return build_simulation_log(SimulationResult(**payload), metadata={"shot_id": shot_id}, inputs={"mold": "M1"})
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+def test_binary_log_roundtrip(tmp_path: Path, compression) -> None:
+    if compression == "zstd":
+        pytest.importorskip("pyarrow")
+    log = _log()
+    path = tmp_path / "run.npz"
+
+    save_simulation_log(log, path, compression=compression)
+    loaded = load_simulation_log(path)
+
+    assert loaded.metadata == {"shot_id": "S1"}
+    assert loaded.inputs == {"mold": "M1"}
+    assert loaded.simulation.to_dict() == log.simulation
+    np.testing.assert_array_equal(loaded.simulation["T_core_K"], log.simulation["T_core_K"])
+
+
+def test_binary_log_is_smaller_than_json(tmp_path: Path) -> None:
+    time_s = np.linspace(0.0, 600.0, 1201)
+    result = SimulationResult(time_s=time_s.tolist(), T_core_K=(300.0 + np.sqrt(time_s)).tolist())
+    log = build_simulation_log(result)
+    save_simulation_log(log, tmp_path / "run.json")
+    save_simulation_log(log, tmp_path / "run.npz")
+
+    assert (tmp_path / "run.npz").stat().st_size < (tmp_path / "run.json").stat().st_size
+
+
+def test_segment_appends_runs_and_reads_by_index(tmp_path: Path) -> None:
+    segment = SimulationLogSegment(tmp_path / "runs.simseg")
+    segment.append(_log("S1", 1.0))
+    segment.append(_log("S2", 1.1), compression="gzip")
+    with pytest.raises(ValueError):
+        segment.append(_log("S1"))
+
+    reopened = SimulationLogSegment(tmp_path / "runs.simseg")
+    assert [entry["run_id"] for entry in reopened.entries()] == ["S1", "S2"]
+    assert reopened.find(shot_id="S2") == ["S2"]
+    second = reopened.read("S2").simulation
+    np.testing.assert_allclose(second["T_core_K"], np.asarray(_log().simulation["T_core_K"]) * 1.1)
+
+    resolve = _SimulationResolver(tmp_path / "runs.simseg")
+    assert resolve("S1")["rho_moulded"] == _log().simulation["rho_moulded"]
+    assert resolve("missing") == {}
+
+
+def test_dataset_reads_binary_payload_lazily(tmp_path: Path) -> None:
+    path = tmp_path / "run.npz"
+    save_simulation_log(_log(), path)
+
+    payload = _load_simulation_payload(path)
+
+    assert payload._loaded == {}
+    assert len(payload["time_s"]) == len(_log().simulation["time_s"])
+    assert list(payload._loaded) == ["time_s"]
+
+
+def test_decode_rejects_foreign_npz() -> None:
+    import io
+
+    buffer = io.BytesIO()
+    np.savez(buffer, __header__=np.frombuffer(b'{"format": "other"}', dtype=np.uint8))
+    with pytest.raises(ValueError):
+        decode_simulation_log(buffer.getvalue())
+    assert decode_simulation_log(encode_simulation_log(_log())).metadata["shot_id"] == "S1"
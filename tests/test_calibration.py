@@ -46,3 +46,13 @@ def test_fit_parameters_converges_on_linear_model():
     assert result.cost < 1e-3
     assert abs(result.params["a"] - true_params["a"]) < 0.1
     assert abs(result.params["b"] - true_params["b"]) < 0.1
+
+
+def test_rmse_core_temperature_accepts_dataframe():
+    pd = pytest.importorskip("pandas")
+    sim_time = [0, 10, 20]
+    sim_temp = [300.0, 310.0, 320.0]
+    ref_rows = [{"time_s": 5.0, "T_core_C": 35.0}, {"time_s": 15.0, "T_core_C": 40.0}]
+    expected = rmse_core_temperature(sim_time, sim_temp, ref_rows)
+    rmse = rmse_core_temperature(sim_time, sim_temp, pd.DataFrame(ref_rows))
+    assert np.isclose(rmse, expected)
@@ -20,3 +20,28 @@ def test_missing_meta_raises():
     (fake_dataset / "measurements").mkdir(parents=True, exist_ok=True)
     with pytest.raises(FileNotFoundError):
         load_calibration_dataset(fake_dataset)
+
+
+def test_timeseries_are_columnar_float64():
+    dataset = load_calibration_dataset(SAMPLE_DIR)
+    frame = dataset.core_temperature
+    assert list(frame.columns) == ["time_s", "T_core_C"]
+    assert frame["time_s"].dtype == "float64"
+    assert frame["T_core_C"].iloc[-1] == pytest.approx(60.0)
+
+
+def test_parquet_timeseries_loaded(tmp_path: Path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    measurements = tmp_path / "measurements"
+    measurements.mkdir()
+    (measurements / "meta.yaml").write_text("shot_id: SHOT_PQ\n", encoding="utf-8")
+    pd.DataFrame({"time_s": [0, 1, 2], "p_total_bar": [1.0, 1.4, 1.9]}).to_parquet(
+        measurements / "pressure.parquet", index=False
+    )
+
+    dataset = load_calibration_dataset(tmp_path)
+
+    assert dataset.has_pressure()
+    assert dataset.pressure["time_s"].dtype == "float64"
+    assert dataset.pressure["p_total_bar"].max() == pytest.approx(1.9)
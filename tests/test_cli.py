@@ -174,3 +174,15 @@ def test_optimize_cli_runs_with_few_samples():
     payload = json.loads(result.stdout.strip())
     assert "candidate" in payload
     assert "optimized" in payload and "p_max_bar" in payload["optimized"]
+
+
+@pytest.mark.skipif(not CLI_DEPS_AVAILABLE, reason="CLI deps (pydantic/ruamel) not installed")
+def test_run_sim_cli_kpi_only_json_is_small():
+    result = runner.invoke(
+        app, ["run-sim", "--scenario", "configs/scenarios/use_case_1.yaml", "--kpi-only", "--precision", "4"]
+    )
+    assert result.exit_code == 0
+    data = json.loads(result.stdout.strip())
+    assert "time_s" not in data
+    assert "rho_moulded" in data and "t_demold_opt_s" in data
+    assert len(json.dumps(data)) < 1024
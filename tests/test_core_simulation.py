@@ -257,3 +257,28 @@ def test_dimension_1d_equals_0d_for_single_layer() -> None:
     result_1d = sim_1d.run(SYSTEM_R1, process, mold, TEST_QUALITY)
     assert abs(result_0d.rho_moulded - result_1d.rho_moulded) <= 5.0
     assert abs(result_0d.p_max_Pa - result_1d.p_max_Pa) <= 5.0e4
+
+
+def test_recording_options_keep_full_resolution_kpis() -> None:
+    process = _build_process()
+    mold = _build_mold(process)
+    full = MVP0DSimulator().run(SYSTEM_R1, process, mold, TEST_QUALITY)
+
+    selected = MVP0DSimulator(SimulationConfig(record=["T_core_K", "p_total_Pa"], output_points=50)).run(
+        SYSTEM_R1, process, mold, TEST_QUALITY
+    )
+    assert len(selected.T_core_K) <= 50 and selected.T_core_K[-1] == full.T_core_K[-1]
+    assert selected.time_s == [] and selected.alpha == []
+
+    decimated = MVP0DSimulator(SimulationConfig(output_every=10)).run(SYSTEM_R1, process, mold, TEST_QUALITY)
+    assert decimated.time_s == full.time_s[::10]
+
+    kpi_only = MVP0DSimulator(SimulationConfig(record="kpi_only")).run(SYSTEM_R1, process, mold, TEST_QUALITY)
+    assert kpi_only.time_s == [] and kpi_only.hardness_shore == []
+    for result in (selected, decimated, kpi_only):
+        assert result.p_max_Pa == full.p_max_Pa
+        assert result.t_demold_opt_s == full.t_demold_opt_s
+        assert result.H_demold_shore == full.H_demold_shore
+
+    with pytest.raises(ValueError):
+        SimulationConfig(record=["T_nope"])
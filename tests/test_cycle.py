@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+
+from pur_mold_twin import MVP0DSimulator, QualityTargets
+from pur_mold_twin.configs import load_process_scenario
+from pur_mold_twin.core.cycle import CycleConfig, MoldCycleSimulator
+from pur_mold_twin.material_db.loader import load_material_catalog
+
+
+SCENARIO = load_process_scenario("configs/scenarios/use_case_1.yaml")
+SYSTEM = load_material_catalog("configs/systems/jr_purtec_catalog.yaml")[SCENARIO.system_id]
+QUALITY = QualityTargets(
+    rho_moulded_min=20.0,
+    rho_moulded_max=400.0,
+    core_temp_max_C=120.0,
+    p_max_allowable_bar=10.0,
+    H_demold_min_shore=30.0,
+    H_24h_min_shore=40.0,
+)
+COLD_START = SCENARIO.process.model_copy(update={"T_mold_init_C": 20.0})
+
+
+def test_shots_carry_mold_temperature() -> None:
+    result = MoldCycleSimulator(SCENARIO.simulation).run(
+        SYSTEM, COLD_START, SCENARIO.mold, QUALITY, CycleConfig(shots=3, steady_tol_K=0.0)
+    )
+
+    first, second = result.shots[0], result.shots[1]
+    assert second.T_mold_start_K == first.T_mold_end_K
+    assert first.T_mold_start_K < first.T_mold_end_K < first.T_mold_demold_K
+    assert second.start_time_s == first.cycle_time_s == first.t_demold_s + 60.0
+
+    # Each shot equals a standalone run started from the carried mold temperature.
+    carried = COLD_START.model_copy(update={"T_mold_init_C": second.T_mold_start_K - 273.15})
+    standalone = MVP0DSimulator(SCENARIO.simulation).run(SYSTEM, carried, SCENARIO.mold, QUALITY)
+    assert second.t_demold_s == standalone.t_demold_opt_s
+    assert second.p_max_Pa == standalone.p_max_Pa
+
+
+def test_shift_reaches_steady_state_and_reuses_shots() -> None:
+    result = MoldCycleSimulator(SCENARIO.simulation).run(
+        SYSTEM, COLD_START, SCENARIO.mold, QUALITY, CycleConfig(shift_duration_s=8 * 3600.0, steady_tol_K=0.05)
+    )
+
+    assert result.steady and result.elapsed_s >= 8 * 3600.0
+    assert result.simulated_shots < len(result.shots) / 2
+    assert not result.shots[-1].simulated
+    assert result.steady_kpis["T_mold_start_C"] > 35.0
+    assert result.steady_kpis["shots_per_hour"] == pytest.approx(3600.0 / result.shots[-1].cycle_time_s)
+
+
+def test_cycle_length_is_required() -> None:
+    with pytest.raises(ValueError):
+        CycleConfig()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from pur_mold_twin.cli.main import app
+from pur_mold_twin.ml.drift_monitor import ColumnSketch, DriftMonitor
+
+
+runner = CliRunner()
+
+
+def _frame(rng: np.random.Generator, size: int, shift: float = 0.0) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "sim_p_max_bar": rng.normal(3.5 + shift, 0.2, size),
+            "any_defect": (rng.random(size) < 0.2 + shift / 10).astype(float),
+        }
+    )
+
+
+def test_column_sketch_matches_batch_statistics() -> None:
+    rng = np.random.default_rng(0)
+    values = rng.normal(10.0, 2.0, 5000)
+    sketch = ColumnSketch(edges=np.quantile(values, np.linspace(0, 1, 41)))
+    for part in np.array_split(values, 7):
+        sketch.update(part)
+
+    assert sketch.count == values.size
+    assert sketch.mean == pytest.approx(values.mean())
+    assert sketch.variance == pytest.approx(values.var(ddof=1))
+    assert sketch.quantile(0.5) == pytest.approx(np.median(values), abs=0.1)
+    assert int(sketch.counts.sum()) == values.size
+
+
+def test_drift_monitor_rolling_window_and_persistence(tmp_path: Path) -> None:
+    rng = np.random.default_rng(1)
+    monitor = DriftMonitor.from_baseline(_frame(rng, 2000), bucket_s=60.0)
+    monitor.update(_frame(rng, 500), now=1_000.0)
+    monitor.update(_frame(rng, 500, shift=1.0), now=1_000.0 + 3_600.0)
+
+    recent = monitor.report(window_s=120.0, now=1_000.0 + 3_600.0)
+    state = monitor.save(tmp_path / "drift_state.json")
+    restored = DriftMonitor.load(state)
+    full = restored.report()
+
+    p_recent = next(m for m in recent.metrics if m.column == "sim_p_max_bar")
+    p_full = next(m for m in full.metrics if m.column == "sim_p_max_bar")
+    assert p_recent.current_count == 500
+    assert p_full.current_count == 1000
+    assert p_recent.abs_delta == pytest.approx(1.0, abs=0.1)
+    assert p_recent.psi > 1.0 and p_recent.ks > 0.9
+    assert state.stat().st_size < 10_000
+
+
+def test_check_drift_cli_with_state(tmp_path: Path) -> None:
+    rng = np.random.default_rng(2)
+    baseline = tmp_path / "baseline.csv"
+    current = tmp_path / "current.csv"
+    _frame(rng, 300).to_csv(baseline, index=False)
+    _frame(rng, 100, shift=1.0).to_csv(current, index=False)
+    state = tmp_path / "state.json"
+
+    result = runner.invoke(
+        app, ["check-drift", "--baseline", str(baseline), "--current", str(current), "--state", str(state)]
+    )
+
+    assert result.exit_code == 2
+    assert "psi=" in result.stdout
+    assert state.exists()
+
+
+def test_update_from_file_skips_rows_already_ingested(tmp_path: Path) -> None:
+    rng = np.random.default_rng(3)
+    monitor = DriftMonitor.from_baseline(_frame(rng, 300))
+    current = _frame(rng, 50, shift=1.0).assign(
+        shot_id=[f"S{i:03d}" for i in range(50)],
+        timestamp=pd.date_range("2025-01-01", periods=50, freq="min").strftime("%Y-%m-%dT%H:%M:%S"),
+    )
+    path = tmp_path / "current.csv"
+    current.iloc[:30].to_csv(path, index=False)
+
+    assert monitor.update_from_file(path) == 30
+    monitor = DriftMonitor.load(monitor.save(tmp_path / "state.json"))
+    assert monitor.update_from_file(path) == 0
+    counts = [m.current_count for m in monitor.report().metrics]
+
+    current.to_csv(path, index=False)  # the file grows
+    assert monitor.update_from_file(path) == 20
+    assert counts == [30, 30]
+    assert [m.current_count for m in monitor.report().metrics] == [50, 50]
+
+    no_ids = tmp_path / "no_ids.csv"
+    current.drop(columns="shot_id").to_csv(no_ids, index=False)
+    by_time = DriftMonitor.from_baseline(_frame(rng, 300))
+    assert by_time.update_from_file(no_ids) == 50
+    assert by_time.update_from_file(no_ids) == 0
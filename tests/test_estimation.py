@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pur_mold_twin import MVP0DSimulator, QualityTargets
+from pur_mold_twin.configs import load_process_scenario
+from pur_mold_twin.core.estimation import EstimatorSettings, ShotStateEstimator
+from pur_mold_twin.material_db.loader import load_material_catalog
+
+
+SCENARIO = load_process_scenario("configs/scenarios/use_case_1.yaml")
+SYSTEM = load_material_catalog("configs/systems/jr_purtec_catalog.yaml")[SCENARIO.system_id]
+QUALITY = QualityTargets(
+    rho_moulded_min=20.0,
+    rho_moulded_max=400.0,
+    core_temp_max_C=120.0,
+    p_max_allowable_bar=10.0,
+    H_demold_min_shore=30.0,
+    H_24h_min_shore=40.0,
+)
+CONFIG = SCENARIO.simulation.model_copy(update={"total_time_s": 200.0})
+
+
+def _measured(every: int = 2, noise_K: float = 0.3) -> tuple[pd.DataFrame, object]:
+    truth = MVP0DSimulator(CONFIG).run(SYSTEM, SCENARIO.process, SCENARIO.mold, QUALITY)
+    rng = np.random.default_rng(1)
+    frame = pd.DataFrame(
+        {
+            "time_s": truth.time_s[::every],
+            "T_core_C": np.asarray(truth.T_core_K[::every]) - 273.15 + rng.normal(0.0, noise_K, len(truth.time_s[::every])),
+            "p_total_bar": np.asarray(truth.p_total_Pa[::every]) / 100_000.0,
+        }
+    )
+    return frame, truth
+
+
+def test_filter_tracks_core_temperature_and_demold_window() -> None:
+    measured, truth = _measured()
+    estimator = ShotStateEstimator(SYSTEM, SCENARIO.process, SCENARIO.mold, QUALITY, CONFIG)
+
+    updates = list(estimator.replay(measured))
+
+    errors = [abs(update.T_core_K - T) for update, T in zip(updates, truth.T_core_K[::2])]
+    assert max(errors[10:]) < 1.5
+    assert updates[-1].t_demold_min_s == pytest.approx(truth.t_demold_min_s, abs=2.0)
+    assert updates[0].t_demold_min_s == pytest.approx(truth.t_demold_min_s, abs=5.0)
+    assert updates[-1].t_demold_max_s == truth.t_demold_max_s
+
+
+def test_missing_channels_and_time_order() -> None:
+    measured, _ = _measured(every=20)
+    measured.loc[1::2, "p_total_bar"] = np.nan
+    estimator = ShotStateEstimator(
+        SYSTEM, SCENARIO.process, SCENARIO.mold, QUALITY, CONFIG, EstimatorSettings(ensemble_size=8)
+    )
+
+    for row in measured.drop(columns=["T_core_C"]).to_dict("records"):
+        update = estimator.update_row(row)
+    assert update.time_s == measured["time_s"].iloc[-1]
+    assert update.T_core_std_K > 0
+
+    with pytest.raises(ValueError):
+        estimator.update(0.0, T_core_C=30.0)
+
+
+def test_update_cost_is_bounded_on_full_horizon() -> None:
+    # Default quality targets never open a demold window, so every forecast runs to the 600 s horizon.
+    truth = MVP0DSimulator(SCENARIO.simulation).run(SYSTEM, SCENARIO.process, SCENARIO.mold, QualityTargets())
+    estimator = ShotStateEstimator(SYSTEM, SCENARIO.process, SCENARIO.mold, QualityTargets(), SCENARIO.simulation)
+    settings = estimator.settings
+    steps = 0
+    step = estimator._step
+
+    def counting_step(state, dt):
+        nonlocal steps
+        steps += 1
+        step(state, dt)
+
+    estimator._step = counting_step
+    samples = list(zip(truth.time_s, truth.T_core_K))[2::2]
+    for time_s, T_core_K in samples:
+        steps = 0
+        estimator.update(time_s, T_core_C=T_core_K - 273.15)
+        assert steps <= settings.ensemble_size * 2 + settings.forecast_steps_per_update
+
+    assert samples[-1][0] == SCENARIO.simulation.total_time_s
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 import shutil
 
@@ -5,8 +6,14 @@ import pandas as pd
 import pytest
 
 from pur_mold_twin.core.types import ProcessConditions
-from pur_mold_twin.data.dataset import build_dataset
-from pur_mold_twin.data.etl import build_process_conditions_from_logs, load_log_bundle
+from pur_mold_twin.data.alignment import AlignmentConfig, align_sensor_frames
+from pur_mold_twin.data.dataset import build_dataset, build_dataset_streaming
+from pur_mold_twin.data.etl import (
+    build_process_conditions_from_logs,
+    export_log_bundles,
+    load_log_bundle,
+    write_sensor_csvs,
+)
 from pur_mold_twin.data.schema import FEATURE_COLUMNS
 
 
@@ -30,6 +37,36 @@ def test_load_log_bundle_merges_timeseries() -> None:
     assert process.m_polyol == pytest.approx(1.0)
 
 
+def test_write_sensor_csvs_roundtrip(tmp_path: Path) -> None:
+    measured = load_log_bundle(SAMPLE_LOG_DIR).measured
+
+    written = write_sensor_csvs(measured, tmp_path)
+
+    assert {p.name for p in written} == {"sensors_core_temp.csv", "sensors_pressure.csv"}
+    reloaded = load_log_bundle(tmp_path).measured
+    pd.testing.assert_frame_equal(reloaded, measured)
+
+
+def test_load_log_bundle_keeps_raw_peaks(tmp_path: Path) -> None:
+    times = [round(0.1 * idx + 0.013 * (idx % 3), 3) for idx in range(50)]
+    core = [20.0 + (40.0 if idx == 17 else 0.0) for idx in range(50)]
+    pd.DataFrame({"time_s": times, "T_core_C": core}).to_csv(tmp_path / "sensors_core_temp.csv", index=False)
+    pressure_times = [0.3 + 0.5 * idx for idx in range(10)]
+    pressure = [2.0 if idx == 4 else 1.0 for idx in range(10)]
+    pd.DataFrame({"time_s": pressure_times, "p_total_bar": pressure}).to_csv(
+        tmp_path / "sensors_pressure.csv", index=False
+    )
+
+    measured = load_log_bundle(tmp_path).measured
+    assert measured["T_core_C"].max() == pytest.approx(60.0)
+    assert measured.loc[measured["T_core_C"].idxmax(), "time_s"] == pytest.approx(times[17])
+    assert measured["p_total_bar"].max() == pytest.approx(2.0)
+    assert measured.loc[measured["p_total_bar"].idxmax(), "time_s"] == pytest.approx(2.3)
+
+    aligned = load_log_bundle(tmp_path, AlignmentConfig(rate_hz=10.0)).measured
+    assert aligned["time_s"].diff().dropna().to_numpy() == pytest.approx(0.1)
+
+
 def test_build_dataset_from_directory() -> None:
     output = TMP_ML_DIR / "features.csv"
     if output.exists():
@@ -108,3 +145,116 @@ def test_build_dataset_falls_back_to_csv_when_parquet_missing(monkeypatch: pytes
     assert saved.suffix == ".csv"
     assert calls["parquet"] == 1
     assert calls["csv"] == 1
+
+
+def _make_archive(root: Path, count: int) -> Path:
+    for idx in range(count):
+        shot_dir = root / f"shot_{idx}"
+        shutil.copytree(SAMPLE_LOG_DIR, shot_dir)
+        meta = (shot_dir / "meta.yaml").read_text(encoding="utf-8")
+        (shot_dir / "meta.yaml").write_text(
+            meta.replace('shot_id: "2025-01-01-1"', f'shot_id: "SHOT-{idx}"'), encoding="utf-8"
+        )
+    return root
+
+
+def test_build_dataset_streaming_writes_row_groups(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    archive = _make_archive(tmp_path / "archive", 3)
+    output = tmp_path / "features.parquet"
+
+    rows, saved = build_dataset_streaming(archive, SAMPLE_SIM, output, workers=2, chunk_size=2)
+
+    assert rows == 3
+    assert saved == output
+    assert pq.ParquetFile(saved).metadata.num_row_groups == 2
+    df = pd.read_parquet(saved)
+    assert list(df["shot_id"]) == ["SHOT-0", "SHOT-1", "SHOT-2"]
+    assert df["meas_p_max_bar"].tolist() == pytest.approx([1.8, 1.8, 1.8])
+    assert df["any_defect"].tolist() == [1.0, 1.0, 1.0]
+
+
+def test_build_dataset_streaming_csv_output(tmp_path: Path) -> None:
+    archive = _make_archive(tmp_path / "archive", 2)
+
+    rows, saved = build_dataset_streaming(archive, SAMPLE_SIM, tmp_path / "features.csv", chunk_size=1)
+
+    df = pd.read_csv(saved)
+    assert rows == 2
+    assert len(df) == 2
+    assert "sim_p_max_bar" in df.columns
+
+
+def test_export_log_bundles_resume_skips_complete_dirs(tmp_path: Path) -> None:
+    bundle = load_log_bundle(SAMPLE_LOG_DIR)
+    bundles = [
+        type(bundle)(bundle.process, bundle.measured, bundle.qc, {**bundle.metadata, "shot_id": f"S{idx}"})
+        for idx in range(3)
+    ]
+    output = tmp_path / "imported"
+
+    first = export_log_bundles(bundles[:2], output, workers=2)
+    second = export_log_bundles(bundles, output, workers=2, resume=True)
+
+    assert (first.written, first.skipped) == (2, 0)
+    assert (second.written, second.skipped) == (1, 2)
+    reloaded = load_log_bundle(output / "S2")
+    assert reloaded.metadata["shot_id"] == "S2"
+    assert reloaded.process["m_polyol"] == pytest.approx(bundle.process["m_polyol"])
+    assert reloaded.measured["T_core_C"].tolist() == pytest.approx(bundle.measured["T_core_C"].tolist())
+
+
+def test_export_log_bundles_jsonl_preserves_order(tmp_path: Path) -> None:
+    bundle = load_log_bundle(SAMPLE_LOG_DIR)
+    bundles = [
+        type(bundle)(bundle.process, bundle.measured, bundle.qc, {**bundle.metadata, "shot_id": f"S{idx}"})
+        for idx in range(5)
+    ]
+
+    summary = export_log_bundles(bundles, tmp_path, workers=3, output_format="jsonl")
+    resumed = export_log_bundles(bundles, tmp_path, resume=True, output_format="jsonl")
+
+    lines = summary.output.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["metadata"]["shot_id"] for line in lines] == [f"S{idx}" for idx in range(5)]
+    assert (resumed.written, resumed.skipped) == (0, 5)
+
+
+def test_align_sensor_frames_resamples_onto_common_grid() -> None:
+    core = pd.DataFrame({"time_s": [0.0, 1.02, 1.98, 3.01], "T_core_C": [20.0, 30.0, 40.0, 50.0]})
+    pressure = pd.DataFrame({"time_s": [0.0, 1.5, 3.0], "p_total_bar": [1.0, 1.3, 1.6]})
+
+    aligned = align_sensor_frames([core, pressure], AlignmentConfig(rate_hz=1.0))
+    outer = pd.concat([core, pressure]).groupby("time_s").first()
+
+    assert aligned["time_s"].tolist() == pytest.approx([0.0, 1.0, 2.0, 3.0])
+    assert aligned["p_total_bar"].tolist() == pytest.approx([1.0, 1.2, 1.4, 1.6])
+    assert aligned[["T_core_C", "p_total_bar"]].notna().all().all()
+    assert len(outer) > len(aligned)
+
+
+def test_align_sensor_frames_tolerance_and_hold() -> None:
+    sparse = pd.DataFrame({"time_s": [0.0, 10.0], "p_total_bar": [1.0, 2.0]})
+    fast = pd.DataFrame({"time_s": [0.0, 2.0, 4.0, 6.0, 8.0, 10.0], "T_core_C": [1, 2, 3, 4, 5, 6]})
+
+    held = align_sensor_frames([fast, sparse], AlignmentConfig(method="previous", tolerance_s=5.0))
+
+    assert held["time_s"].tolist() == pytest.approx([0.0, 2.0, 4.0, 6.0, 8.0, 10.0])
+    assert held["p_total_bar"].tolist()[:3] == pytest.approx([1.0, 1.0, 1.0])
+    assert held["p_total_bar"].isna().tolist() == [False, False, False, True, True, False]
+
+
+def test_export_log_bundles_jsonl_resume_drops_truncated_tail(tmp_path: Path) -> None:
+    bundle = load_log_bundle(SAMPLE_LOG_DIR)
+    bundles = [
+        type(bundle)(bundle.process, bundle.measured, bundle.qc, {**bundle.metadata, "shot_id": f"S{idx}"})
+        for idx in range(4)
+    ]
+    summary = export_log_bundles(bundles[:3], tmp_path, output_format="jsonl")
+    text = summary.output.read_text(encoding="utf-8")
+    summary.output.write_text(text[: len(text) - 40], encoding="utf-8")  # crash mid-way through S2
+
+    resumed = export_log_bundles(bundles, tmp_path, resume=True, output_format="jsonl")
+
+    lines = summary.output.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["metadata"]["shot_id"] for line in lines] == ["S0", "S1", "S2", "S3"]
+    assert (resumed.written, resumed.skipped) == (2, 2)
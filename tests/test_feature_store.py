@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pur_mold_twin.data.feature_store import load_features
+
+
+def _features(rows: int = 6) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "shot_id": [f"S{i}" for i in range(rows)],
+            "timestamp": [f"2025-01-{i + 1:02d}T08:00:00" for i in range(rows)],
+            "sim_p_max_bar": np.linspace(3.0, 4.0, rows),
+            "proc_RH_ambient": np.full(rows, 0.5),
+            "defect_risk": np.linspace(0.1, 0.6, rows),
+        }
+    )
+
+
+def test_load_features_parquet_projection_and_row_groups(tmp_path: Path) -> None:
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "features.parquet"
+    pq.write_table(pa.Table.from_pandas(_features(), preserve_index=False), path, row_group_size=2)
+
+    df = load_features(
+        path,
+        columns=["sim_p_max_bar", "defect_risk", "missing"],
+        start_time=datetime(2025, 1, 3),
+        end_time=datetime(2025, 1, 5),
+        float32=True,
+    )
+
+    assert list(df.columns) == ["sim_p_max_bar", "defect_risk"]
+    assert len(df) == 2
+    assert df["sim_p_max_bar"].dtype == np.float32
+    assert df["defect_risk"].dtype == np.float64
+
+
+def test_load_features_csv_usecols_and_time_filter(tmp_path: Path) -> None:
+    path = tmp_path / "features.csv"
+    _features().to_csv(path, index=False)
+
+    df = load_features(path, columns=["proc_RH_ambient"], start_time=datetime(2025, 1, 4), float32=True)
+
+    assert list(df.columns) == ["proc_RH_ambient"]
+    assert len(df) == 3
+    assert df["proc_RH_ambient"].dtype == np.float32
+
+
+def test_load_features_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        load_features(tmp_path / "absent.parquet")
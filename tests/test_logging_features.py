@@ -45,3 +45,51 @@ def test_compute_basic_features_merges_qc_and_process() -> None:
     assert features.loc[0, "any_defect"] == 1
     assert features.loc[0, "defect_risk"] == 0.7
     assert features.loc[0, "delta_t_demold_s"] == 20.0
+
+
+def test_compute_basic_features_batch_matches_single_shot() -> None:
+    from pur_mold_twin.logging.features import compute_basic_features_batch, stack_simulations
+
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0)
+    shot_ids = ["A", "B", "C"]
+    sims, frames, qcs, processes = [], [], [], []
+    for i, shot in enumerate(shot_ids):
+        n_sim = 5 + i
+        sims.append(
+            {
+                "time_s": list(np.linspace(0.0, 200.0, n_sim)),
+                "T_core_K": list(300.0 + rng.uniform(0, 60, n_sim)),
+                "p_total_Pa": list(101_000.0 + rng.uniform(0, 90_000, n_sim)),
+                "rho_moulded": 40.0 + i,
+                "t_demold_opt_s": 300.0,
+                "defect_risk": 0.1 * i,
+            }
+        )
+        t = np.arange(0.0, 150.0, 7.5 + i)
+        frames.append(
+            pd.DataFrame({"time_s": t, "T_core_C": 25.0 + 0.4 * t + rng.normal(0, 1, t.size), "p_total_bar": 1.0 + rng.uniform(0, 1, t.size)})
+        )
+        qcs.append({"rho_moulded": 41.0, "defects": ["voids"] if i == 1 else [], "defect_risk_operator": 0.2 * i})
+        processes.append({"T_polyol_in_C": 24.0 + i, "t_demold_actual_s": 320.0})
+
+    measured_long = pd.concat([f.assign(shot_id=s) for f, s in zip(frames, shot_ids)], ignore_index=True)
+    qcs[2] = None  # shot C has no QC record
+    batch = compute_basic_features_batch(
+        stack_simulations(sims, shot_ids),
+        measured=measured_long,
+        qc=pd.DataFrame(qcs[:2], index=shot_ids[:2]),
+        process=pd.DataFrame(processes, index=shot_ids),
+    )
+
+    assert batch["any_defect"].tolist()[:2] == [0.0, 1.0]
+    assert pd.isna(batch.loc[2, "any_defect"])
+    for i, shot in enumerate(shot_ids):
+        single = compute_basic_features(sims[i], measured=frames[i], qc=qcs[i], process=processes[i]).iloc[0]
+        row = batch.iloc[i]
+        assert row["shot_id"] == shot
+        assert ("any_defect" in single) == (qcs[i] is not None)
+        for column, value in single.items():
+            if value is None:
+                continue
+            assert row[column] == pytest.approx(value, rel=1e-9, abs=1e-9), column
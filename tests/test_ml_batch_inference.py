@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pur_mold_twin.ml import inference
+from pur_mold_twin.ml.inference import LoadedModels, attach_ml_predictions, attach_ml_predictions_batch, predict_batch
+
+
+class _RecordingModel:
+    def __init__(self, offset: float = 0.0) -> None:
+        self.offset = offset
+        self.calls: list[np.ndarray] = []
+
+    def predict(self, X):
+        self.calls.append(np.asarray(X))
+        return np.asarray(X)[:, 0] + self.offset
+
+
+def _models() -> LoadedModels:
+    manifest = {
+        "models": {
+            "defect_risk": {"version": "1.0.0", "features_used": ["b", "a"]},
+            "defect_classifier": {"version": "1.0.0", "features_used": ["a", "b"]},
+        }
+    }
+    return LoadedModels(_RecordingModel(), _RecordingModel(offset=10.0), manifest_data=manifest)
+
+
+def test_predict_batch_aligns_to_manifest_and_calls_once() -> None:
+    models = _models()
+    rows = [{"a": 1.0, "b": 2.0, "defect_risk": 0.5}, {"b": 4.0, "a": 3.0}, {"a": 5.0}]
+
+    preds = predict_batch(rows, models)
+
+    assert models.defect_risk.calls[0].shape == (3, 2)
+    assert len(models.defect_risk.calls) == 1 and len(models.defect_classifier.calls) == 1
+    assert preds["defect_risk_pred"][:2] == [2.0, 4.0]
+    assert np.isnan(preds["defect_risk_pred"][2])
+    assert preds["defect_class_pred"] == [11.0, 13.0, 15.0]
+
+
+def test_attach_wrappers_share_batched_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    models = _models()
+    monkeypatch.setattr(inference, "_load_models", lambda *args, **kwargs: models)
+
+    batch = attach_ml_predictions_batch([{}, {}], [{"a": 1.0, "b": 2.0}, {"a": 3.0, "b": 4.0}])
+    single = attach_ml_predictions({}, {"a": 7.0, "b": 8.0})
+
+    assert [r["defect_risk_pred"] for r in batch] == [2.0, 4.0]
+    assert single["defect_class_pred"] == 17.0
+    assert single["ml_model_metadata"]["defect_risk"]["version"] == "1.0.0"
+    assert len(models.defect_risk.calls) == 2
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+joblib = pytest.importorskip("joblib")
+
+from pur_mold_twin.ml.compiled import CompiledForest, compile_forest, compiled_path, export_compiled
+from pur_mold_twin.ml.registry import ModelRegistry
+
+
+def _tree(feature, threshold, left, right, value):
+    return SimpleNamespace(
+        tree_=SimpleNamespace(
+            feature=np.asarray(feature),
+            threshold=np.asarray(threshold, dtype=float),
+            children_left=np.asarray(left),
+            children_right=np.asarray(right),
+            value=np.asarray(value, dtype=float),
+        )
+    )
+
+
+def _forest(classifier: bool = False) -> SimpleNamespace:
+    # Tree 1: x0 <= 0.5 ? leaf1 : (x1 <= 2.0 ? leaf3 : leaf4); tree 2: a single split on x1.
+    if classifier:
+        values_1 = [[[5, 5]], [[4, 0]], [[1, 5]], [[1, 1]], [[0, 4]]]
+        values_2 = [[[5, 5]], [[3, 1]], [[2, 4]]]
+    else:
+        values_1 = [[[0.0]], [[1.0]], [[0.0]], [[2.0]], [[3.0]]]
+        values_2 = [[[0.0]], [[10.0]], [[20.0]]]
+    trees = [
+        _tree([0, -2, 1, -2, -2], [0.5, -2, 2.0, -2, -2], [1, -1, 3, -1, -1], [2, -1, 4, -1, -1], values_1),
+        _tree([1, -2, -2], [1.0, -2, -2], [1, -1, -1], [2, -1, -1], values_2),
+    ]
+    model = SimpleNamespace(estimators_=trees, feature_names_in_=np.array(["a", "b"], dtype=object))
+    if classifier:
+        model.classes_ = np.array([0, 1])
+    return model
+
+
+X = np.array([[0.0, 0.0], [1.0, 1.5], [1.0, 3.0], [0.5, 1.0]])
+
+
+def test_compiled_regressor_matches_tree_traversal(monkeypatch) -> None:
+    forest = compile_forest(_forest())
+
+    assert forest is not None and forest.depth == 2
+    np.testing.assert_allclose(forest.predict(X), [5.5, 11.0, 11.5, 5.5])
+    assert forest.predict(X[1]).shape == (1,)
+    monkeypatch.setattr("pur_mold_twin.ml.compiled.ROW_LISTS_MAX_NODES", 0)  # large forests: NumPy single-row path
+    np.testing.assert_allclose([forest.predict(row)[0] for row in X], [5.5, 11.0, 11.5, 5.5])
+
+
+def test_compiled_classifier_averages_normalized_leaf_values() -> None:
+    forest = compile_forest(_forest(classifier=True))
+
+    proba = forest.predict_proba(X[:2])
+    np.testing.assert_allclose(proba, [[0.875, 0.125], [0.4166667, 0.5833333]], rtol=1e-6)
+    assert forest.predict(X).tolist() == [0, 1, 1, 0]
+
+
+def test_compile_forest_rejects_models_without_trees() -> None:
+    assert compile_forest(SimpleNamespace(predict=lambda X: X)) is None
+
+
+def test_export_roundtrip_and_registry_prefers_compiled(tmp_path: Path) -> None:
+    joblib.dump({"tag": "pickle"}, tmp_path / "defect_risk.pkl")
+    export_compiled(_forest(classifier=True), tmp_path, "defect_risk")
+    path = export_compiled(_forest(), tmp_path, "defect_risk")  # replaces the previous forest
+    assert path == compiled_path(tmp_path, "defect_risk") and path.is_dir()
+
+    loaded = ModelRegistry(tmp_path, check_interval_s=0.0).get().defect_risk
+    assert isinstance(loaded, CompiledForest) and not loaded.is_classifier
+    assert not loaded.feature.flags.writeable  # memory-mapped read-only
+    assert loaded.feature_names_in_.tolist() == ["a", "b"]
+    np.testing.assert_allclose(loaded.predict(X), [5.5, 11.0, 11.5, 5.5])
+
+    # A retrained model that cannot be compiled drops the stale forest.
+    assert export_compiled(SimpleNamespace(), tmp_path, "defect_risk") is None
+    assert not path.exists()
+    assert ModelRegistry(tmp_path).get().defect_risk == {"tag": "pickle"}
+
+
+def test_compiled_forest_matches_sklearn_with_missing_values() -> None:
+    pytest.importorskip("sklearn", minversion="1.4")  # forests with missing-value support
+    ensemble = pytest.importorskip("sklearn.ensemble")
+    rng = np.random.default_rng(0)
+    X_train = rng.normal(size=(300, 5))
+    X_train[rng.random(X_train.shape) < 0.1] = np.nan
+    target = np.nan_to_num(X_train[:, 0]) * 2.0 + np.nan_to_num(X_train[:, 1]) ** 2
+    X_test = rng.normal(size=(100, 5))
+    X_test[rng.random(X_test.shape) < 0.15] = np.nan
+
+    regressor = ensemble.RandomForestRegressor(n_estimators=20, random_state=0).fit(X_train, target)
+    classifier = ensemble.RandomForestClassifier(n_estimators=20, random_state=0).fit(
+        X_train, (target > 1.0).astype(int) + (target > 3.0)
+    )
+    compiled_regressor = compile_forest(regressor)
+    compiled_classifier = compile_forest(classifier)
+
+    np.testing.assert_array_equal(compiled_regressor.predict(X_test), regressor.predict(X_test))
+    np.testing.assert_array_equal(compiled_classifier.predict_proba(X_test), classifier.predict_proba(X_test))
+    np.testing.assert_array_equal(compiled_classifier.predict(X_test), classifier.predict(X_test))
+    for row in X_test[:10]:  # single-row path
+        np.testing.assert_array_equal(compiled_regressor.predict(row), regressor.predict(row[None, :]))
+        np.testing.assert_array_equal(compiled_classifier.predict_proba(row), classifier.predict_proba(row[None, :]))
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+joblib = pytest.importorskip("joblib")
+
+from pur_mold_twin.ml import inference
+from pur_mold_twin.ml.registry import ModelRegistry, get_registry
+from pur_mold_twin.ml.versioning import create_model_metadata, update_manifest_for_model
+
+
+def _publish(models_dir: Path, tag: str, version: str, mtime: int) -> None:
+    joblib.dump({"tag": tag}, models_dir / "defect_risk.pkl")
+    metadata = create_model_metadata("defect_risk", version, {}, ["a"])
+    update_manifest_for_model("defect_risk", metadata, models_dir)
+    for name in ("defect_risk.pkl", "manifest.json"):
+        os.utime(models_dir / name, ns=(mtime, mtime))
+
+
+def test_registry_swaps_models_when_manifest_changes(tmp_path: Path) -> None:
+    _publish(tmp_path, "v1", "1.0.0", 1_000_000_000)
+    registry = ModelRegistry(tmp_path, check_interval_s=0.0)
+
+    first = registry.get()
+    assert first.defect_risk == {"tag": "v1"}
+    assert registry.get() is first  # unchanged directory -> same snapshot
+
+    _publish(tmp_path, "v2", "1.1.0", 2_000_000_000)
+    second = registry.get()
+
+    assert second is not first
+    assert second.defect_risk == {"tag": "v2"}
+    assert second.manifest_data["models"]["defect_risk"]["version"] == "1.1.0"
+    assert first.defect_risk == {"tag": "v1"}  # old snapshot stays consistent for in-flight readers
+
+
+def test_registry_keeps_previous_snapshot_on_broken_manifest(tmp_path: Path) -> None:
+    _publish(tmp_path, "v1", "1.0.0", 1_000_000_000)
+    registry = ModelRegistry(tmp_path, check_interval_s=0.0)
+    first = registry.get()
+
+    (tmp_path / "manifest.json").write_text("{broken", encoding="utf-8")
+
+    assert registry.get() is first
+
+
+def test_get_registry_is_shared_per_directory(tmp_path: Path) -> None:
+    assert get_registry(tmp_path) is get_registry(tmp_path / ".")
+    assert get_registry(tmp_path) is not get_registry(tmp_path / "other")
+
+
+def test_explicit_load_does_not_change_default_directory(tmp_path: Path, monkeypatch) -> None:
+    for tag in ("a", "b"):
+        (tmp_path / tag).mkdir()
+        _publish(tmp_path / tag, tag, "1.0.0", 1_000_000_000)
+    monkeypatch.setattr(inference, "_DEFAULT_MODELS_DIR", tmp_path / "a")
+
+    assert inference._load_models(tmp_path / "b").defect_risk == {"tag": "b"}
+    assert inference._load_models().defect_risk == {"tag": "a"}
+
+    inference.set_default_models_dir(tmp_path / "b")
+    assert inference._load_models().defect_risk == {"tag": "b"}
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -46,3 +47,65 @@ def test_train_baseline_produces_models_and_report(tmp_path: Path) -> None:
     text = metrics_path.read_text(encoding="utf-8")
     assert "ML Baseline Training Report" in text
 
+
+
+def test_train_baseline_reports_cross_validated_metrics(tmp_path: Path) -> None:
+    features_path = tmp_path / "features.csv"
+    pd.DataFrame(
+        {
+            "sim_T_core_max_C": [80.0 + i for i in range(12)],
+            "defect_risk": [0.05 * i for i in range(12)],
+            "any_defect": [i % 2 for i in range(12)],
+        }
+    ).to_csv(features_path, index=False)
+    metrics_path = tmp_path / "metrics.md"
+
+    train_main(
+        [
+            "--features",
+            str(features_path),
+            "--models-dir",
+            str(tmp_path / "models"),
+            "--metrics-path",
+            str(metrics_path),
+            "--cv-folds",
+            "3",
+            "--n-jobs",
+            "2",
+        ]
+    )
+
+    manifest = json.loads((tmp_path / "models" / "manifest.json").read_text(encoding="utf-8"))
+    assert "mae_defect_risk_cv" in manifest["models"]["defect_risk"]["metrics"]
+    assert "f1_any_defect_cv" in manifest["models"]["defect_classifier"]["metrics"]
+    assert "CV (3-fold) MAE defect_risk" in metrics_path.read_text(encoding="utf-8")
+
+
+def test_kfold_indices_partition_samples() -> None:
+    from pur_mold_twin.ml.train_baseline import _kfold_indices
+
+    splits = _kfold_indices(10, 3)
+    tests = np.concatenate([test for _, test in splits])
+    assert sorted(tests.tolist()) == list(range(10))
+    for train, test in splits:
+        assert not set(train) & set(test) and len(train) + len(test) == 10
+
+
+def test_warm_start_models_grows_existing_forests() -> None:
+    from pur_mold_twin.ml.baseline import BaselineModels, warm_start_models
+
+    class Forest:
+        def __init__(self) -> None:
+            self.params = {"n_estimators": 50, "warm_start": False}
+
+        def get_params(self) -> dict:
+            return dict(self.params)
+
+        def set_params(self, **params) -> "Forest":
+            self.params.update(params)
+            return self
+
+    models = warm_start_models(BaselineModels(defect_classifier=Forest(), defect_risk_regressor=None), 10)
+    assert models.defect_classifier.params == {"n_estimators": 60, "warm_start": True}
+    with pytest.raises(ValueError):
+        warm_start_models(BaselineModels(defect_classifier=object(), defect_risk_regressor=None), 10)
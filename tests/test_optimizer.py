@@ -159,3 +159,45 @@ def test_objective_penalizes_pressure_when_preferred() -> None:
         constraints=dummy_constraints,
         prefer_lower_pressure=False,
     )
+
+
+class _RecordingSimulator(MVP0DSimulator):
+    def __init__(self, config) -> None:
+        super().__init__(config)
+        self.recorded = []
+
+    def run(self, material, process, mold, quality=None, config=None):
+        self.recorded.append((config or self.config).record)
+        return super().run(material, process, mold, quality, config=config)
+
+
+def test_optimizer_search_records_only_constraint_series() -> None:
+    scenario, system = _scenario_bundle()
+    simulator = _RecordingSimulator(scenario.simulation)
+    optimizer = ProcessOptimizer(simulator)
+    config = OptimizationConfig(samples=2, random_seed=7)
+    result = optimizer.optimize(system, scenario.process, scenario.mold, scenario.quality, config)
+
+    # The caller's simulator runs every candidate (search channels only) and then the winner.
+    assert simulator.recorded == [["time_s", "alpha", "hardness_shore"]] * 2 + [scenario.simulation.record]
+    assert len(result.best_simulation.p_total_Pa) == len(result.best_simulation.time_s)
+    best = min(result.evaluations, key=lambda evaluation: evaluation.objective)
+    assert best.p_max_bar == result.best_simulation.p_max_Pa / 100_000.0
+
+
+def test_api_optimize_returns_kpi_metrics() -> None:
+    from pur_mold_twin.service.api import APIConfig, APIService
+
+    scenario, _ = _scenario_bundle()
+    response = APIService(APIConfig(systems_catalog_path=str(CATALOG))).optimize(
+        {
+            "system_id": scenario.system_id,
+            "process": scenario.process.model_dump(),
+            "mold": scenario.mold.model_dump(),
+            "optimizer_config": {"samples": 2, "random_seed": 3},
+        }
+    )
+
+    assert set(response["baseline"]) == set(response["optimized"])
+    assert response["optimized"]["p_max_bar"] > 0
+    assert "t_demold_s" in response["candidate"]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pur_mold_twin import MVP0DSimulator, VentProperties
+from pur_mold_twin.configs import load_process_scenario
+from pur_mold_twin.core.plant import PlantSimulator, PlantUnit
+from pur_mold_twin.material_db.loader import load_material_catalog
+
+
+SCENARIO = load_process_scenario("configs/scenarios/use_case_1.yaml")
+CATALOG = load_material_catalog("configs/systems/jr_purtec_catalog.yaml")
+CONFIG = SCENARIO.simulation.model_copy(update={"total_time_s": 200.0})
+
+
+def _units() -> list[PlantUnit]:
+    units = []
+    for idx, (scale, T_mold_C) in enumerate([(0.8, 35.0), (1.0, 45.0), (1.2, 50.0)]):
+        mold = SCENARIO.mold.model_copy(update={"cavity_volume_m3": SCENARIO.mold.cavity_volume_m3 * scale})
+        process = SCENARIO.process.model_copy(update={"T_mold_init_C": T_mold_C})
+        units.append(PlantUnit(f"M{idx}", mold, process))
+    vented = SCENARIO.mold.model_copy(update={"vent": VentProperties(count=6, alpha_closure=0.6)})
+    units.append(PlantUnit("M1-other", vented, SCENARIO.process, material=CATALOG["SYSTEM_M1"]))
+    return units
+
+
+def test_vectorized_plant_matches_single_mold_runs() -> None:
+    units = _units()
+    plant = PlantSimulator(CONFIG).run(units, material=CATALOG[SCENARIO.system_id], quality=SCENARIO.quality)
+
+    assert list(plant.results) == [unit.name for unit in units]
+    for unit in units:
+        expected = MVP0DSimulator(CONFIG).run(
+            unit.material or CATALOG[SCENARIO.system_id], unit.process, unit.mold, SCENARIO.quality
+        )
+        result = plant.results[unit.name]
+        for channel in ("T_core_K", "T_mold_K", "p_total_Pa", "rho_kg_per_m3", "vent_eff", "hardness_shore"):
+            np.testing.assert_allclose(getattr(result, channel), getattr(expected, channel), rtol=1e-10)
+        assert result.p_max_Pa == pytest.approx(expected.p_max_Pa, rel=1e-12)
+        assert result.vent_closure_time_s == expected.vent_closure_time_s
+        assert result.quality_status == expected.quality_status
+
+    summary = plant.summary
+    assert summary["molds"] == 4 and summary["material_groups"] == 2
+    assert sum(summary["quality_status"].values()) == 4
+    assert summary["p_max_bar_max"] == max(row["p_max_bar"] for row in plant.records())
+
+
+def test_plant_falls_back_for_non_vectorized_configs() -> None:
+    config = CONFIG.model_copy(update={"dimension": "1d_experimental"})
+    units = _units()[:2]
+    plant = PlantSimulator(config).run(units, material=CATALOG[SCENARIO.system_id])
+
+    expected = MVP0DSimulator(config).run(CATALOG[SCENARIO.system_id], units[0].process, units[0].mold)
+    assert plant.results["M0"].p_max_Pa == expected.p_max_Pa
+
+
+def test_plant_validates_units() -> None:
+    unit = _units()[0]
+    with pytest.raises(ValueError):
+        PlantSimulator(CONFIG).run([unit, unit], material=CATALOG[SCENARIO.system_id])
+    with pytest.raises(ValueError):
+        PlantSimulator(CONFIG).run([unit])
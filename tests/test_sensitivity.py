@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pur_mold_twin import MVP0DSimulator, VentProperties
+from pur_mold_twin.analysis import ParameterRange, SensitivityAnalyzer
+from pur_mold_twin.analysis.sensitivity import saltelli_sample, sobol_indices
+from pur_mold_twin.configs import load_process_scenario
+from pur_mold_twin.core import simulation
+from pur_mold_twin.core.batch import batch_kpis
+from pur_mold_twin.core.types import QualityTargets
+from pur_mold_twin.data.sim_cache import SimulationCache
+from pur_mold_twin.material_db.loader import load_material_catalog
+
+
+SCENARIO = load_process_scenario("configs/scenarios/use_case_1.yaml")
+MATERIAL = load_material_catalog("configs/systems/jr_purtec_catalog.yaml")[SCENARIO.system_id]
+CONFIG = SCENARIO.simulation.model_copy(update={"total_time_s": 300.0})
+QUALITY = QualityTargets(rho_moulded_max=400.0, H_demold_min_shore=30.0, H_24h_min_shore=40.0)
+PARAMETERS = [
+    ParameterRange(name="process.T_mold_init_C", low=35.0, high=60.0),
+    ParameterRange(name="mold.h_core_to_mold_W_per_m2K", low=100.0, high=200.0),
+    ParameterRange(name="config.activation_energy_J_per_mol", low=40_000.0, high=50_000.0),
+]
+
+
+def test_batch_kpis_match_scalar_runs() -> None:
+    contexts, expected = [], []
+    for T_mold_C, energy in [(35.0, 40_000.0), (50.0, 45_000.0), (60.0, 50_000.0)]:
+        process = SCENARIO.process.model_copy(update={"T_mold_init_C": T_mold_C})
+        config = CONFIG.model_copy(update={"activation_energy_J_per_mol": energy})
+        contexts.append(simulation.prepare_context(MATERIAL, process, SCENARIO.mold, QUALITY, config, VentProperties()))
+        expected.append(MVP0DSimulator(config).run(MATERIAL, process, SCENARIO.mold, QUALITY))
+
+    kpis = batch_kpis(contexts, chunk_size=2)
+    for j, result in enumerate(expected):
+        for name in ("p_max_Pa", "rho_moulded", "t_demold_opt_s", "H_demold_shore", "H_24h_shore", "defect_risk"):
+            assert kpis[name][j] == pytest.approx(getattr(result, name), rel=1e-9)
+        assert kpis["quality_status"][j] == result.quality_status
+
+
+def test_sobol_indices_of_additive_function() -> None:
+    unit = saltelli_sample(3, 1024, seed=1)
+    outputs = unit[:, 0] + 2.0 * unit[:, 1]
+    indices = sobol_indices(outputs, 3, bootstrap=20)
+
+    np.testing.assert_allclose(indices["S1"], [0.2, 0.8, 0.0], atol=0.03)
+    np.testing.assert_allclose(indices["ST"], [0.2, 0.8, 0.0], atol=0.03)
+    assert indices["S1_conf"][0] > 0
+
+
+def test_sensitivity_analyzer_ranks_and_caches(tmp_path) -> None:
+    cache = SimulationCache(tmp_path / "sa")
+    analyzer = SensitivityAnalyzer(MATERIAL, SCENARIO.process, SCENARIO.mold, PARAMETERS, QUALITY, CONFIG, cache=cache)
+
+    morris = analyzer.morris(trajectories=6, seed=3)
+    assert morris.evaluations == 6 * 4
+    assert morris.ranking("rho_moulded")[0] == "process.T_mold_init_C"
+
+    sobol = analyzer.sobol(n_base=32, bootstrap=0)
+    assert sobol.evaluations == 32 * 5
+    assert set(sobol.ST) == {"t_demold_opt_s", "p_max_Pa", "rho_moulded", "defect_risk"}
+    assert np.argmax(sobol.ST["rho_moulded"]) == 0
+    assert len(sobol.records()) == 4 * len(PARAMETERS)
+
+    reloaded = SensitivityAnalyzer(
+        MATERIAL, SCENARIO.process, SCENARIO.mold, PARAMETERS, QUALITY, CONFIG, cache=SimulationCache(tmp_path / "sa")
+    )
+    again = reloaded.sobol(n_base=32, bootstrap=0)
+    np.testing.assert_allclose(again.ST["p_max_Pa"], sobol.ST["p_max_Pa"])
+    assert reloaded.evaluator.simulated == 0 and reloaded.evaluator.reused == again.evaluations
+
+
+def test_parameter_range_validation() -> None:
+    with pytest.raises(ValueError):
+        ParameterRange(name="process.nope", low=0.0, high=1.0)
+    with pytest.raises(ValueError):
+        ParameterRange(name="config.time_step_s", low=0.1, high=1.0)
+    with pytest.raises(ValueError):
+        ParameterRange(name="process.mixing_eff", low=0.9, high=0.8)
+    with pytest.raises(ValueError):
+        SensitivityAnalyzer(
+            MATERIAL, SCENARIO.process, SCENARIO.mold, [ParameterRange(name="process.mixing_eff", low=0.5, high=1.5)]
+        )
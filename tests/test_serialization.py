@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from pur_mold_twin.core import MVP0DSimulator
+from pur_mold_twin.core.serialization import (
+    KPI_FIELDS,
+    SERIES_FIELDS,
+    decode_series,
+    dumps_json,
+    result_to_dict,
+)
+from pur_mold_twin.configs import load_process_scenario
+from pur_mold_twin.material_db.loader import load_material_catalog
+from pur_mold_twin.service.api import APIConfig, APIService
+
+
+SCENARIO = load_process_scenario("configs/scenarios/use_case_1.yaml")
+SYSTEMS = load_material_catalog("configs/systems/jr_purtec_catalog.yaml")
+
+
+@pytest.fixture(scope="module")
+def result():
+    config = SCENARIO.simulation.model_copy(update={"total_time_s": 120.0})
+    return MVP0DSimulator(config).run(SYSTEMS[SCENARIO.system_id], SCENARIO.process, SCENARIO.mold, SCENARIO.quality)
+
+
+def test_default_output_matches_model_dump(result) -> None:
+    assert result_to_dict(result) == result.to_dict()
+    assert set(SERIES_FIELDS) | set(KPI_FIELDS) == set(result.to_dict())
+
+
+def test_kpi_only_field_selection_and_precision(result) -> None:
+    kpis = result_to_dict(result, kpi_only=True, precision=4)
+    assert set(kpis) == set(KPI_FIELDS)
+    assert len(json.dumps(kpis)) < 1024
+    assert kpis["rho_moulded"] == pytest.approx(result.rho_moulded, rel=1e-3)
+
+    selected = result_to_dict(result, fields=["time_s", "T_core_K", "rho_moulded"], precision=3)
+    assert list(selected) == ["time_s", "T_core_K", "rho_moulded"]
+    np.testing.assert_allclose(selected["T_core_K"], result.T_core_K, rtol=5e-3)
+    with pytest.raises(ValueError):
+        result_to_dict(result, fields=["nope"])
+
+
+def test_base64_series_roundtrip(result) -> None:
+    encoded = result_to_dict(result, fields=["p_total_Pa"], series_format="base64")
+    np.testing.assert_array_equal(decode_series(encoded["p_total_Pa"]), result.p_total_Pa)
+
+
+def test_dumps_json_is_equivalent_to_json_dumps(result) -> None:
+    payload = {"ml": {"risk": 0.1, "models": {"a": "1.0"}}, **result_to_dict(result, fields=["time_s", "diagnostics"])}
+    text = dumps_json(payload, indent=2)
+    assert json.loads(text) == payload
+    assert text.startswith('{\n  "ml": {\n    "risk": 0.1')
+
+
+def test_api_simulate_output_options() -> None:
+    service = APIService(APIConfig(systems_catalog_path="configs/systems/jr_purtec_catalog.yaml"))
+    payload = {
+        "system_id": SCENARIO.system_id,
+        "process": SCENARIO.process.model_dump(),
+        "mold": SCENARIO.mold.model_dump(),
+        "simulation": {"total_time_s": 120.0},
+        "output": {"kpi_only": True},
+    }
+    response = service.simulate(payload)
+    assert "time_s" not in response and "rho_moulded" in response
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow.dataset")
+
+from pur_mold_twin.data.etl import LogBundle, export_log_bundles, load_log_bundle
+from pur_mold_twin.data.interfaces import ProcessLogQuery
+from pur_mold_twin.data.shot_store import ShotStoreSource, is_shot_store, write_shot_store
+
+
+SAMPLE_LOG_DIR = Path("tests/data/ml/sample_log")
+
+
+def _bundles(count: int) -> list[LogBundle]:
+    base = load_log_bundle(SAMPLE_LOG_DIR)
+    bundles = []
+    for idx in range(count):
+        metadata = {
+            "shot_id": f"S{idx:03d}",
+            "system_id": "R1" if idx % 2 else "R2",
+            "timestamp": f"2025-01-0{1 + idx % 3}T08:00:00",
+            "mold_id": "M1" if idx % 4 == 0 else "M2",
+        }
+        bundles.append(LogBundle(base.process, base.measured, base.qc, metadata))
+    return bundles
+
+
+def test_shot_store_roundtrip(tmp_path: Path) -> None:
+    base = load_log_bundle(SAMPLE_LOG_DIR)
+    written = write_shot_store(_bundles(6), tmp_path, rows_per_file=4)
+
+    source = ShotStoreSource(tmp_path)
+    shots = list(source.fetch_shots(ProcessLogQuery()))
+
+    assert written == 6
+    assert is_shot_store(tmp_path)
+    assert [shot.metadata["shot_id"] for shot in shots] == [f"S{idx:03d}" for idx in range(6)]
+    first = shots[0]
+    assert first.metadata["system_id"] == "R2"
+    assert first.process["m_polyol"] == pytest.approx(base.process["m_polyol"])
+    assert first.qc["defects"] == base.qc["defects"]
+    pd.testing.assert_frame_equal(first.measured, base.measured.astype("float64"))
+    assert (tmp_path / "shots" / "system_id=R1" / "date=2025-01-02").is_dir()
+
+
+def test_shot_store_filters_and_projection(tmp_path: Path) -> None:
+    write_shot_store(_bundles(12), tmp_path)
+    source = ShotStoreSource(tmp_path, sensor_columns=["T_core_C"])
+
+    query = ProcessLogQuery(system_id="R2", mold_id="M1", start_time=datetime(2025, 1, 2))
+    shots = list(source.fetch_shots(query))
+    table = source.read_shots(ProcessLogQuery(limit=3, offset=2), columns=["qc_rho_moulded"])
+
+    assert [shot.metadata["shot_id"] for shot in shots] == ["S004", "S008"]
+    assert list(shots[0].measured.columns) == ["time_s", "T_core_C"]
+    assert list(table.columns) == ["shot_id", "qc_rho_moulded"]
+    assert table["shot_id"].tolist() == ["S002", "S003", "S004"]
+
+
+def test_export_log_bundles_store_resume(tmp_path: Path) -> None:
+    bundles = _bundles(5)
+
+    first = export_log_bundles(bundles[:3], tmp_path, output_format="store")
+    second = export_log_bundles(bundles, tmp_path, resume=True, output_format="store")
+
+    assert (first.written, second.written, second.skipped) == (3, 2, 3)
+    assert len(ShotStoreSource(tmp_path).read_shots()) == 5
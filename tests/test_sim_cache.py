@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from pur_mold_twin.core import MVP0DSimulator, MoldProperties, SimulationConfig
+from pur_mold_twin.data.dataset import build_dataset_streaming
+from pur_mold_twin.data.etl import load_log_bundle, process_conditions_from_bundle
+from pur_mold_twin.data.sim_cache import ShotSimulator, SimulationCache, summarize_result
+from pur_mold_twin.logging.features import compute_feature_row
+from pur_mold_twin.material_db.loader import load_material_catalog
+
+
+SAMPLE_LOG_DIR = Path("tests/data/ml/sample_log")
+SYSTEM_R1 = load_material_catalog(Path("configs/systems/jr_purtec_catalog.yaml"))["SYSTEM_R1"]
+MOLD = MoldProperties(cavity_volume_m3=0.025, mold_surface_area_m2=0.8, mold_mass_kg=120.0)
+CONFIG = SimulationConfig(total_time_s=300.0, time_step_s=1.0)
+
+
+def _archive(root: Path, mold_temps: list[float]) -> Path:
+    for idx, temp in enumerate(mold_temps):
+        shot_dir = root / f"shot_{idx}"
+        shutil.copytree(SAMPLE_LOG_DIR, shot_dir)
+        meta = (shot_dir / "meta.yaml").read_text(encoding="utf-8")
+        meta = meta.replace('shot_id: "2025-01-01-1"', f'shot_id: "SHOT-{idx}"')
+        meta = meta.replace("T_mold_init_C: 40.0", f"T_mold_init_C: {temp}")
+        (shot_dir / "meta.yaml").write_text(meta, encoding="utf-8")
+    return root
+
+
+def test_summary_features_match_full_payload() -> None:
+    process = process_conditions_from_bundle(load_log_bundle(SAMPLE_LOG_DIR))
+    result = MVP0DSimulator(CONFIG).run(SYSTEM_R1, process, MOLD)
+
+    from_payload = compute_feature_row(result.to_dict())
+    from_summary = compute_feature_row(summarize_result(result))
+
+    assert from_summary == pytest.approx(from_payload)
+
+
+def test_feature_build_reuses_cached_simulations(tmp_path: Path) -> None:
+    archive = _archive(tmp_path / "archive", [40.0, 40.0, 50.0])
+    cache_dir = tmp_path / "sim_cache"
+
+    first = ShotSimulator(SYSTEM_R1, MOLD, config=CONFIG, cache=SimulationCache(cache_dir))
+    rows, saved = build_dataset_streaming(archive, None, tmp_path / "features.csv", chunk_size=2, simulator=first)
+
+    assert rows == 3
+    assert first.simulated == 2  # identical inputs are simulated once
+    df = pd.read_csv(saved)
+    assert df["sim_T_core_max_C"].notna().all()
+    assert df.loc[0, "sim_T_core_max_C"] == df.loc[1, "sim_T_core_max_C"]
+    assert df.loc[2, "sim_T_core_max_C"] != df.loc[0, "sim_T_core_max_C"]
+
+    # Rebuild with one changed and one new shot: only those two are simulated.
+    _archive(tmp_path / "archive2", [40.0, 40.0, 50.0, 60.0])
+    meta = tmp_path / "archive2" / "shot_1" / "meta.yaml"
+    meta.write_text(meta.read_text(encoding="utf-8").replace("mixing_eff: 0.9", "mixing_eff: 0.8"), encoding="utf-8")
+    second = ShotSimulator(SYSTEM_R1, MOLD, config=CONFIG, cache=SimulationCache(cache_dir))
+    rows, saved = build_dataset_streaming(
+        tmp_path / "archive2", None, tmp_path / "features2.csv", simulator=second
+    )
+
+    assert rows == 4
+    assert (second.simulated, second.reused) == (2, 2)
+    assert len(SimulationCache(cache_dir)) == 4
+    rebuilt = pd.read_csv(saved)
+    assert rebuilt.loc[2, "sim_T_core_max_C"] == pytest.approx(df.loc[2, "sim_T_core_max_C"])
+
+
+def test_input_hash_depends_on_simulation_context() -> None:
+    process = process_conditions_from_bundle(load_log_bundle(SAMPLE_LOG_DIR))
+    base = ShotSimulator(SYSTEM_R1, MOLD, config=CONFIG)
+    other_mold = ShotSimulator(SYSTEM_R1, MOLD.model_copy(update={"mold_mass_kg": 90.0}), config=CONFIG)
+
+    assert base.input_hash(process) == ShotSimulator(SYSTEM_R1, MOLD, config=CONFIG).input_hash(process)
+    assert base.input_hash(process) != other_mold.input_hash(process)
@@ -104,3 +104,26 @@ def test_step_gas_state_limits_fill_ratio_and_updates_pressures() -> None:
     assert result.p_total_Pa > 0.0
     assert result.state.n_pentane_liquid < state.n_pentane_liquid
     assert result.vent_eff <= 1.0
+
+
+def test_iter_steps_matches_full_run_and_stops_early() -> None:
+    simulator = MVP0DSimulator()
+    process = _build_process()
+    mold = _build_mold(process)
+    result = simulator.run(SYSTEM_R1, process, mold, QualityTargets())
+
+    records = list(simulator.iter_steps(SYSTEM_R1, process, mold, every=100))
+    assert [record.step for record in records][-1] == len(result.time_s) - 1
+    for record in records:
+        assert record.time_s == result.time_s[record.step]
+        assert record.T_core_K == result.T_core_K[record.step]
+        assert record.p_total_Pa == result.p_total_Pa[record.step]
+        assert record.hardness_shore == result.hardness_shore[record.step]
+    assert records[-1].p_max_Pa == result.p_max_Pa
+
+    seen = []
+    last = simulator.run_streaming(
+        SYSTEM_R1, process, mold, callback=lambda record: seen.append(record.step) or record.alpha >= 0.5
+    )
+    assert last.alpha >= 0.5 > result.alpha[last.step - 1]
+    assert len(seen) == last.step + 1
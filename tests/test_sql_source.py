@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from pur_mold_twin.data.interfaces import ProcessLogQuery
+from pur_mold_twin.data.sql_source import SQLProcessLogSource, SQLSourceConfig
+
+
+def _create_db(db_path: Path, count: int, key_column: str = "shot_id") -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            f"""
+            CREATE TABLE process_logs (
+                {key_column} TEXT PRIMARY KEY, system_id TEXT, timestamp TEXT, mold_id TEXT, quality_status TEXT,
+                m_polyol REAL, m_iso REAL, m_additives REAL,
+                T_polyol_in_C REAL, T_iso_in_C REAL, T_mold_init_C REAL, T_ambient_C REAL,
+                RH_ambient REAL, mixing_eff REAL,
+                rho_moulded REAL, H_demold REAL, H_24h REAL, defect_risk_operator REAL, defects TEXT
+            )
+            """
+        )
+        rows = [
+            (
+                f"SHOT_{idx:03d}",
+                "SYSTEM_R1",
+                f"2025-01-{1 + idx // 10:02d}T08:{idx % 60:02d}:00",
+                "MOLD_A" if idx % 2 == 0 else "MOLD_B",
+                "FAIL" if idx % 5 == 0 else "OK",
+                1.0, 1.05, 0.0, 25.0, 25.0, 40.0, 22.0, 0.5, 0.9, 41.0, 43.0, 55.0, 0.1, "[]",
+            )
+            for idx in range(count)
+        ]
+        conn.executemany(f"INSERT INTO process_logs VALUES ({', '.join('?' * 19)})", rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _source(db_path: Path, **kwargs) -> SQLProcessLogSource:
+    return SQLProcessLogSource(SQLSourceConfig(driver="sqlite", dsn=str(db_path), table="process_logs", **kwargs))
+
+
+def test_keyset_pagination_streams_all_rows(tmp_path: Path) -> None:
+    db_path = tmp_path / "logs.sqlite"
+    _create_db(db_path, 25)
+    source = _source(db_path, page_size=4, fetch_size=3)
+
+    shot_ids = [b.metadata["shot_id"] for b in source.fetch_shots(ProcessLogQuery())]
+    assert shot_ids == [f"SHOT_{idx:03d}" for idx in range(25)]
+
+    limited = [b.metadata["shot_id"] for b in source.fetch_shots(ProcessLogQuery(limit=6, offset=3))]
+    assert limited == [f"SHOT_{idx:03d}" for idx in range(3, 9)]
+    source.close()
+
+
+def test_custom_key_column_becomes_shot_id(tmp_path: Path) -> None:
+    db_path = tmp_path / "logs.sqlite"
+    _create_db(db_path, 5, key_column="shot_key")
+    source = _source(db_path, key_column="shot_key", page_size=2)
+
+    shot_ids = [b.metadata["shot_id"] for b in source.fetch_shots(ProcessLogQuery())]
+    assert shot_ids == [f"SHOT_{idx:03d}" for idx in range(5)]
+    source.close()
+
+
+def test_query_filters_are_pushed_into_sql(tmp_path: Path) -> None:
+    db_path = tmp_path / "logs.sqlite"
+    _create_db(db_path, 30)
+    source = _source(db_path, page_size=5)
+
+    query = ProcessLogQuery(
+        mold_id="MOLD_A",
+        quality_status="FAIL",
+        start_time=datetime(2025, 1, 2),
+        end_time=datetime(2025, 1, 4),
+    )
+    bundles = list(source.fetch_shots(query))
+
+    assert [b.metadata["shot_id"] for b in bundles] == ["SHOT_010", "SHOT_020"]
+    assert bundles[0].metadata["mold_id"] == "MOLD_A"
+    assert bundles[0].metadata["quality_status"] == "FAIL"
+    source.close()
+
+
+def test_connections_are_reused(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "logs.sqlite"
+    _create_db(db_path, 3)
+    source = _source(db_path)
+    calls = {"connect": 0}
+    original = source._connect
+
+    def _counting_connect():
+        calls["connect"] += 1
+        return original()
+
+    monkeypatch.setattr(source._pool, "_factory", _counting_connect)
+    for _ in range(3):
+        assert len(list(source.fetch_shots(ProcessLogQuery()))) == 3
+    assert calls["connect"] == 1
+    source.close()
+
+
+def test_sensor_table_bulk_fetch_per_page(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "logs.sqlite"
+    _create_db(db_path, 7)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("CREATE TABLE sensor_samples (shot_id TEXT, time_s REAL, T_core_C REAL, p_total_bar REAL)")
+        samples = [
+            (f"SHOT_{idx:03d}", float(t), 25.0 + idx + t, 1.0 + 0.1 * t)
+            for idx in range(7)
+            if idx != 4  # shot without samples
+            for t in range(3 + idx % 2)
+        ]
+        conn.executemany("INSERT INTO sensor_samples VALUES (?, ?, ?, ?)", samples[::-1])
+        conn.commit()
+    finally:
+        conn.close()
+
+    source = _source(db_path, page_size=3, sensor_table="sensor_samples", sensor_columns=["T_core_C"])
+    calls = {"bulk": 0}
+    original = source._fetch_sensor_frames
+
+    def _counting(conn, keys):
+        calls["bulk"] += 1
+        return original(conn, keys)
+
+    monkeypatch.setattr(source, "_fetch_sensor_frames", _counting)
+    bundles = {b.metadata["shot_id"]: b for b in source.fetch_shots(ProcessLogQuery())}
+    source.close()
+
+    assert calls["bulk"] == 3  # one bulk query per page of 3 shots
+    shot_1 = bundles["SHOT_001"].measured
+    assert list(shot_1.columns) == ["time_s", "T_core_C"]
+    assert shot_1["time_s"].tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert shot_1["T_core_C"].tolist() == [26.0, 27.0, 28.0, 29.0]
+    assert bundles["SHOT_004"].measured.empty
+    assert len(bundles["SHOT_006"].measured) == 3
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from pur_mold_twin import MVP0DSimulator
+from pur_mold_twin.analysis import KPISurrogate, ParameterRange, train_surrogate
+from pur_mold_twin.configs import load_process_scenario
+from pur_mold_twin.core.types import QualityTargets
+from pur_mold_twin.material_db.loader import load_material_catalog
+from pur_mold_twin.optimizer import OptimizationConfig, OptimizerBounds, ProcessOptimizer
+from pur_mold_twin.optimizer.constraints import evaluate_constraints
+from pur_mold_twin.service.api import APIConfig, APIService
+
+
+SCENARIO = load_process_scenario("configs/scenarios/use_case_1.yaml")
+MATERIAL = load_material_catalog("configs/systems/jr_purtec_catalog.yaml")[SCENARIO.system_id]
+CONFIG = SCENARIO.simulation.model_copy(update={"total_time_s": 300.0})
+QUALITY = QualityTargets(rho_moulded_max=400.0, H_demold_min_shore=30.0, H_24h_min_shore=40.0, defect_risk_max=0.3)
+PARAMETERS = [
+    ParameterRange(name="process.T_polyol_in_C", low=20.0, high=30.0),
+    ParameterRange(name="process.T_iso_in_C", low=20.0, high=30.0),
+    ParameterRange(name="process.T_mold_init_C", low=35.0, high=60.0),
+]
+
+
+@pytest.fixture(scope="module")
+def surrogate() -> KPISurrogate:
+    return train_surrogate(MATERIAL, SCENARIO.process, SCENARIO.mold, PARAMETERS, QUALITY, CONFIG, samples=256)
+
+
+def test_surrogate_matches_simulator_inside_envelope(surrogate: KPISurrogate, tmp_path) -> None:
+    process = SCENARIO.process.model_copy(update={"T_polyol_in_C": 27.0, "T_iso_in_C": 22.0, "T_mold_init_C": 47.0})
+    result = MVP0DSimulator(CONFIG).run(MATERIAL, process, SCENARIO.mold, QUALITY)
+    prediction = surrogate.predict(surrogate.values_for(MATERIAL, process, SCENARIO.mold, CONFIG))
+
+    assert prediction.in_envelope
+    assert prediction.kpis["p_max_Pa"] == pytest.approx(result.p_max_Pa, rel=1e-3)
+    assert prediction.kpis["rho_moulded"] == pytest.approx(result.rho_moulded, rel=1e-3)
+    assert prediction.kpis["t_demold_opt_s"] == pytest.approx(result.t_demold_opt_s, abs=2.0)
+    assert surrogate.matches(MATERIAL, process, SCENARIO.mold, QUALITY, CONFIG, varied=["process.T_mold_init_C"])
+    assert not surrogate.matches(MATERIAL, process, SCENARIO.mold, QUALITY, CONFIG, varied=["process.RH_ambient"])
+    humid = process.model_copy(update={"RH_ambient": 0.9})
+    assert not surrogate.matches(MATERIAL, humid, SCENARIO.mold, QUALITY, CONFIG)
+    assert not surrogate.predict([27.0, 22.0, 70.0]).in_envelope
+
+    batch = surrogate.predict_batch([[27.0, 22.0, 47.0], [21.0, 29.0, 36.0]])
+    assert batch["p_max_Pa"][0] == pytest.approx(prediction.kpis["p_max_Pa"])
+
+    reloaded = KPISurrogate.load(surrogate.save(tmp_path / "surrogate.json"))
+    assert reloaded.predict([27.0, 22.0, 47.0]).kpis == prediction.kpis
+    assert reloaded.rmse == surrogate.rmse
+
+
+def test_optimizer_screens_clearly_infeasible_candidates(surrogate: KPISurrogate) -> None:
+    optimizer = ProcessOptimizer(MVP0DSimulator(CONFIG), surrogate=surrogate)
+    config = OptimizationConfig(
+        samples=12,
+        random_seed=5,
+        t_cycle_max_s=300.0,
+        bounds=OptimizerBounds(T_mold_C=(35.0, 60.0), t_demold_s=(20.0, 120.0)),
+    )
+    result = optimizer.optimize(MATERIAL, SCENARIO.process, SCENARIO.mold, QUALITY, config)
+
+    screened = [evaluation for evaluation in result.evaluations if evaluation.screened]
+    assert screened and len(screened) < len(result.evaluations)
+    assert all(not evaluation.feasible and evaluation.quality_status == "SCREENED" for evaluation in screened)
+
+    longer = ProcessOptimizer(MVP0DSimulator(CONFIG.model_copy(update={"total_time_s": 400.0})), surrogate=surrogate)
+    with pytest.raises(ValueError):
+        longer.optimize(MATERIAL, SCENARIO.process, SCENARIO.mold, QUALITY, config)
+
+
+def test_optimizer_checks_a_screened_winner_by_simulation(surrogate: KPISurrogate) -> None:
+    optimizer = ProcessOptimizer(MVP0DSimulator(CONFIG), surrogate=surrogate)
+    config = OptimizationConfig(
+        samples=4,
+        random_seed=5,
+        t_cycle_max_s=300.0,
+        bounds=OptimizerBounds(T_mold_C=(35.0, 60.0), t_demold_s=(1.0, 2.0)),  # far too early: all screened
+    )
+    result = optimizer.optimize(MATERIAL, SCENARIO.process, SCENARIO.mold, QUALITY, config)
+
+    assert all(evaluation.screened for evaluation in result.evaluations)
+    expected = evaluate_constraints(
+        result=result.best_simulation,
+        quality=QUALITY,
+        candidate_demold_s=result.best_candidate.t_demold_s,
+        t_cycle_max_s=config.t_cycle_max_s,
+    )
+    assert result.best_constraints == expected
+    assert not any("(surrogate)" in violation for violation in result.best_constraints.violations)
+
+
+def test_api_predict_falls_back_to_simulation(surrogate: KPISurrogate, tmp_path) -> None:
+    service = APIService(APIConfig(surrogate_path=str(surrogate.save(tmp_path / "surrogate.json"))))
+    payload = {
+        "system_id": SCENARIO.system_id,
+        "process": SCENARIO.process.model_copy(update={"T_mold_init_C": 47.0}).model_dump(),
+        "mold": SCENARIO.mold.model_dump(),
+        "quality": QUALITY.model_dump(),
+        "simulation": CONFIG.model_dump(),
+    }
+
+    fast = service.predict(payload)
+    assert fast["source"] == "surrogate" and fast["reason"] is None
+
+    payload["process"]["T_mold_init_C"] = 70.0
+    slow = service.predict(payload)
+    assert slow["source"] == "simulation" and slow["reason"] == "outside_envelope"
+    assert slow["kpis"]["p_max_Pa"] > 0
+
+    assert APIService(APIConfig()).predict(payload)["reason"] == "no_surrogate"
+
+
+def test_api_import_does_not_load_analysis_stack() -> None:
+    code = "import sys, pur_mold_twin.service.api; print('pur_mold_twin.analysis' in sys.modules)"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    assert result.stdout.strip() == "False"
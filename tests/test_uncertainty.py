@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pur_mold_twin.analysis import Distribution, UncertaintyAnalyzer, paired_difference
+from pur_mold_twin.analysis.uncertainty import common_uniforms
+from pur_mold_twin.configs import load_process_scenario
+from pur_mold_twin.core.plant import PlantUnit
+from pur_mold_twin.core.types import QualityTargets
+from pur_mold_twin.material_db.loader import load_material_catalog
+
+
+SCENARIO = load_process_scenario("configs/scenarios/use_case_1.yaml")
+MATERIAL = load_material_catalog("configs/systems/jr_purtec_catalog.yaml")[SCENARIO.system_id]
+CONFIG = SCENARIO.simulation.model_copy(update={"total_time_s": 300.0})
+QUALITY = QualityTargets(rho_moulded_max=400.0, H_demold_min_shore=30.0, H_24h_min_shore=40.0, p_max_allowable_bar=3.05)
+DISTRIBUTIONS = [
+    Distribution(name="process.T_polyol_in_C", std=1.5),
+    Distribution(name="process.RH_ambient", kind="uniform", low=0.3, high=0.7),
+    Distribution(name="process.mixing_eff", std=0.05, high=1.0),
+    Distribution(name="material.polyol.water_fraction", kind="triangular", low=0.015, high=0.025),
+]
+
+
+def test_distributions_and_common_random_numbers() -> None:
+    u = common_uniforms(["a", "b"], 2000, seed=4)
+    np.testing.assert_array_equal(common_uniforms(["b", "a"], 2000, seed=4)[:, 0], u[:, 1])
+    assert not np.array_equal(u[:, 0], u[:, 1])
+
+    normal = DISTRIBUTIONS[2].sample(u[:, 0], nominal=0.95)
+    assert normal.max() == 1.0 and abs(np.median(normal) - 0.95) < 0.01
+    triangular = Distribution(name="process.T_iso_in_C", kind="triangular", low=20.0, high=30.0).sample(u[:, 1], 22.0)
+    assert 20.0 <= triangular.min() and triangular.max() <= 30.0
+    assert np.mean(triangular) == pytest.approx((20.0 + 22.0 + 30.0) / 3.0, abs=0.2)
+
+    with pytest.raises(ValueError):
+        Distribution(name="process.T_polyol_in_C")
+    with pytest.raises(ValueError):
+        Distribution(name="process.nope", std=1.0)
+
+
+def test_monte_carlo_summary_and_paired_comparison() -> None:
+    analyzer = UncertaintyAnalyzer(DISTRIBUTIONS, draws=300, seed=1, config=CONFIG)
+    warm = SCENARIO.process.model_copy(update={"T_mold_init_C": SCENARIO.process.T_mold_init_C + 10.0})
+    results = analyzer.compare(
+        [PlantUnit("base", SCENARIO.mold, SCENARIO.process), PlantUnit("warm", SCENARIO.mold, warm)],
+        material=MATERIAL,
+        quality=QUALITY,
+    )
+    base, other = results["base"], results["warm"]
+
+    summary = base.summary
+    assert summary["draws"] == 300 and 0.0 <= summary["p_fail"] <= 1.0
+    assert sum(summary["quality_status"].values()) == 300
+    quantiles = [summary["p_max_bar"][key] for key in ("p05", "p50", "p95", "p99")]
+    assert quantiles == sorted(quantiles)
+    assert summary["t_demold_opt_s"]["p05"] <= summary["t_demold_opt_s"]["p95"]
+    assert len(base.to_frame()) == 300
+
+    # Common random numbers: both scenarios see the same draws.
+    np.testing.assert_array_equal(base.inputs["process.RH_ambient"], other.inputs["process.RH_ambient"])
+    diff = paired_difference(base, other)
+    unpaired = np.sqrt(base.kpis["p_max_Pa"].var() + other.kpis["p_max_Pa"].var()) / 100_000.0 / np.sqrt(300)
+    assert diff["p_max_bar"]["stderr"] < unpaired
+
+
+def test_draws_outside_valid_range_are_rejected() -> None:
+    analyzer = UncertaintyAnalyzer([Distribution(name="process.mixing_eff", std=0.2)], draws=50, config=CONFIG)
+    with pytest.raises(ValueError, match="low/high"):
+        analyzer.run(MATERIAL, SCENARIO.process, SCENARIO.mold, QUALITY)
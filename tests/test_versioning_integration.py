@@ -14,11 +14,12 @@ import numpy as np
 
 import pytest
 
-from pur_mold_twin.ml.inference import _load_models, attach_ml_predictions
+from pur_mold_twin.ml import inference
+from pur_mold_twin.ml.inference import _load_models, attach_ml_predictions, set_default_models_dir
 from pur_mold_twin.ml.versioning import load_manifest, get_model_info
 
 
-def test_versioning_integration_with_training(tmp_path):
+def test_versioning_integration_with_training(tmp_path, monkeypatch):
     """Test full integration: train models → manifest created → inference loads metadata."""
     
     # Import fresh to avoid cached pd=None
@@ -123,7 +124,9 @@ def test_versioning_integration_with_training(tmp_path):
         },
     }
     
-    # Attach predictions (which should include metadata)
+    # Attach predictions (which should include metadata) from the trained directory
+    monkeypatch.setattr(inference, "_DEFAULT_MODELS_DIR", inference._DEFAULT_MODELS_DIR)  # restored after the test
+    set_default_models_dir(models_dir)
     result_with_ml = attach_ml_predictions(sim_result, loaded)
     
     # Verify metadata is attached